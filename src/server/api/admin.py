@@ -3,4 +3,4 @@ from django.contrib import admin
 from .models import *
 
 # Register your models here.
-admin.site.register([File, Method, Class])
+admin.site.register([File, Method, Class, AnalysisJob])
@@ -0,0 +1,41 @@
+from metrics.calculator import Calculator
+from metrics.parsers.csharp.ast_generation_visitor import ASTGenerationVisitor as CSharpASTGenerationVisitor
+from metrics.parsers.csharp.base.ModifiedCSharpLexer import CSharpLexer
+from metrics.parsers.csharp.parser import CSharpParser
+from metrics.parsers.python3.ast_generation_visitor import ASTGenerationVisitor as Python3ASTGenerationVisitor
+from metrics.parsers.python3.base.Python3Lexer import Python3Lexer
+from metrics.parsers.python3.parser import Python3Parser
+
+calculator_args = {
+    "py": {
+        "lexer_type": Python3Lexer,
+        "parser_type": Python3Parser,
+        "visitor_type": Python3ASTGenerationVisitor,
+    },
+    "cs": {
+        "lexer_type": CSharpLexer,
+        "parser_type": CSharpParser,
+        "visitor_type": CSharpASTGenerationVisitor,
+    }
+}
+
+
+def load_calculator(file_name):
+    """
+    Parse an uploaded file into a calculator, with the lexer and parser for the file's extension.
+    :param file_name: The name of the uploaded file, as stored.
+    :return: The file's calculator.
+    """
+    with open(f'../server/uploads/{file_name}') as f:
+        content = f.read()
+
+    return Calculator(content, **(calculator_args[file_name.rsplit(".")[-1]]))
+
+
+def display_name(file_name):
+    """
+    Get the name an uploaded file was uploaded with, without the upload time prefixed to it when stored.
+    :param file_name: The name of the uploaded file, as stored.
+    :return: The file's original name.
+    """
+    return file_name.split("_")[-1]
@@ -0,0 +1,282 @@
+import json
+from datetime import timedelta
+from threading import Event, Lock, Thread
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, connection
+from django.db.models import F
+from django.utils import timezone
+
+from api.analysis import display_name, load_calculator
+from api.models import AnalysisJob
+from metrics.formatter import Formatter
+
+# The stages each file of a job goes through, in order, and the statuses each stage goes through.
+STAGES = ("parse", "structures", "metrics")
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Set when a job is submitted, to wake this process' idle workers.
+_submitted = Event()
+_workers = []
+_workers_lock = Lock()
+
+
+class _Superseded(Exception):
+    """
+    Raised when a worker's job has been taken away from it, e.g. queued again after being assumed abandoned.
+    """
+
+
+def submit(file_names, ast_depth=None, compact_graphs=False):
+    """
+    Queue uploaded files for analysis as a job, starting this process' analysis workers if it runs any (see
+    ANALYSIS_WORKERS) and they are not running yet.
+    :param file_names: The names of the uploaded files, as stored.
+    :param ast_depth: The depth down to which to include each file's AST. None includes the whole AST.
+    :param compact_graphs: Whether to format each file's graph structures in compact form.
+    :return: The queued job.
+    """
+    job = AnalysisJob.objects.create(
+        file_names=json.dumps(file_names), ast_depth=ast_depth, compact_graphs=compact_graphs,
+        progress=json.dumps(_initial_progress(file_names))
+    )
+
+    if settings.ANALYSIS_WORKERS:
+        start_workers(settings.ANALYSIS_WORKERS)
+    _submitted.set()
+
+    return job
+
+
+def describe(job, include_result=True):
+    """
+    Describe a job's status and the status of each stage of each of its files, for front-end request response.
+    :param job: The job.
+    :param include_result: Whether to include the job's result, once it is done.
+    :return: The job's description.
+    """
+    description = {
+        "id": str(job.id),
+        "status": job.status,
+        "files": json.loads(job.progress),
+        "error": job.error,
+    }
+
+    if include_result and job.status == AnalysisJob.DONE:
+        description["result"] = json.loads(job.result)
+
+    return description
+
+
+def claim():
+    """
+    Claim the oldest queued job for the calling worker, first queuing again the running jobs assumed abandoned.
+    Claiming is a single conditional update, so each job is only claimed by one worker, across processes.
+    :return: The claimed job. None if no job is queued.
+    """
+    requeue_abandoned()
+
+    queued = AnalysisJob.objects.filter(status=AnalysisJob.QUEUED).order_by("when_created").values_list("pk", flat=True)
+    for pk in queued[:8]:
+        claimed = AnalysisJob.objects.filter(pk=pk, status=AnalysisJob.QUEUED).update(
+            status=AnalysisJob.RUNNING, attempts=F("attempts") + 1, when_updated=timezone.now()
+        )
+        if claimed:
+            return AnalysisJob.objects.get(pk=pk)
+
+    return None
+
+
+def requeue_abandoned():
+    """
+    Queue again the running jobs that have gone without progress or a heartbeat for longer than the job timeout, or fail
+    them if they have already been attempted as many times as allowed.
+    """
+    abandoned = AnalysisJob.objects.filter(
+        status=AnalysisJob.RUNNING,
+        when_updated__lt=timezone.now() - timedelta(seconds=settings.ANALYSIS_JOB_TIMEOUT)
+    )
+
+    abandoned.filter(attempts__gte=settings.ANALYSIS_JOB_ATTEMPTS).update(
+        status=AnalysisJob.FAILED, error="Analysis was abandoned too many times.", when_updated=timezone.now()
+    )
+    abandoned.filter(attempts__lt=settings.ANALYSIS_JOB_ATTEMPTS).update(
+        status=AnalysisJob.QUEUED, when_updated=timezone.now()
+    )
+
+
+def run(job):
+    """
+    Analyse a claimed job's files one at a time, recording the status of each stage as it starts and ends, and then the
+    job's result or error. The job is kept marked as alive in between, so that long stages are not mistaken for
+    abandonment.
+    :param job: The claimed job.
+    """
+    heartbeat = _Heartbeat(job)
+    heartbeat.start()
+    try:
+        _run(job)
+    finally:
+        heartbeat.stop()
+
+
+def _run(job):
+    """
+    Analyse a claimed job's files, as run does, without keeping the job marked as alive.
+    :param job: The claimed job.
+    """
+    file_names = json.loads(job.file_names)
+    progress = _initial_progress(file_names)
+    results = []
+
+    def update(**fields):
+        # Updates only apply while the job is still this attempt's, so a superseded worker stops at its next update.
+        updated = AnalysisJob.objects.filter(pk=job.pk, status=AnalysisJob.RUNNING, attempts=job.attempts).update(
+            progress=json.dumps(progress), when_updated=timezone.now(), **fields
+        )
+        if not updated:
+            raise _Superseded()
+
+    stages = None
+    stage = None
+    try:
+        for file_name, file_progress in zip(file_names, progress):
+            stages = file_progress["stages"]
+
+            stage = "parse"
+            stages[stage] = RUNNING
+            update()
+            formatter = Formatter(load_calculator(file_name), display_name(file_name), job.ast_depth,
+                                  job.compact_graphs)
+            stages[stage] = DONE
+
+            stage = "structures"
+            stages[stage] = RUNNING
+            update()
+            formatter.generate_structures()
+            stages[stage] = DONE
+
+            stage = "metrics"
+            stages[stage] = RUNNING
+            update()
+            formatter.generate_metrics()
+            stages[stage] = DONE
+
+            results.append(formatter.metric_info)
+
+        update(status=AnalysisJob.DONE, result=json.dumps(results, cls=DjangoJSONEncoder))
+    except _Superseded:
+        pass
+    except Exception as e:
+        if stages is not None:
+            stages[stage] = FAILED
+
+        try:
+            update(status=AnalysisJob.FAILED, error=f"{type(e).__name__}: {e}")
+        except _Superseded:
+            pass
+
+
+class _Heartbeat(Thread):
+    """
+    Heartbeat.
+
+    Thread that marks a running job as alive at every heartbeat interval until stopped, or until the job is no longer
+    its worker's attempt.
+    """
+
+    def __init__(self, job, interval=None):
+        """
+        Heartbeat.
+        :param job: The running job.
+        :param interval: How often to mark the job as alive, in seconds. Defaults to ANALYSIS_JOB_HEARTBEAT.
+        """
+        super().__init__(daemon=True)
+        self.job = job
+        self.interval = interval if interval is not None else settings.ANALYSIS_JOB_HEARTBEAT
+        self.stopped = Event()
+
+    def run(self):
+        try:
+            while not self.stopped.wait(self.interval):
+                if not self.beat():
+                    return
+        finally:
+            connection.close()
+
+    def beat(self):
+        """
+        Mark the job as alive, as long as it is still this attempt's.
+        :return: Whether the job is still this attempt's.
+        """
+        return bool(AnalysisJob.objects.filter(pk=self.job.pk, status=AnalysisJob.RUNNING, attempts=self.job.attempts)
+                    .update(when_updated=timezone.now()))
+
+    def stop(self):
+        """
+        Stop the heartbeat, waiting for a beat in progress to end.
+        """
+        self.stopped.set()
+        self.join()
+
+
+class AnalysisWorker(Thread):
+    """
+    Analysis worker.
+
+    Thread that claims and runs queued analysis jobs one at a time until stopped, checking the queue whenever a job is
+    submitted in its process and at every poll interval otherwise.
+    """
+
+    def __init__(self, stopped=None, poll_interval=None):
+        """
+        Analysis worker.
+        :param stopped: Event that stops the worker once set. The worker runs as long as its process by default.
+        :param poll_interval: How often to check the queue while idle, in seconds. Defaults to ANALYSIS_POLL_INTERVAL.
+        """
+        super().__init__(daemon=True)
+        self.stopped = stopped if stopped is not None else Event()
+        self.poll_interval = poll_interval if poll_interval is not None else settings.ANALYSIS_POLL_INTERVAL
+
+    def run(self):
+        try:
+            while not self.stopped.is_set():
+                close_old_connections()
+                job = claim()
+                if job is not None:
+                    run(job)
+                    continue
+
+                _submitted.wait(self.poll_interval)
+                _submitted.clear()
+        finally:
+            connection.close()
+
+
+def start_workers(count):
+    """
+    Start this process' analysis workers, unless they have been started already.
+    :param count: The number of workers to start.
+    :return: The process' workers.
+    """
+    with _workers_lock:
+        if not _workers:
+            _workers.extend(AnalysisWorker() for _ in range(count))
+            for worker in _workers:
+                worker.start()
+
+    return list(_workers)
+
+
+def _initial_progress(file_names):
+    """
+    Get the progress of a job that has not started yet.
+    :param file_names: The names of the job's files, as stored.
+    :return: List of each file's name and the status of each of its stages, all pending.
+    """
+    return [{"fileName": display_name(file_name), "stages": {stage: PENDING for stage in STAGES}}
+            for file_name in file_names]
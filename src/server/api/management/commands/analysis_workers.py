@@ -0,0 +1,30 @@
+from threading import Event
+
+from django.core.management.base import BaseCommand
+
+from api.jobs import AnalysisWorker
+
+
+class Command(BaseCommand):
+    help = "Run analysis workers that process the queued analysis jobs, until interrupted."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=1, help="The number of workers to run.")
+        parser.add_argument("--poll-interval", type=float, default=None,
+                            help="How often idle workers check the queue, in seconds.")
+
+    def handle(self, *args, **options):
+        stopped = Event()
+        workers = [AnalysisWorker(stopped, options["poll_interval"]) for _ in range(options["workers"])]
+        for worker in workers:
+            worker.start()
+
+        self.stdout.write(f"Running {len(workers)} analysis worker(s). Quit with CONTROL-C.")
+        try:
+            while not stopped.wait(1):
+                pass
+        except KeyboardInterrupt:
+            stopped.set()
+
+        for worker in workers:
+            worker.join()
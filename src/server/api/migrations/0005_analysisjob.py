@@ -0,0 +1,30 @@
+# Generated by Django 3.0.14 on 2026-10-19 09:22
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_class_method'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalysisJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('file_names', models.TextField()),
+                ('ast_depth', models.IntegerField(null=True)),
+                ('compact_graphs', models.BooleanField(default=False)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], db_index=True, default='queued', max_length=16)),
+                ('attempts', models.IntegerField(default=0)),
+                ('progress', models.TextField()),
+                ('result', models.TextField(null=True)),
+                ('error', models.TextField(null=True)),
+                ('when_created', models.DateTimeField(auto_now_add=True)),
+                ('when_updated', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
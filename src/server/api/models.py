@@ -60,3 +60,23 @@ class Class(models.Model):
     def save(self, *args, **kwargs):
         self.class_hash = generate_hash(self.name)
         super(Class, self).save(*args, **kwargs)
+
+
+class AnalysisJob(models.Model):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUSES = [(QUEUED, "Queued"), (RUNNING, "Running"), (DONE, "Done"), (FAILED, "Failed")]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    file_names = models.TextField()  # JSON-serialized list [ storedFileName, ... ]
+    ast_depth = models.IntegerField(null=True)
+    compact_graphs = models.BooleanField(default=False)
+    status = models.CharField(max_length=16, choices=STATUSES, default=QUEUED, db_index=True)
+    attempts = models.IntegerField(default=0)
+    progress = models.TextField()  # JSON-serialized list [ { fileName: name, stages: { stageName: status } }, ... ]
+    result = models.TextField(null=True)  # JSON-serialized list of each file's metric info
+    error = models.TextField(null=True)
+    when_created = models.DateTimeField(auto_now_add=True)
+    when_updated = models.DateTimeField(auto_now=True)
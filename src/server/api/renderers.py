@@ -0,0 +1,108 @@
+from typing import Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework import HTTP_HEADER_ENCODING
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.mediatypes import _MediaType
+
+from metrics.json_stream import iterencode_chunks
+from metrics.message_pack import iterpack
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class StreamingRenderer(BaseRenderer):
+    """
+    Renderer that can also encode data incrementally, for streaming responses.
+    """
+
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
+        if data is None:
+            return b""
+
+        return b"".join(self.stream(data, accepted_media_type))
+
+    def stream(self, data, accepted_media_type=None) -> Iterator[bytes]:
+        """
+        Encode data incrementally.
+        :param data: The data to encode. May hold lazily produced JSON objects and arrays.
+        :param accepted_media_type: The media type accepted by the client, with its parameters.
+        :return: Iterator over the chunks of the encoding, in order.
+        """
+        raise NotImplementedError("StreamingRenderer.stream(data, accepted_media_type) must be implemented.")
+
+
+class JSONRenderer(StreamingRenderer):
+    """
+    JSON renderer. Whole structures are encoded with orjson when it is installed, and with json otherwise.
+    """
+
+    media_type = "application/json"
+    format = "json"
+
+    def stream(self, data, accepted_media_type=None) -> Iterator[bytes]:
+        encoder = DjangoJSONEncoder()
+        if orjson is None:
+            return iterencode_chunks(data, encoder)
+
+        def dumps(value):
+            return orjson.dumps(value, default=encoder.default).decode("utf-8")
+
+        return iterencode_chunks(data, encoder, dumps, (",", ":"))
+
+
+class MessagePackRenderer(StreamingRenderer):
+    """
+    MessagePack renderer. Clients that accept "application/msgpack; strings=table" get repeated strings encoded as
+    references to their first appearance.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    render_style = "binary"
+
+    def stream(self, data, accepted_media_type=None) -> Iterator[bytes]:
+        strings = _MediaType(accepted_media_type).params.get("strings") if accepted_media_type else None
+        if isinstance(strings, bytes):
+            strings = strings.decode(HTTP_HEADER_ENCODING)
+
+        return iterpack(data, string_table=strings == "table", default=DjangoJSONEncoder().default)
+
+
+class EventStreamRenderer(StreamingRenderer):
+    """
+    Server-sent events renderer, for streaming a sequence of events to subscribed clients. Each event is encoded as
+    JSON on a single data line, and streams can start by telling clients how long to wait before reconnecting once they
+    are closed.
+    """
+
+    media_type = "text/event-stream"
+    format = "event-stream"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
+        # A response's data (e.g. an error's details) is a single event, whereas streams are sequences of events.
+        if data is None:
+            return b""
+
+        return b"".join(self.stream([data], accepted_media_type))
+
+    def stream(self, data, accepted_media_type=None, retry=None) -> Iterator[bytes]:
+        """
+        Encode a sequence of events incrementally.
+        :param data: The events to encode.
+        :param accepted_media_type: The media type accepted by the client, with its parameters.
+        :param retry: How long clients wait before reconnecting once the stream is closed, in milliseconds. None leaves
+        it to the clients.
+        :return: Iterator over the encoded events, in order.
+        """
+        if retry is not None:
+            yield f"retry: {int(retry)}\n\n".encode("utf-8")
+
+        encoder = DjangoJSONEncoder()
+        for event in data:
+            yield f"data: {encoder.encode(event)}\n\n".encode("utf-8")
@@ -1 +1,230 @@
-# Create your tests here.
+import json
+import uuid
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api import jobs
+from api.models import AnalysisJob
+from api.renderers import EventStreamRenderer
+
+
+class TestJobs(TestCase):
+    """
+    Analysis job test case.
+    """
+
+    def setUp(self) -> None:
+        for target in ("api.jobs.start_workers", "api.jobs.load_calculator", "api.jobs.Formatter"):
+            patcher = patch(target)
+            setattr(self, target.rsplit(".")[-1], patcher.start())
+            self.addCleanup(patcher.stop)
+
+        self.Formatter.return_value.metric_info = {"fileName": "a.py"}
+
+    def stages(self, job: AnalysisJob) -> list:
+        """
+        Get the status of each stage of each of a job's files.
+        """
+        job.refresh_from_db()
+        return [file["stages"] for file in json.loads(job.progress)]
+
+    def test_run(self) -> None:
+        """
+        Test a submitted job is claimed once, and is done once run, with every stage of every file done.
+        """
+        job = jobs.submit(["1_a.py", "2_b.py"], 4, True)
+
+        self.assertEqual(job.status, AnalysisJob.QUEUED)
+        self.assertEqual(self.stages(job), [{stage: jobs.PENDING for stage in jobs.STAGES}] * 2)
+
+        claimed = jobs.claim()
+
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertEqual((claimed.status, claimed.attempts), (AnalysisJob.RUNNING, 1))
+        self.assertIsNone(jobs.claim())
+
+        jobs.run(claimed)
+
+        self.assertEqual(self.stages(job), [{stage: jobs.DONE for stage in jobs.STAGES}] * 2)
+        self.assertEqual(job.status, AnalysisJob.DONE)
+        self.assertEqual(jobs.describe(job)["result"], [{"fileName": "a.py"}] * 2)
+        self.Formatter.assert_any_call(self.load_calculator.return_value, "b.py", 4, True)
+
+    def test_submit_workers(self) -> None:
+        """
+        Test submitting a job only starts analysis workers in this process when it is set to run any.
+        """
+        jobs.submit(["1_a.py"])
+
+        self.start_workers.assert_not_called()
+
+        with override_settings(ANALYSIS_WORKERS=2):
+            jobs.submit(["1_a.py"])
+
+        self.start_workers.assert_called_once_with(2)
+
+    def test_run_failure(self) -> None:
+        """
+        Test a job fails when one of its stages does, recording which.
+        """
+        self.Formatter.return_value.generate_structures.side_effect = ValueError("Invalid structure.")
+        jobs.submit(["1_a.py", "2_b.py"])
+        job = jobs.claim()
+
+        jobs.run(job)
+
+        self.assertEqual(self.stages(job), [
+            {"parse": jobs.DONE, "structures": jobs.FAILED, "metrics": jobs.PENDING},
+            {stage: jobs.PENDING for stage in jobs.STAGES}
+        ])
+        self.assertEqual(job.status, AnalysisJob.FAILED)
+        self.assertEqual(job.error, "ValueError: Invalid structure.")
+        self.assertNotIn("result", jobs.describe(job))
+
+    def test_run_superseded(self) -> None:
+        """
+        Test a worker stops running its job, without recording anything more, once the job has been claimed again.
+        """
+        jobs.submit(["1_a.py"])
+        job = jobs.claim()
+
+        def supersede(file_name):
+            AnalysisJob.objects.filter(pk=job.pk).update(status=AnalysisJob.QUEUED)
+            jobs.claim()
+            return MagicMock()
+
+        self.load_calculator.side_effect = supersede
+
+        jobs.run(job)
+
+        self.assertEqual(self.stages(job), [{"parse": jobs.RUNNING, "structures": jobs.PENDING,
+                                             "metrics": jobs.PENDING}])
+        self.assertEqual((job.status, job.attempts), (AnalysisJob.RUNNING, 2))
+        self.assertIsNone(job.result)
+        self.assertIsNone(job.error)
+
+    @override_settings(ANALYSIS_JOB_TIMEOUT=60, ANALYSIS_JOB_ATTEMPTS=2)
+    def test_requeue_abandoned(self) -> None:
+        """
+        Test running jobs without progress for longer than the timeout are queued again, unless they have been
+        attempted as many times as allowed, in which case they fail.
+        """
+        for _ in range(3):
+            jobs.submit(["1_a.py"])
+        abandoned, exhausted, running = [jobs.claim() for _ in range(3)]
+
+        AnalysisJob.objects.filter(pk=exhausted.pk).update(attempts=2)
+        AnalysisJob.objects.filter(pk__in=[abandoned.pk, exhausted.pk]).update(
+            when_updated=timezone.now() - timedelta(seconds=61))
+
+        jobs.requeue_abandoned()
+
+        for job in (abandoned, exhausted, running):
+            job.refresh_from_db()
+
+        self.assertEqual(abandoned.status, AnalysisJob.QUEUED)
+        self.assertEqual(exhausted.status, AnalysisJob.FAILED)
+        self.assertIsNotNone(exhausted.error)
+        self.assertEqual(running.status, AnalysisJob.RUNNING)
+
+    @override_settings(ANALYSIS_JOB_TIMEOUT=60)
+    def test_heartbeat(self) -> None:
+        """
+        Test a heartbeat keeps its job from being taken for abandoned, until the job is claimed again.
+        """
+        jobs.submit(["1_a.py"])
+        job = jobs.claim()
+        AnalysisJob.objects.filter(pk=job.pk).update(when_updated=timezone.now() - timedelta(seconds=61))
+
+        heartbeat = jobs._Heartbeat(job)
+
+        self.assertTrue(heartbeat.beat())
+
+        jobs.requeue_abandoned()
+        job.refresh_from_db()
+
+        self.assertEqual(job.status, AnalysisJob.RUNNING)
+
+        AnalysisJob.objects.filter(pk=job.pk).update(status=AnalysisJob.QUEUED)
+        jobs.claim()
+
+        self.assertFalse(heartbeat.beat())
+
+
+class TestAnalysisJobViewset(TestCase):
+    """
+    Analysis job endpoint test case.
+    """
+
+    def setUp(self) -> None:
+        self.job = AnalysisJob.objects.create(file_names=json.dumps(["1_a.py"]), status=AnalysisJob.DONE,
+                                              progress=json.dumps([]), result=json.dumps([]))
+
+    def test_retrieve(self) -> None:
+        """
+        Test retrieve method describes a job, and is not found for unknown or invalid ids.
+        """
+        response = self.client.get(f"/api/jobs/{self.job.pk}/", HTTP_ACCEPT="application/json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)["status"], AnalysisJob.DONE)
+
+        for pk in (uuid.uuid4(), "job"):
+            self.assertEqual(self.client.get(f"/api/jobs/{pk}/").status_code, 404)
+
+    def test_events(self) -> None:
+        """
+        Test events method streams a job's descriptions as events, and is not found for unknown or invalid ids.
+        """
+        response = self.client.get(f"/api/jobs/{self.job.pk}/events/", HTTP_ACCEPT="text/event-stream")
+        events = b"".join(response.streaming_content).decode()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(events, f"retry: 1000\n\ndata: {json.dumps(jobs.describe(self.job))}\n\n")
+
+        for pk in (uuid.uuid4(), "job"):
+            response = self.client.get(f"/api/jobs/{pk}/events/", HTTP_ACCEPT="text/event-stream")
+            self.assertEqual(response.status_code, 404)
+
+    @override_settings(ANALYSIS_EVENTS_WINDOW=0)
+    def test_events_window(self) -> None:
+        """
+        Test events method closes subscriptions to unfinished jobs once their window has passed.
+        """
+        AnalysisJob.objects.filter(pk=self.job.pk).update(status=AnalysisJob.RUNNING)
+
+        response = self.client.get(f"/api/jobs/{self.job.pk}/events/", HTTP_ACCEPT="text/event-stream")
+        events = b"".join(response.streaming_content).decode()
+
+        self.assertEqual(events.count("data: "), 1)
+        self.assertIn(f'"status": "{AnalysisJob.RUNNING}"', events)
+
+    def test_events_not_acceptable(self) -> None:
+        """
+        Test events method responds to clients that do not accept event streams with a single error event.
+        """
+        response = self.client.get(f"/api/jobs/{self.job.pk}/events/", HTTP_ACCEPT="application/json")
+
+        self.assertEqual(response.status_code, 406)
+        self.assertTrue(response.content.startswith(b'data: {"detail": '))
+        self.assertEqual(response.content.count(b"data: "), 1)
+
+
+class TestEventStreamRenderer(TestCase):
+    """
+    Event stream renderer test case.
+    """
+
+    def test_render(self) -> None:
+        """
+        Test render method encodes a response's data as a single event, and stream method each item as an event, after
+        the retry time if given.
+        """
+        renderer = EventStreamRenderer()
+
+        self.assertEqual(renderer.render({"detail": "Not found."}), b'data: {"detail": "Not found."}\n\n')
+        self.assertEqual(b"".join(renderer.stream([{"a": 1}, 2])), b'data: {"a": 1}\n\ndata: 2\n\n')
+        self.assertEqual(b"".join(renderer.stream([2], retry=500)), b'retry: 500\n\ndata: 2\n\n')
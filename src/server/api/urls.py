@@ -8,6 +8,10 @@ router.register(r'api/upload', views.FileUploadViewset, 'upload')
 router.register(r'api/file', views.FileInformationViewset, 'file')
 router.register(r'api/method', views.MethodViewpoint, 'method')
 router.register(r'api/class', views.ClassViewpoint, 'class')
+router.register(r'api/impact', views.ImpactViewset, 'impact')
+router.register(r'api/ast', views.ASTViewset, 'ast')
+router.register(r'api/functions', views.FunctionViewset, 'functions')
+router.register(r'api/jobs', views.AnalysisJobViewset, 'jobs')
 
 urlpatterns = [
     path('', include(router.urls))
@@ -1,29 +1,50 @@
-from django.http import JsonResponse
+from functools import lru_cache
+from time import monotonic, sleep
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import JsonResponse, StreamingHttpResponse
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.response import Response
 
+from api import jobs
+from api.analysis import display_name, load_calculator
+from api.renderers import EventStreamRenderer, JSONRenderer, MessagePackRenderer
+from api.models import AnalysisJob
 from api.serializers import *
-from metrics.calculator import Calculator
 from metrics.formatter import Formatter
-from metrics.parsers.csharp.ast_generation_visitor import ASTGenerationVisitor as CSharpASTGenerationVisitor
-from metrics.parsers.csharp.base.ModifiedCSharpLexer import CSharpLexer
-from metrics.parsers.csharp.parser import CSharpParser
-from metrics.parsers.python3.ast_generation_visitor import ASTGenerationVisitor as Python3ASTGenerationVisitor
-from metrics.parsers.python3.base.Python3Lexer import Python3Lexer
-from metrics.parsers.python3.parser import Python3Parser
-
-calculator_args = {
-    "py": {
-        "lexer_type": Python3Lexer,
-        "parser_type": Python3Parser,
-        "visitor_type": Python3ASTGenerationVisitor,
-    },
-    "cs": {
-        "lexer_type": CSharpLexer,
-        "parser_type": CSharpParser,
-        "visitor_type": CSharpASTGenerationVisitor,
-    }
-}
+from metrics.json_stream import JSONArray
+
+
+@lru_cache(maxsize=32)
+def get_calculator(file_hash):
+    """
+    Get the calculator for an uploaded file. The calculators of recently queried files are kept, so that the models
+    built for a file (e.g. its dependency graph and reachability index) are reused across queries.
+    :param file_hash: The hash of the uploaded file.
+    :return: The file's calculator.
+    """
+    return load_calculator(str(File.objects.get(hash=file_hash).file))
+
+
+def parse_depth(value):
+    """
+    Parse an AST depth query parameter.
+    :param value: The parameter's value: a non-negative integer, or "all" (or None) for the whole AST.
+    :return: The depth. None for the whole AST.
+    :raises ValueError: If the value is neither a non-negative integer nor "all".
+    """
+    if value is None or value == 'all':
+        return None
+
+    depth = int(value)
+    if depth < 0:
+        raise ValueError(f"Negative depth {depth}.")
+
+    return depth
 
 
 class FileUploadViewset(viewsets.ModelViewSet):
@@ -32,10 +53,21 @@ class FileUploadViewset(viewsets.ModelViewSet):
     """
     queryset = File.objects.all()
     parser_classes = (MultiPartParser, FormParser, JSONParser)
+    renderer_classes = (JSONRenderer, MessagePackRenderer)
     serializer_class = FileSerializer
 
     def create(self, request, *args, **kwargs):
-        return_data = []
+        try:
+            ast_depth = parse_depth(request.GET.get('ast_depth', settings.AST_DEPTH))
+        except ValueError:
+            return JsonResponse({'error': 'Expected ast_depth to be a non-negative integer or all.'},
+                                status=status.HTTP_400_BAD_REQUEST)
+
+        # Graph structures are formatted with their node names stored once and links as integer arrays on request.
+        compact_graphs = request.GET.get('graphs', None) == 'compact'
+
+        # Every file is validated and saved before the response starts, so that errors still get a normal response.
+        file_names = []
         data_dict = dict(request.data.lists())
         for i, file in enumerate(data_dict["name"]):
             data = {
@@ -48,23 +80,44 @@ class FileUploadViewset(viewsets.ModelViewSet):
             serializer.is_valid(raise_exception=True)
             self.perform_create(serializer)
 
-            file_name = str(self.queryset.get(hash=serializer.data['hash']).file)
+            file_names.append(str(self.queryset.get(hash=serializer.data['hash']).file))
 
-            with open(f'../server/uploads/{file_name}') as f:
-                content = f.read()
+        # In job mode the files are analysed by the analysis workers, and the job's progress is reported by api/jobs.
+        if request.GET.get('mode', None) == 'job':
+            job = jobs.submit(file_names, ast_depth, compact_graphs)
+            return JsonResponse({'id': str(job.id), 'status': job.status}, status=status.HTTP_202_ACCEPTED)
 
-            calculator = Calculator(content, **(calculator_args[file_name.rsplit(".")[-1]]))
-            formatter = Formatter(calculator, file_name.split("_")[-1])
+        # Every file is parsed before the response starts too, so that parse errors also get a normal response rather
+        # than cutting the streamed response short. Only the structures and metrics are produced as it is streamed.
+        calculators = [load_calculator(file_name) for file_name in file_names]
 
-            return_data.append(formatter.generate())
+        # The response is encoded as negotiated from the Accept header.
+        metric_info = JSONArray(self.analyse(file_names, calculators, ast_depth, compact_graphs), len(file_names))
+        return StreamingHttpResponse(
+            request.accepted_renderer.stream(metric_info, request.accepted_media_type),
+            status=status.HTTP_201_CREATED, content_type=request.accepted_media_type)
 
-        return JsonResponse(return_data, status=status.HTTP_201_CREATED, safe=False)
+    @staticmethod
+    def analyse(file_names, calculators, ast_depth=None, compact_graphs=False):
+        """
+        Analyse parsed uploaded files one at a time, as the response is streamed.
+        :param file_names: The names of the uploaded files.
+        :param calculators: The calculator of each file, in the same order.
+        :param ast_depth: The depth down to which to include each file's AST. None includes the whole AST.
+        :param compact_graphs: Whether to format each file's graph structures in compact form.
+        :return: Iterator over the lazily produced metric info of each file.
+        """
+        for file_name, calculator in zip(file_names, calculators):
+            formatter = Formatter(calculator, display_name(file_name), ast_depth, compact_graphs)
+
+            yield formatter.stream()
 
 
 class FileInformationViewset(viewsets.ModelViewSet):
     """
     API endpoint to return a file's information from a given hash
     """
+    renderer_classes = (JSONRenderer, MessagePackRenderer, BrowsableAPIRenderer)
     serializer_class = FileSerializer
 
     def get_queryset(self):
@@ -110,3 +163,147 @@ class ClassViewpoint(viewsets.ModelViewSet):
                 return Class.objects.all().filter(class_hash=class_hash)
 
             return Class.objects.all()
+
+
+class ImpactViewset(viewsets.ViewSet):
+    """
+    API endpoint to return the classes that depend on a class, directly or transitively (i.e. that a change to the class
+    can affect), or that the class depends on, from a given file hash and class name
+    """
+    directions = ("dependents", "dependencies")
+
+    def list(self, request):
+        file_hash = request.GET.get('hash', None)
+        class_name = request.GET.get('class', None)
+        direction = request.GET.get('direction', 'dependents')
+        if file_hash is None or class_name is None or direction not in self.directions:
+            return JsonResponse({'error': f'Expected hash, class and direction (one of {self.directions}).'},
+                                status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            calculator = get_calculator(file_hash)
+        except File.DoesNotExist:
+            return JsonResponse({'error': f'No file with hash {file_hash}.'}, status=status.HTTP_404_NOT_FOUND)
+
+        if direction == "dependents":
+            classes = calculator.transitive_dependents(class_name)
+        else:
+            classes = calculator.transitive_dependencies(class_name)
+
+        return JsonResponse({'class': class_name, direction: [cls.name for cls in classes]}, status=status.HTTP_200_OK)
+
+
+class ASTViewset(viewsets.ViewSet):
+    """
+    API endpoint to return the subtree of a node in a file's AST, from a given file hash and the node's id (as given to
+    the truncated nodes of the upload response's AST), down to a given depth
+    """
+    renderer_classes = (JSONRenderer, MessagePackRenderer)
+
+    def list(self, request):
+        file_hash = request.GET.get('hash', None)
+        try:
+            node_id = int(request.GET.get('id', 0))
+            depth = parse_depth(request.GET.get('depth', settings.AST_DEPTH))
+        except ValueError:
+            return JsonResponse({'error': 'Expected id to be an integer and depth a non-negative integer or all.'},
+                                status=status.HTTP_400_BAD_REQUEST)
+
+        if file_hash is None:
+            return JsonResponse({'error': 'Expected hash.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            calculator = get_calculator(file_hash)
+        except File.DoesNotExist:
+            return JsonResponse({'error': f'No file with hash {file_hash}.'}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            subtree = Formatter(calculator, "").format_ast(node_id, depth)
+        except KeyError:
+            return JsonResponse({'error': f'No node with id {node_id}.'}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response(subtree, status=status.HTTP_200_OK)
+
+
+class FunctionViewset(viewsets.ViewSet):
+    """
+    API endpoint to return the metrics of each function in a file, from a given file hash, or the control-flow graph of
+    one of its functions, from its qualified name as well
+    """
+    renderer_classes = (JSONRenderer, MessagePackRenderer)
+
+    def list(self, request):
+        file_hash = request.GET.get('hash', None)
+        name = request.GET.get('name', None)
+        if file_hash is None:
+            return JsonResponse({'error': 'Expected hash.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            calculator = get_calculator(file_hash)
+        except File.DoesNotExist:
+            return JsonResponse({'error': f'No file with hash {file_hash}.'}, status=status.HTTP_404_NOT_FOUND)
+
+        # Graph structures are formatted with their node names stored once and links as integer arrays on request.
+        formatter = Formatter(calculator, "", compact_graphs=request.GET.get('graphs', None) == 'compact')
+        if name is None:
+            return Response(formatter.format_functions(), status=status.HTTP_200_OK)
+
+        try:
+            cfg = formatter.generate_function_control_flow_graph(name)
+        except KeyError:
+            return JsonResponse({'error': f'No function named {name}.'}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response({'name': name, 'controlFlowGraph': cfg}, status=status.HTTP_200_OK)
+
+
+class AnalysisJobViewset(viewsets.ViewSet):
+    """
+    API endpoint to return the status of an analysis job (i.e. an upload analysed in job mode) and of each stage of
+    each of its files, and its result once done, from a given job id. Clients can poll the job, or subscribe to its
+    events, which stream its status each time it changes until it finishes. Subscriptions are closed after
+    ANALYSIS_EVENTS_WINDOW seconds, so that each only holds a server worker for so long, and clients reconnect after the
+    stream's retry time to follow the job further
+    """
+    renderer_classes = (JSONRenderer, MessagePackRenderer)
+
+    def retrieve(self, request, pk=None):
+        try:
+            job = AnalysisJob.objects.get(pk=pk)
+        except (AnalysisJob.DoesNotExist, ValidationError):
+            return JsonResponse({'error': f'No job with id {pk}.'}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response(jobs.describe(job), status=status.HTTP_200_OK)
+
+    @action(detail=True, renderer_classes=[EventStreamRenderer])
+    def events(self, request, pk=None):
+        try:
+            job = AnalysisJob.objects.get(pk=pk)
+        except (AnalysisJob.DoesNotExist, ValidationError):
+            return JsonResponse({'error': f'No job with id {pk}.'}, status=status.HTTP_404_NOT_FOUND)
+
+        events = request.accepted_renderer.stream(self.iter_events(job), request.accepted_media_type,
+                                                  retry=settings.ANALYSIS_EVENTS_RETRY)
+        response = StreamingHttpResponse(events, content_type=request.accepted_media_type)
+        response['Cache-Control'] = 'no-cache'
+        return response
+
+    @staticmethod
+    def iter_events(job):
+        """
+        Describe a job each time it changes, until it finishes or ANALYSIS_EVENTS_WINDOW seconds have passed.
+        :param job: The job.
+        :return: Iterator over the job's descriptions, starting with its current one. The last includes its result or
+        error if the job finished.
+        """
+        deadline = monotonic() + settings.ANALYSIS_EVENTS_WINDOW
+        when_updated = None
+        while True:
+            if job.when_updated != when_updated:
+                when_updated = job.when_updated
+                yield jobs.describe(job)
+
+            if job.status in (AnalysisJob.DONE, AnalysisJob.FAILED) or monotonic() >= deadline:
+                return
+
+            sleep(settings.ANALYSIS_POLL_INTERVAL)
+            job.refresh_from_db()
@@ -0,0 +1,115 @@
+"""
+AST visitor dispatch microbenchmark.
+
+Compares visiting a synthetic AST recursively, through each node's accept method and the visitor's delegating visit
+methods, against visiting it through ASTVisitor's dispatch table, both with dispatch (recursive within its depth budget)
+and with the explicit-stack traversal that dispatch falls back on for deep subtrees.
+
+Run from the server directory with ``python -m benchmarks.ast_dispatch``.
+"""
+from argparse import ArgumentParser
+from timeit import repeat
+
+from metrics.structures.ast import AST, ASTStatementsNode, ASTFunctionDefinitionNode, ASTIdentifierNode, \
+    ASTIfStatementNode, ASTAssignmentStatementNode, ASTBinaryOperationNode, ASTLiteralNode, ASTLiteralType, \
+    ASTReturnStatementNode, ASTArithmeticOperation
+from metrics.visitors.base.ast_visitor import ASTVisitor
+
+
+class AcceptASTVisitor(ASTVisitor):
+    """
+    Accept AST visitor.
+
+    Visits nodes recursively through their accept methods, as ASTVisitor did before table-driven dispatch.
+    """
+
+    def visit(self, ast: AST):
+        return ast.root.accept(self)
+
+    def visit_children(self, node, results=None):
+        return {child: child.accept(self) for child in node.children.values() if child is not None}
+
+
+class TableASTVisitor(ASTVisitor):
+    """
+    Table AST visitor.
+
+    Visits nodes through ASTVisitor's dispatch table.
+    """
+    pass
+
+
+class IterativeASTVisitor(ASTVisitor):
+    """
+    Iterative AST visitor.
+
+    Visits nodes through ASTVisitor's dispatch table and explicit-stack traversal, however shallow the AST.
+    """
+
+    def visit(self, ast: AST):
+        return self.dispatch_iteratively(ast.root)
+
+
+def build_ast(functions: int, statements: int) -> AST:
+    """
+    Build a synthetic AST of function definitions made of if, assignment and return statements.
+
+    :param functions: The number of function definitions.
+    :param statements: The number of if statements in each function definition's body.
+    :return: The synthetic AST.
+    """
+    definitions = []
+    for i in range(functions):
+        body = []
+        for j in range(statements):
+            value = ASTBinaryOperationNode(ASTArithmeticOperation.ADD, ASTIdentifierNode("x"),
+                                           ASTLiteralNode(ASTLiteralType.NUMBER, str(j)))
+            body.append(ASTIfStatementNode(ASTIdentifierNode("x"),
+                                           ASTAssignmentStatementNode(ASTIdentifierNode("x"), value)))
+        body.append(ASTReturnStatementNode(ASTIdentifierNode("x")))
+        definitions.append(ASTFunctionDefinitionNode(ASTIdentifierNode(f"f{i}"), body=ASTStatementsNode(body)))
+
+    return AST(ASTStatementsNode(definitions))
+
+
+def count_nodes(ast: AST) -> int:
+    """
+    Count the nodes of an AST.
+
+    :param ast: The AST whose nodes to count.
+    :return: The number of nodes.
+    """
+    count, stack = 0, [ast.root]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(child for child in node.children.values() if child is not None)
+
+    return count
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--functions", type=int, default=100)
+    parser.add_argument("--statements", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=10)
+    arguments = parser.parse_args()
+
+    ast = build_ast(arguments.functions, arguments.statements)
+    nodes = count_nodes(ast)
+    print(f"{nodes} nodes, best of {arguments.repeat} x {arguments.number} visits")
+
+    # The visitors take turns, so that noise from the machine is spread across all of them.
+    visitors = (AcceptASTVisitor(), TableASTVisitor(), IterativeASTVisitor())
+    best = {visitor: float("inf") for visitor in visitors}
+    for _ in range(arguments.repeat):
+        for visitor in visitors:
+            best[visitor] = min(best[visitor], *repeat(lambda: visitor.visit(ast), repeat=1, number=arguments.number))
+
+    for visitor in visitors:
+        print(f"{type(visitor).__name__:<20} {best[visitor] / arguments.number / nodes * 1e9:8.1f} ns/node")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Cyclomatic complexity engine benchmark and differential check.
+
+Compares calculating cyclomatic complexity by building a control-flow graph (E - N + 2) against calculating extended
+cyclomatic complexity by counting decision points in the AST (D + 1), on a synthetic AST or on a corpus of source files,
+and reports the files on which the two differ (see ASTCCCalculationVisitor for why they can).
+
+Run from the server directory with ``python -m benchmarks.cc_engines [FILE ...]``.
+"""
+from argparse import ArgumentParser
+from timeit import repeat
+
+from benchmarks.ast_dispatch import build_ast, count_nodes
+from metrics.visitors.metrics.ast_cc_calculation_visitor import ASTCCCalculationVisitor
+from metrics.visitors.metrics.cc_calculation_visitor import CCCalculationVisitor
+from metrics.visitors.structures.cfg_generation_visitor import CFGGenerationVisitor
+
+ENGINES = {
+    "cfg": lambda ast: CCCalculationVisitor().visit(CFGGenerationVisitor().visit(ast)),
+    "ast": lambda ast: ASTCCCalculationVisitor().visit(ast),
+}
+
+
+def parse_file(path: str):
+    """
+    Parse a Python or C# source file into an AST.
+
+    :param path: The path of the file to parse.
+    :return: The file's AST.
+    """
+    from metrics.calculator import Calculator
+
+    if path.endswith(".py"):
+        from metrics.parsers.python3.ast_generation_visitor import ASTGenerationVisitor
+        from metrics.parsers.python3.base.Python3Lexer import Python3Lexer as Lexer
+        from metrics.parsers.python3.parser import Python3Parser as Parser
+    else:
+        from metrics.parsers.csharp.ast_generation_visitor import ASTGenerationVisitor
+        from metrics.parsers.csharp.base.ModifiedCSharpLexer import CSharpLexer as Lexer
+        from metrics.parsers.csharp.parser import CSharpParser as Parser
+
+    with open(path) as f:
+        return Calculator(f.read(), Lexer, Parser, ASTGenerationVisitor).ast
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("files", nargs="*", help="Source files to check and time the engines on, instead of a "
+                                                 "synthetic AST.")
+    parser.add_argument("--functions", type=int, default=100)
+    parser.add_argument("--statements", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=10)
+    arguments = parser.parse_args()
+
+    if arguments.files:
+        asts = {path: parse_file(path) for path in arguments.files}
+    else:
+        asts = {"synthetic": build_ast(arguments.functions, arguments.statements)}
+
+    nodes = sum(count_nodes(ast) for ast in asts.values() if ast.root is not None)
+    print(f"{len(asts)} file(s), {nodes} nodes, best of {arguments.repeat} x {arguments.number} calculations")
+
+    for path, ast in asts.items():
+        results = {name: engine(ast) for name, engine in ENGINES.items()}
+        if len(set(results.values())) > 1:
+            print(f"Difference in {path}: {results}")
+
+    for name, engine in ENGINES.items():
+        best = min(repeat(lambda: [engine(ast) for ast in asts.values()], repeat=arguments.repeat,
+                          number=arguments.number))
+        print(f"{name:<4} {best / arguments.number * 1e3:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
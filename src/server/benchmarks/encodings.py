@@ -0,0 +1,57 @@
+"""
+Response encoding benchmark.
+
+Compares the time taken to encode a formatted structure payload, and the size of the encoding, across json.dumps, the
+incremental JSON encoder (with orjson encoding whole structures, when it is installed) and the in-tree MessagePack
+encoder, with and without its string table.
+
+Run from the server directory with ``python -m benchmarks.encodings``.
+"""
+import json
+from argparse import ArgumentParser
+from timeit import repeat
+
+from benchmarks.ast_dispatch import build_ast, count_nodes
+from metrics.json_stream import iterencode_chunks
+from metrics.message_pack import packb
+from metrics.visitors.formatting.ast_formatting_visitor import ASTFormattingVisitor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ENCODINGS = {
+    "json.dumps": lambda payload: json.dumps(payload).encode("utf-8"),
+    "json stream": lambda payload: b"".join(iterencode_chunks(payload)),
+    "msgpack": lambda payload: packb(payload),
+    "msgpack + strings": lambda payload: packb(payload, string_table=True),
+}
+
+if orjson is not None:
+    ENCODINGS["orjson"] = orjson.dumps
+    ENCODINGS["json stream + orjson"] = lambda payload: b"".join(
+        iterencode_chunks(payload, dumps=lambda value: orjson.dumps(value).decode("utf-8"), separators=(",", ":")))
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--functions", type=int, default=100)
+    parser.add_argument("--statements", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=3)
+    arguments = parser.parse_args()
+
+    ast = build_ast(arguments.functions, arguments.statements)
+    payload = {"structures": {"abstractSyntaxTree": ASTFormattingVisitor().visit(ast)}}
+    print(f"Formatted AST of {count_nodes(ast)} nodes, best of {arguments.repeat} x {arguments.number} encodings")
+
+    baseline = len(ENCODINGS["json.dumps"](payload))
+    for name, encode in ENCODINGS.items():
+        size = len(encode(payload))
+        best = min(repeat(lambda: encode(payload), repeat=arguments.repeat, number=arguments.number))
+        print(f"{name:<22} {best / arguments.number * 1e3:8.2f} ms {size:>10} bytes ({size / baseline:6.1%})")
+
+
+if __name__ == "__main__":
+    main()
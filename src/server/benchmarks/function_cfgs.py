@@ -0,0 +1,73 @@
+"""
+Per-function control-flow graph generation benchmark.
+
+Compares generating the CFGs of a synthetic AST's functions in this process against generating them across a warm
+process pool, for increasing numbers of functions, along with the time this process alone spends pickling the functions
+to send them to the pool (see FunctionCFGs.parallel_threshold).
+
+Run from the server directory with ``python -m benchmarks.function_cfgs``.
+"""
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from pickle import dumps
+from time import perf_counter
+
+from benchmarks.ast_dispatch import build_ast
+from metrics.visitors.structures.function_cfg_generation_visitor import FunctionCFGGenerationVisitor
+
+
+def generate(functions: int, statements: int, executor=None) -> float:
+    """
+    Time generating every function's CFG of a synthetic AST.
+
+    :param functions: The number of functions in the AST.
+    :param statements: The number of statements in each function.
+    :param executor: Executor to generate the CFGs across. None generates them in this process.
+    :return: The time taken, in seconds.
+    """
+    cfgs = FunctionCFGGenerationVisitor().visit(build_ast(functions, statements))
+    cfgs.parallel_threshold = 0
+
+    start = perf_counter()
+    cfgs.generate_all(executor)
+    return perf_counter() - start
+
+
+def send(functions: int, statements: int) -> float:
+    """
+    Time pickling every function of a synthetic AST, as is done to send them to worker processes.
+
+    :param functions: The number of functions in the AST.
+    :param statements: The number of statements in each function.
+    :return: The time taken, in seconds.
+    """
+    nodes = list(FunctionCFGGenerationVisitor().visit(build_ast(functions, statements)).functions.values())
+
+    start = perf_counter()
+    for node in nodes:
+        dumps(node)
+    return perf_counter() - start
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--functions", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--statements", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=None)
+    arguments = parser.parse_args()
+
+    with ProcessPoolExecutor(arguments.workers) as executor:
+        # Start the pool's workers up front, so that their start-up is not timed.
+        generate(100, 1, executor)
+
+        print(f"{'functions':>10} {'serial':>10} {'pool':>10} {'send':>10}")
+        for functions in arguments.functions:
+            serial = min(generate(functions, arguments.statements) for _ in range(arguments.repeat))
+            pool = min(generate(functions, arguments.statements, executor) for _ in range(arguments.repeat))
+            sent = min(send(functions, arguments.statements) for _ in range(arguments.repeat))
+            print(f"{functions:>10} {serial * 1e3:8.1f}ms {pool * 1e3:8.1f}ms {sent * 1e3:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+from typing import Iterator, List, Optional, Tuple, Union
+
+from metrics.analysis.dominators import reverse_postorder, immediate_dominators, dominator_tree_intervals
+from metrics.analysis.loops import LoopForest
+from metrics.structures.cfg import CFG
+from metrics.structures.compact_cfg import CompactCFG, EXIT_EDGE
+
+
+class CFGAnalysis(object):
+    """
+    Control-flow graph analysis.
+
+    Computes the dominator and post-dominator trees of a control-flow graph, in compact form, and derives its
+    loop-nesting forest and its unreachable blocks from them, along with the nesting depth of each block. Each is
+    computed once, the first time it is needed.
+
+    Post-dominators are computed on the reversed graph, from a virtual exit node (numbered after the blocks) that every
+    block without successors leads to.
+    """
+
+    def __init__(self, cfg: Union[CFG, CompactCFG]):
+        """
+        Control-flow graph analysis.
+
+        :param cfg: The control-flow graph to analyse.
+        """
+        self.cfg = CompactCFG.from_cfg(cfg)
+
+        block_count = len(self.cfg)
+        self.successors: List[List[int]] = [list(self.cfg.successors(block)) for block in range(block_count)]
+        self.predecessors: List[List[int]] = [[] for _ in range(block_count)]
+        for block, successors in enumerate(self.successors):
+            for successor in successors:
+                self.predecessors[successor].append(block)
+
+        self._order: Optional[List[int]] = None
+        self._idom: Optional[List[int]] = None
+        self._ipdom: Optional[List[int]] = None
+        self._dominator_intervals: Optional[Tuple[List[int], List[int]]] = None
+        self._post_dominator_intervals: Optional[Tuple[List[int], List[int]]] = None
+        self._loops: Optional[LoopForest] = None
+        self._nesting_depths: Optional[List[int]] = None
+
+    def __str__(self):
+        return f"Control-flow graph analysis.\nCFG: {self.cfg}"
+
+    def __repr__(self):
+        return f"CFGAnalysis(cfg={self.cfg!r})"
+
+    # region Dominators
+
+    @property
+    def order(self) -> List[int]:
+        """
+        Getter for order property.
+
+        :return: The blocks reachable from the entry block, in reverse post-order.
+        """
+        if self._order is None:
+            self._order = reverse_postorder(self.successors, 0) if self.successors else []
+
+        return self._order
+
+    @property
+    def idom(self) -> List[int]:
+        """
+        Getter for idom property.
+
+        :return: The immediate dominator of each block. The entry block is its own immediate dominator, and unreachable
+        blocks have none (-1).
+        """
+        if self._idom is None:
+            self._idom = immediate_dominators(self.predecessors, self.order)
+
+        return self._idom
+
+    @property
+    def ipdom(self) -> List[int]:
+        """
+        Getter for ipdom property.
+
+        :return: The immediate post-dominator of each block. Blocks without successors are post-dominated by the virtual
+        exit node (numbered len(cfg)), and blocks that never reach an exit have none (-1).
+        """
+        if self._ipdom is None:
+            self._compute_post_dominators()
+
+        return self._ipdom
+
+    def dominates(self, first: int, second: int) -> bool:
+        """
+        Check whether a block dominates another, i.e. every path from the entry block to the second block passes through
+        the first. Every reachable block dominates itself.
+
+        :param first: The possibly dominating block.
+        :param second: The possibly dominated block.
+        :return: Whether the first block dominates the second.
+        """
+        entry, leave = self._get_dominator_intervals()
+        return entry[second] >= 0 and entry[first] <= entry[second] < leave[first]
+
+    def post_dominates(self, first: int, second: int) -> bool:
+        """
+        Check whether a block post-dominates another, i.e. every path from the second block to an exit passes through
+        the first. Every block that reaches an exit post-dominates itself.
+
+        :param first: The possibly post-dominating block.
+        :param second: The possibly post-dominated block.
+        :return: Whether the first block post-dominates the second.
+        """
+        if self._post_dominator_intervals is None:
+            self._compute_post_dominators()
+
+        entry, leave = self._post_dominator_intervals
+        return entry[second] >= 0 and entry[first] <= entry[second] < leave[first]
+
+    def _get_dominator_intervals(self) -> Tuple[List[int], List[int]]:
+        """
+        Get the dominator tree entry and leave numbers of each block, computing them if they have not been yet.
+
+        :return: The entry and leave numbers of each block.
+        """
+        if self._dominator_intervals is None:
+            self._dominator_intervals = dominator_tree_intervals(self.idom, self.order)
+
+        return self._dominator_intervals
+
+    def _compute_post_dominators(self) -> None:
+        """
+        Compute the immediate post-dominator of each block, and the post-dominator tree entry and leave numbers of each
+        block, on the reversed graph.
+        """
+        exit_node = len(self.successors)
+        reversed_successors = self.predecessors + [[block for block, successors in enumerate(self.successors)
+                                                    if not successors]]
+        reversed_predecessors = [successors or [exit_node] for successors in self.successors] + [[]]
+
+        order = reverse_postorder(reversed_successors, exit_node)
+        ipdom = immediate_dominators(reversed_predecessors, order)
+
+        self._ipdom = ipdom[:exit_node]
+        self._post_dominator_intervals = dominator_tree_intervals(ipdom, order)
+
+    # endregion
+
+    # region Derived structures
+
+    @property
+    def loops(self) -> LoopForest:
+        """
+        Getter for loops property.
+
+        :return: The loop-nesting forest.
+        """
+        if self._loops is None:
+            entry, leave = self._get_dominator_intervals()
+            self._loops = LoopForest.build(self.predecessors, self.order, entry, leave)
+
+        return self._loops
+
+    def nesting_depths(self) -> List[int]:
+        """
+        Calculate the nesting depth of each block in one depth-first pass over the CFG.
+
+        Each block is as deep as the block it is first reached from, plus one if it is reached through a branch's
+        success, fail or case edge rather than an exit edge. Exit edges are followed first, so the statements after an
+        if, loop or switch are not nested inside it, nor are blocks that a break leads to. If-else blocks have no exit
+        edge, so a branch's scope is also closed at its immediate post-dominator, where its paths merge again. Graphs
+        with breaks have no post-dominators, as a loop's exit and break blocks lead back to the loop, so there only exit
+        edges close scopes.
+
+        :return: The nesting depth of each block, starting at 1 for the entry block. 0 for unreachable blocks.
+        """
+        if self._nesting_depths is None:
+            depths = [0] * len(self.successors)
+
+            merges: List[List[int]] = [[] for _ in depths]
+            for block, ipdom in enumerate(self.ipdom):
+                if 0 <= ipdom < len(depths) and len(set(self.successors[block])) > 1:
+                    merges[ipdom].append(block)
+
+            if depths:
+                depths[0] = 1
+                stack = [(0, self._nesting_edges(0))]
+                while stack:
+                    parent, edges = stack[-1]
+                    for block, nested in edges:
+                        if not depths[block]:
+                            depths[block] = min([depths[parent] + nested] +
+                                                [depths[branch] for branch in merges[block] if depths[branch]])
+                            stack.append((block, self._nesting_edges(block)))
+                            break
+                    else:
+                        stack.pop()
+
+            self._nesting_depths = depths
+
+        return self._nesting_depths
+
+    def _nesting_edges(self, block: int) -> Iterator[Tuple[int, int]]:
+        """
+        Get a block's edges in the order nesting depths follow them, exit edges first.
+
+        :param block: The block whose edges to get.
+        :return: An iterator over a (target, nesting) pair for each of the block's edges, where nesting is 1 for edges
+        into a branch's scope and 0 otherwise.
+        """
+        edges = self.cfg.edges(block)
+
+        return iter([(target, 0) for target, kind in edges if kind == EXIT_EDGE] +
+                    [(target, 1) for target, kind in edges if kind != EXIT_EDGE])
+
+    def maximum_nesting_depth(self) -> Optional[int]:
+        """
+        Calculate the maximum nesting depth of the CFG.
+
+        :return: The maximum nesting depth. None if the CFG has no blocks.
+        """
+        return max(self.nesting_depths(), default=None)
+
+    def unreachable_blocks(self) -> List[int]:
+        """
+        Find the blocks that cannot be reached from the entry block.
+
+        :return: The unreachable blocks, in order.
+        """
+        return [block for block, idom in enumerate(self.idom) if idom < 0]
+
+    def non_terminating_blocks(self) -> List[int]:
+        """
+        Find the reachable blocks from which no exit can be reached, e.g. the blocks of an infinite loop.
+
+        :return: The non-terminating blocks, in order.
+        """
+        return [block for block, ipdom in enumerate(self.ipdom) if ipdom < 0 and self.idom[block] >= 0]
+
+    # endregion
@@ -0,0 +1,177 @@
+from array import array
+from typing import List, Sequence, Tuple
+
+
+def strongly_connected_components(offsets: Sequence[int], targets: Sequence[int]) -> Tuple[List[List[int]], List[int]]:
+    """
+    Find the strongly connected components of a graph in compressed sparse row form, with an iterative version of
+    Tarjan's algorithm, in O(V + E).
+
+    Components are found in reverse topological order: each component comes after every component that it has an edge
+    to, so for dependency graphs each component comes after the components it depends on.
+
+    :param offsets: The offset of each node's first edge, followed by the number of edges.
+    :param targets: The node each edge leads to.
+    :return: The nodes of each component, and the component of each node.
+    """
+    node_count = len(offsets) - 1
+    index = [-1] * node_count
+    low = [0] * node_count
+    on_stack = bytearray(node_count)
+    stack: List[int] = []
+    components: List[List[int]] = []
+    component = [-1] * node_count
+    counter = 0
+
+    for root in range(node_count):
+        if index[root] >= 0:
+            continue
+
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+
+        # Frames are [node, offset of the next edge to follow].
+        work = [[root, offsets[root]]]
+        while work:
+            frame = work[-1]
+            node, position = frame
+            end = offsets[node + 1]
+            while position < end:
+                target = targets[position]
+                position += 1
+                if index[target] < 0:
+                    frame[1] = position
+                    index[target] = low[target] = counter
+                    counter += 1
+                    stack.append(target)
+                    on_stack[target] = 1
+                    work.append([target, offsets[target]])
+                    break
+
+                if on_stack[target] and index[target] < low[node]:
+                    low[node] = index[target]
+            else:
+                work.pop()
+                if work and low[node] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[node]
+
+                if low[node] == index[node]:
+                    members = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = 0
+                        component[member] = len(components)
+                        members.append(member)
+                        if member == node:
+                            break
+
+                    members.reverse()
+                    components.append(members)
+
+    return components, component
+
+
+class Condensation(object):
+    """
+    Condensation of a graph.
+
+    The directed acyclic graph with a node for each strongly connected component of the graph, and an edge between two
+    components wherever the graph has an edge between their nodes, held in compressed sparse row form. Components are
+    numbered in reverse topological order, as found by strongly_connected_components.
+    """
+
+    def __init__(self, components: List[List[int]], component: List[int], offsets: array, targets: array,
+                 cyclic: bytearray):
+        """
+        Condensation of a graph.
+
+        :param components: The nodes of each component.
+        :param component: The component of each node.
+        :param offsets: The offset of each component's first edge, followed by the number of edges.
+        :param targets: The component each edge leads to.
+        :param cyclic: Whether each component holds a cycle, i.e. has several nodes or a node with an edge to itself.
+        """
+        self.components = components
+        self.component = component
+        self.offsets = offsets
+        self.targets = targets
+        self.cyclic = cyclic
+
+    def __str__(self):
+        return f"Condensation.\nComponents: {len(self)}\nEdges: {len(self.targets)}"
+
+    def __repr__(self):
+        return f"Condensation(components={self.components}, offsets={self.offsets}, targets={self.targets})"
+
+    def __len__(self):
+        return len(self.components)
+
+    def successors(self, component: int) -> array:
+        """
+        Get the components that a component's edges lead to.
+
+        :param component: The component whose successors to get.
+        :return: The component's successors.
+        """
+        return self.targets[self.offsets[component]:self.offsets[component + 1]]
+
+    def cycles(self) -> List[List[int]]:
+        """
+        Get the components that hold cycles.
+
+        :return: The nodes of each cyclic component.
+        """
+        return [members for members, cyclic in zip(self.components, self.cyclic) if cyclic]
+
+    def layers(self) -> List[int]:
+        """
+        Calculate the layer of each component: 0 for components without edges, and otherwise one more than the highest
+        layer of the components its edges lead to. For dependency graphs, each component only depends on components in
+        lower layers.
+
+        :return: The layer of each component.
+        """
+        offsets, targets = self.offsets, self.targets
+        layers = [0] * len(self.components)
+        for component in range(len(self.components)):
+            for position in range(offsets[component], offsets[component + 1]):
+                if layers[targets[position]] + 1 > layers[component]:
+                    layers[component] = layers[targets[position]] + 1
+
+        return layers
+
+    @classmethod
+    def build(cls, offsets: Sequence[int], targets: Sequence[int]) -> "Condensation":
+        """
+        Build the condensation of a graph in compressed sparse row form, in O(V + E).
+
+        :param offsets: The offset of each node's first edge, followed by the number of edges.
+        :param targets: The node each edge leads to.
+        :return: The condensation.
+        """
+        components, component = strongly_connected_components(offsets, targets)
+
+        condensed_offsets = array("l", [0])
+        condensed_targets = array("l")
+        cyclic = bytearray(len(components))
+        # The last component that an edge was added to each component from, to skip parallel edges.
+        last = [-1] * len(components)
+
+        for number, members in enumerate(components):
+            if len(members) > 1:
+                cyclic[number] = 1
+
+            for node in members:
+                for position in range(offsets[node], offsets[node + 1]):
+                    target = component[targets[position]]
+                    if target == number:
+                        cyclic[number] = 1
+                    elif last[target] != number:
+                        last[target] = number
+                        condensed_targets.append(target)
+
+            condensed_offsets.append(len(condensed_targets))
+
+        return cls(components, component, condensed_offsets, condensed_targets, cyclic)
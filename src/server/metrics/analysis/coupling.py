@@ -0,0 +1,41 @@
+from typing import Dict, Tuple
+
+from metrics.structures.dependency_graph import Class
+from metrics.structures.indexed_dependency_graph import IndexedDependencyGraph
+
+
+def couplings(graph: IndexedDependencyGraph) -> Tuple[Dict[Class, int], Dict[Class, int]]:
+    """
+    Calculate the afferent and efferent coupling of each class in one sweep over the dependencies, in O(V + E).
+
+    The afferent coupling of a class is the number of classes that directly depend on it, and its efferent coupling is
+    the number of classes that it directly depends on. Both are given for each class listed in the graph, in order. The
+    afferent coupling is also given for every other class that something depends on, and the efferent coupling for
+    every other reachable class that depends on something, in the order the classes are first met.
+
+    :param graph: The indexed dependency graph.
+    :return: The afferent and efferent coupling of each class.
+    """
+    offsets, targets = graph.offsets, graph.targets
+    afferent = [0] * len(graph)
+    listed = bytearray(len(graph))
+    for root in graph.roots:
+        listed[root] = 1
+
+    afferent_order = list(graph.roots)
+    efferent_order = list(graph.roots)
+    for cls in range(len(graph)):
+        start, end = offsets[cls], offsets[cls + 1]
+        if start < end and not listed[cls]:
+            efferent_order.append(cls)
+
+        for position in range(start, end):
+            target = targets[position]
+            if not afferent[target] and not listed[target]:
+                afferent_order.append(target)
+            afferent[target] += 1
+
+    classes = graph.classes
+
+    return ({classes[cls]: afferent[cls] for cls in afferent_order},
+            {classes[cls]: offsets[cls + 1] - offsets[cls] for cls in efferent_order})
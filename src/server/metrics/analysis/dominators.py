@@ -0,0 +1,122 @@
+from typing import List, Sequence, Tuple
+
+
+def reverse_postorder(successors: Sequence[Sequence[int]], root: int) -> List[int]:
+    """
+    Order the nodes reachable from a root in reverse post-order of a depth-first search, with an explicit stack.
+
+    Every node comes after its immediate dominator in the order, and, along edges that are not back edges, after each of
+    its predecessors.
+
+    :param successors: The successors of each node, in order.
+    :param root: The node to start from.
+    :return: The nodes reachable from the root, in reverse post-order.
+    """
+    visited = bytearray(len(successors))
+    postorder = []
+
+    visited[root] = 1
+    stack = [(root, iter(successors[root]))]
+    while stack:
+        node, children = stack[-1]
+        for child in children:
+            if not visited[child]:
+                visited[child] = 1
+                stack.append((child, iter(successors[child])))
+                break
+        else:
+            stack.pop()
+            postorder.append(node)
+
+    postorder.reverse()
+    return postorder
+
+
+def immediate_dominators(predecessors: Sequence[Sequence[int]], order: Sequence[int]) -> List[int]:
+    """
+    Compute the immediate dominator of each node, with the iterative algorithm of Cooper, Harvey and Kennedy ("A Simple,
+    Fast Dominance Algorithm").
+
+    Each pass visits the nodes in reverse post-order and intersects the dominators of each node's processed
+    predecessors by walking up the dominator tree built so far. The passes repeat until nothing changes, which for the
+    reducible graphs of structured code takes two passes, so the computation is near-linear.
+
+    :param predecessors: The predecessors of each node.
+    :param order: The nodes reachable from the root, in reverse post-order, starting with the root.
+    :return: The immediate dominator of each node. The root is its own immediate dominator, and nodes unreachable from
+    the root have none (-1).
+    """
+    idom = [-1] * len(predecessors)
+    if not order:
+        return idom
+
+    index = [-1] * len(predecessors)
+    for position, node in enumerate(order):
+        index[node] = position
+
+    root = order[0]
+    idom[root] = root
+
+    changed = True
+    while changed:
+        changed = False
+        for node in order[1:]:
+            new_idom = -1
+            for predecessor in predecessors[node]:
+                if idom[predecessor] < 0:
+                    continue
+
+                if new_idom < 0:
+                    new_idom = predecessor
+                    continue
+
+                # Intersect: walk both fingers up the dominator tree until they meet.
+                first, second = predecessor, new_idom
+                while first != second:
+                    while index[first] > index[second]:
+                        first = idom[first]
+                    while index[second] > index[first]:
+                        second = idom[second]
+                new_idom = first
+
+            if idom[node] != new_idom:
+                idom[node] = new_idom
+                changed = True
+
+    return idom
+
+
+def dominator_tree_intervals(idom: Sequence[int], order: Sequence[int]) -> Tuple[List[int], List[int]]:
+    """
+    Number the nodes of a dominator tree in pre-order, recording the interval of numbers covered by each node's subtree,
+    so that dominance can be tested in constant time: a dominates b iff entry[a] <= entry[b] < leave[a].
+
+    :param idom: The immediate dominator of each node.
+    :param order: The nodes reachable from the root, in reverse post-order, starting with the root.
+    :return: The entry and leave numbers of each node, both -1 for unreachable nodes.
+    """
+    children: List[List[int]] = [[] for _ in idom]
+    for node in order[1:]:
+        children[idom[node]].append(node)
+
+    entry = [-1] * len(idom)
+    leave = [-1] * len(idom)
+    if not order:
+        return entry, leave
+
+    number = 0
+    stack = [(order[0], iter(children[order[0]]))]
+    entry[order[0]] = number
+    number += 1
+    while stack:
+        node, remaining = stack[-1]
+        for child in remaining:
+            entry[child] = number
+            number += 1
+            stack.append((child, iter(children[child])))
+            break
+        else:
+            stack.pop()
+            leave[node] = number
+
+    return entry, leave
@@ -0,0 +1,130 @@
+from collections import deque
+from typing import Dict, List, Optional
+
+from metrics.structures.inheritance_tree import InheritanceTree, Class
+
+
+class InheritanceMetrics(object):
+    """
+    Inheritance metrics.
+
+    The depth of inheritance, number of children and number of descendants of each class in an inheritance tree,
+    calculated together in one topological pass over the tree. With multiple inheritance the tree is a directed acyclic
+    graph, so a class is only reached once all of its superclasses have been, and is visited once however many paths
+    lead to it.
+    """
+
+    def __init__(self, classes: List[Class], depths: List[int], children: List[int], descendants: List[int]):
+        """
+        Inheritance metrics.
+
+        :param classes: The classes in the tree, in topological order, starting from the base class.
+        :param depths: The depth of inheritance of each class, i.e. the length of the longest path from the base class.
+        :param children: The number of classes that directly inherit from each class.
+        :param descendants: The number of distinct classes that inherit from each class, directly or indirectly.
+        """
+        self.classes = classes
+        self.depths = depths
+        self.children = children
+        self.descendants = descendants
+
+    def __str__(self):
+        return f"Inheritance metrics.\nClasses: {len(self)}\nMaximum depth: {self.maximum_depth}"
+
+    def __repr__(self):
+        return f"InheritanceMetrics(classes={self.classes}, depths={self.depths}, children={self.children}, " \
+               f"descendants={self.descendants})"
+
+    def __len__(self):
+        return len(self.classes)
+
+    @property
+    def maximum_depth(self) -> Optional[int]:
+        """
+        Getter for maximum_depth property.
+
+        :return: The number of classes on the longest inheritance path, base class included, i.e. one more than the
+        highest depth of inheritance. None if the tree has no base class.
+        """
+        return max(self.depths) + 1 if self.depths else None
+
+    def depth_of_inheritance(self) -> Dict[Class, int]:
+        """
+        Get the depth of inheritance of each class.
+
+        :return: Mapping of each class to its depth of inheritance, in order.
+        """
+        return dict(zip(self.classes, self.depths))
+
+    def number_of_children(self) -> Dict[Class, int]:
+        """
+        Get the number of children of each class.
+
+        :return: Mapping of each class to its number of children, in order.
+        """
+        return dict(zip(self.classes, self.children))
+
+    def number_of_descendants(self) -> Dict[Class, int]:
+        """
+        Get the number of descendants of each class.
+
+        :return: Mapping of each class to its number of descendants, in order.
+        """
+        return dict(zip(self.classes, self.descendants))
+
+    @classmethod
+    def build(cls, tree: InheritanceTree) -> "InheritanceMetrics":
+        """
+        Calculate the inheritance metrics of an inheritance tree with Kahn's algorithm, in O(V + E) (plus the cost of
+        merging the descendant sets of classes with several superclasses).
+
+        :param tree: The inheritance tree.
+        :return: The inheritance metrics.
+        """
+        if tree.base is None:
+            return cls([], [], [], [])
+
+        # Number the classes reachable from the base, and count each one's superclasses within the tree.
+        numbers: Dict[int, int] = {id(tree.base): 0}
+        found = [tree.base]
+        superclass_counts = [0]
+        for node in found:
+            for subclass in node.subclasses or []:
+                number = numbers.get(id(subclass))
+                if number is None:
+                    numbers[id(subclass)] = len(found)
+                    found.append(subclass)
+                    superclass_counts.append(1)
+                else:
+                    superclass_counts[number] += 1
+
+        # Take each class once all of its superclasses have been taken, so its depth is final when it is taken.
+        order: List[int] = []
+        depths = [0] * len(found)
+        ready = deque([0])
+        while ready:
+            number = ready.popleft()
+            order.append(number)
+            for subclass in found[number].subclasses or []:
+                subclass_number = numbers[id(subclass)]
+                if depths[number] + 1 > depths[subclass_number]:
+                    depths[subclass_number] = depths[number] + 1
+
+                superclass_counts[subclass_number] -= 1
+                if not superclass_counts[subclass_number]:
+                    ready.append(subclass_number)
+
+        # Going backwards, every subclass of a class is done before the class, so each class' descendants are the
+        # union of its subclasses and their descendants, held as a bitset so shared descendants are only counted once.
+        bitsets = [0] * len(found)
+        for number in reversed(order):
+            bits = 0
+            for subclass in found[number].subclasses or []:
+                subclass_number = numbers[id(subclass)]
+                bits |= bitsets[subclass_number] | (1 << subclass_number)
+            bitsets[number] = bits
+
+        return cls([found[number] for number in order],
+                   [depths[number] for number in order],
+                   [len(found[number].subclasses or []) for number in order],
+                   [bin(bitsets[number]).count("1") for number in order])
@@ -0,0 +1,117 @@
+from typing import Dict, List, Sequence
+
+
+class LoopForest(object):
+    """
+    Loop-nesting forest.
+
+    Each loop is identified by its header, the block that dominates the rest of the loop and that each of the loop's
+    back edges leads to. Each block belongs to the innermost loop containing it (if any), and each loop's parent is the
+    innermost loop containing it (if any).
+    """
+
+    def __init__(self, headers: Sequence[int], parents: Dict[int, int], innermost: Sequence[int]):
+        """
+        Loop-nesting forest.
+
+        :param headers: The header of each loop, outer loops before the loops nested inside them.
+        :param parents: Mapping of each loop's header to the header of its parent loop. -1 for outermost loops.
+        :param innermost: The header of the innermost loop containing each block. -1 for blocks outside all loops.
+        """
+        self.headers = list(headers)
+        self.parents = parents
+        self.innermost = list(innermost)
+
+        self.depths: Dict[int, int] = {}
+        for header in self.headers:
+            parent = self.parents[header]
+            self.depths[header] = self.depths[parent] + 1 if parent >= 0 else 1
+
+    def __str__(self):
+        return f"Loop-nesting forest.\nHeaders: {self.headers}\nParents: {self.parents}"
+
+    def __repr__(self):
+        return f"LoopForest(headers={self.headers}, parents={self.parents}, innermost={self.innermost})"
+
+    def __len__(self):
+        return len(self.headers)
+
+    def loop_depth(self, block: int) -> int:
+        """
+        Get the number of loops containing a block.
+
+        :param block: The block.
+        :return: The block's loop depth. 0 for blocks outside all loops.
+        """
+        header = self.innermost[block]
+        return self.depths[header] if header >= 0 else 0
+
+    def maximum_depth(self) -> int:
+        """
+        Get the maximum number of nested loops.
+
+        :return: The maximum loop depth. 0 if there are no loops.
+        """
+        return max(self.depths.values(), default=0)
+
+    @classmethod
+    def build(cls, predecessors: Sequence[Sequence[int]], order: Sequence[int], entry: Sequence[int],
+              leave: Sequence[int]) -> "LoopForest":
+        """
+        Build the loop-nesting forest of a graph from its dominator tree.
+
+        Headers are processed innermost first (in reverse of reverse post-order). Each loop's body is collected by
+        walking backwards from the sources of its back edges, and each inner loop met on the way is collapsed into the
+        loop being built, through a union-find over the blocks, so each block is only walked from once. Blocks reached
+        that the header does not dominate (entries into irreducible regions) are left out of the loop.
+
+        :param predecessors: The predecessors of each block.
+        :param order: The blocks reachable from the entry block, in reverse post-order.
+        :param entry: The dominator tree entry number of each block, from dominator_tree_intervals.
+        :param leave: The dominator tree leave number of each block, from dominator_tree_intervals.
+        :return: The loop-nesting forest.
+        """
+        def dominates(first: int, second: int) -> bool:
+            return entry[first] <= entry[second] < leave[first]
+
+        def find(block: int) -> int:
+            root = block
+            while outer[root] != root:
+                root = outer[root]
+            while outer[block] != root:
+                outer[block], block = root, outer[block]
+            return root
+
+        outer = list(range(len(predecessors)))
+        innermost = [-1] * len(predecessors)
+        parents: Dict[int, int] = {}
+        headers: List[int] = []
+
+        for header in reversed(order):
+            sources = [block for block in predecessors[header] if entry[block] >= 0 and dominates(header, block)]
+            if not sources:
+                continue
+
+            headers.append(header)
+            parents[header] = -1
+            innermost[header] = header
+
+            seen = {header}
+            worklist = sources
+            while worklist:
+                block = find(worklist.pop())
+                if block in seen or not dominates(header, block):
+                    continue
+
+                seen.add(block)
+                if block in parents:
+                    # The header of an inner loop: the inner loop is nested in this one.
+                    parents[block] = header
+                else:
+                    innermost[block] = header
+
+                outer[block] = header
+                worklist.extend(predecessor for predecessor in predecessors[block] if entry[predecessor] >= 0)
+
+        headers.reverse()
+        return cls(headers, parents, innermost)
@@ -0,0 +1,62 @@
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from metrics.structures.dependency_matrix import DependencyMatrix
+
+
+def main_sequence_metrics(matrix: DependencyMatrix, abstract: Optional[Sequence[bool]] = None,
+                          packages: Optional[Sequence[int]] = None) -> Dict[str, np.ndarray]:
+    """
+    Calculate the package metrics of a dependency matrix as vectorized reductions over its entries.
+
+    For each package: its afferent coupling Ca (the number of classes outside the package that depend on classes inside
+    it), its efferent coupling Ce (the number of classes outside the package that classes inside it depend on), its
+    instability I = Ce / (Ca + Ce), its abstractness A (the fraction of its classes that are abstract) and its distance
+    from the main sequence D = |A + I - 1|. Packages without couplings have an instability of 0.
+
+    Without packages, each class is a package of its own, and Ca and Ce count every dependency, as the coupling kernel
+    does.
+
+    :param matrix: The sparse dependency matrix.
+    :param abstract: Whether each class is abstract. No class is abstract if not supplied.
+    :param packages: The package number (from 0) of each class. Each class is a package of its own if not supplied.
+    :return: Mapping of each metric ("afferent", "efferent", "instability", "abstractness" and "distance") to its value
+    for each package.
+    """
+    class_count = len(matrix)
+    abstract = np.zeros(class_count, dtype=bool) if abstract is None else np.asarray(abstract, dtype=bool)
+
+    if packages is None:
+        package_count = class_count
+        afferent = np.bincount(matrix.indices, minlength=class_count)
+        efferent = np.diff(matrix.indptr)
+        abstractness = abstract.astype(np.float64)
+    else:
+        packages = np.asarray(packages, dtype=np.int64)
+        package_count = int(packages.max()) + 1 if class_count else 0
+
+        sources, targets = matrix.rows(), matrix.indices
+        source_packages, target_packages = packages[sources], packages[targets]
+        external = source_packages != target_packages
+
+        # Each distinct (outside class, package) and (package, outside class) pair is counted once.
+        incoming = np.unique(sources[external] * package_count + target_packages[external])
+        outgoing = np.unique(source_packages[external] * class_count + targets[external])
+        afferent = np.bincount(incoming % package_count, minlength=package_count) if package_count else incoming
+        efferent = np.bincount(outgoing // class_count, minlength=package_count) if package_count else outgoing
+
+        sizes = np.bincount(packages, minlength=package_count)
+        abstract_counts = np.bincount(packages, weights=abstract, minlength=package_count)
+        abstractness = np.divide(abstract_counts, sizes, out=np.zeros(package_count), where=sizes > 0)
+
+    couplings = afferent + efferent
+    instability = np.divide(efferent, couplings, out=np.zeros(package_count), where=couplings > 0)
+
+    return {
+        "afferent": afferent,
+        "efferent": efferent,
+        "instability": instability,
+        "abstractness": abstractness,
+        "distance": np.abs(abstractness + instability - 1),
+    }
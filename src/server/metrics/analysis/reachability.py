@@ -0,0 +1,129 @@
+from typing import List, Optional, Sequence
+
+from metrics.analysis.components import Condensation
+
+
+class ReachabilityIndex(object):
+    """
+    Reachability index.
+
+    Answers transitive reachability queries on a graph from its condensation, with a bitset (a Python int) for each
+    component of the components it reaches, and one of the components that reach it. Each set of bitsets is built in
+    one pass over the condensation, in topological order, the first time it is needed, after which checking whether a
+    node reaches another is a single bit test.
+    """
+
+    def __init__(self, condensation: Condensation):
+        """
+        Reachability index.
+
+        :param condensation: The condensation of the graph to index.
+        """
+        self.condensation = condensation
+        self._descendants: Optional[List[int]] = None
+        self._ancestors: Optional[List[int]] = None
+
+    def __str__(self):
+        return f"Reachability index.\nComponents: {len(self.condensation)}"
+
+    def __repr__(self):
+        return f"ReachabilityIndex(condensation={self.condensation!r})"
+
+    @classmethod
+    def build(cls, offsets: Sequence[int], targets: Sequence[int]) -> "ReachabilityIndex":
+        """
+        Build the reachability index of a graph in compressed sparse row form.
+
+        :param offsets: The offset of each node's first edge, followed by the number of edges.
+        :param targets: The node each edge leads to.
+        :return: The reachability index.
+        """
+        return cls(Condensation.build(offsets, targets))
+
+    @property
+    def descendants(self) -> List[int]:
+        """
+        Getter for descendants property.
+
+        :return: The bitset of the components that each component reaches through at least one edge.
+        """
+        if self._descendants is None:
+            condensation = self.condensation
+            descendants = [0] * len(condensation)
+            # Components come after every component they have an edge to, so successors are complete when needed.
+            for component in range(len(condensation)):
+                bits = 1 << component if condensation.cyclic[component] else 0
+                for successor in condensation.successors(component):
+                    bits |= descendants[successor] | (1 << successor)
+                descendants[component] = bits
+
+            self._descendants = descendants
+
+        return self._descendants
+
+    @property
+    def ancestors(self) -> List[int]:
+        """
+        Getter for ancestors property.
+
+        :return: The bitset of the components that reach each component through at least one edge.
+        """
+        if self._ancestors is None:
+            condensation = self.condensation
+            ancestors = [1 << component if cyclic else 0 for component, cyclic in enumerate(condensation.cyclic)]
+            # Going backwards, every component with an edge to a component is done before the component is reached.
+            for component in reversed(range(len(condensation))):
+                bits = ancestors[component] | (1 << component)
+                for successor in condensation.successors(component):
+                    ancestors[successor] |= bits
+
+            self._ancestors = ancestors
+
+        return self._ancestors
+
+    def reaches(self, first: int, second: int) -> bool:
+        """
+        Check whether a node reaches another through at least one edge.
+
+        :param first: The node to start from.
+        :param second: The node to reach.
+        :return: Whether the first node reaches the second.
+        """
+        component = self.condensation.component
+
+        return bool(self.descendants[component[first]] >> component[second] & 1)
+
+    def reachable_from(self, node: int) -> List[int]:
+        """
+        Get the nodes that a node reaches through at least one edge, e.g. the transitive dependencies of a class.
+
+        :param node: The node to start from.
+        :return: The reached nodes, in order. The node itself is only included if it is part of a cycle.
+        """
+        return self._expand(self.descendants[self.condensation.component[node]])
+
+    def reaching(self, node: int) -> List[int]:
+        """
+        Get the nodes that reach a node through at least one edge, e.g. the transitive dependents of a class.
+
+        :param node: The node to reach.
+        :return: The reaching nodes, in order. The node itself is only included if it is part of a cycle.
+        """
+        return self._expand(self.ancestors[self.condensation.component[node]])
+
+    def _expand(self, bits: int) -> List[int]:
+        """
+        Expand a bitset of components into the nodes of those components.
+
+        :param bits: The bitset of components.
+        :return: The nodes of the components, in order.
+        """
+        components = self.condensation.components
+        nodes = []
+        while bits:
+            lowest = bits & -bits
+            nodes.extend(components[lowest.bit_length() - 1])
+            bits ^= lowest
+
+        nodes.sort()
+        return nodes
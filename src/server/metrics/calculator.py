@@ -1,25 +1,41 @@
-from typing import Type
+from typing import Type, Dict, Hashable, List, Set
 
+import numpy as np
 from antlr4 import InputStream, CommonTokenStream, Lexer, ParseTreeVisitor
 
+from metrics.analysis.components import Condensation
+from metrics.analysis.coupling import couplings
+from metrics.analysis.inheritance import InheritanceMetrics
+from metrics.analysis.package_metrics import main_sequence_metrics
+from metrics.analysis.reachability import ReachabilityIndex
 from metrics.parsers.parser import Parser
 from metrics.structures.ast import AST, ASTStatementsNode, ASTIfStatementNode, ASTLiteralNode, \
-    ASTLiteralType, ASTPassStatementNode
+    ASTLiteralType, ASTPassStatementNode, ASTInterfaceDefinitionNode, ASTIdentifierNode, \
+    ASTMiscModifier
 from metrics.structures.cfg import CFG, CFGIfElseBlock
 from metrics.structures.class_diagram import *
-from metrics.structures.dependency_graph import DependencyGraph, KnownClass as DGKnownClass
+from metrics.structures.compact_cfg import CompactCFG
+from metrics.structures.dependency_graph import DependencyGraph, Class as DGClass, KnownClass as DGKnownClass
+from metrics.structures.dependency_matrix import DependencyMatrix
+from metrics.structures.function_cfgs import FunctionCFGs
+from metrics.structures.indexed_dependency_graph import IndexedDependencyGraph
 from metrics.structures.inheritance_tree import InheritanceTree, Class as ITKnownClass
-from metrics.visitors.metrics.ac_calculation_visitor import ACCalculationVisitor
+from metrics.structures.symbol_table import SymbolTable
+from metrics.visitors.base.memo_table import MemoTable
+from metrics.visitors.metrics.ast_cc_calculation_visitor import ASTCCCalculationVisitor
 from metrics.visitors.metrics.cc_calculation_visitor import CCCalculationVisitor
-from metrics.visitors.metrics.ec_calculation_visitor import ECCalculationVisitor
 from metrics.visitors.metrics.lloc_calculation_visitor import LLOCCalculationVisitor
-from metrics.visitors.metrics.mid_calculation_visitor import MIDCalculationVisitor
 from metrics.visitors.metrics.mnd_calculation_visitor import MNDCalculationVisitor
 from metrics.visitors.structures.cfg_generation_visitor import CFGGenerationVisitor
 from metrics.visitors.structures.class_diagram_generation_visitor import ClassDiagramGenerationVisitor
 from metrics.visitors.structures.dependency_graph_generation_visitor import DependencyGraphGenerationVisitor
+from metrics.visitors.structures.function_cfg_generation_visitor import FunctionCFGGenerationVisitor
 from metrics.visitors.structures.inheritance_tree_generation_visitor import InheritanceTreeGenerationVisitor
 
+# Engines for calculating cyclomatic complexity: from the control-flow graph (E - N + 2), or from the decision points
+# in the AST (D + 1), which does not need the control-flow graph to be built.
+CC_ENGINES = ("cfg", "ast")
+
 
 class Calculator(object):
     """
@@ -29,7 +45,7 @@ class Calculator(object):
     """
 
     def __init__(self, content: str, lexer_type: Type[Lexer], parser_type: Type[Parser],
-                 visitor_type: Type[ParseTreeVisitor]):
+                 visitor_type: Type[ParseTreeVisitor], cc_engine: str = "cfg", simplify_cfg: bool = False):
         """
         Metric/model calculator.
 
@@ -37,7 +53,19 @@ class Calculator(object):
         :param lexer_type: The lexer to use when lexing the content.
         :param parser_type: The parser_type to use when parsing the content.
         :param visitor_type: The visitor to use when visiting the parse tree to generate an AST.
+        :param cc_engine: The engine to calculate cyclomatic complexity with, one of CC_ENGINES: "cfg" for McCabe's
+        cyclomatic complexity of the control-flow graph, or "ast" for extended cyclomatic complexity, which also counts
+        catch clauses, switch case labels, short-circuit logical operations and conditional expressions (see
+        ASTCCCalculationVisitor), so is not interchangeable with it.
+        :param simplify_cfg: Whether to remove the pass-through blocks of compact control-flow graphs, which shrinks
+        them without changing their metrics.
         """
+        if cc_engine not in CC_ENGINES:
+            raise ValueError(f"Unknown cyclomatic complexity engine \"{cc_engine}\". Expected one of {CC_ENGINES}.")
+
+        self.cc_engine = cc_engine
+        self.simplify_cfg = simplify_cfg
+
         input_stream = InputStream(content)
         lexer = lexer_type(input_stream)
         tokens = CommonTokenStream(lexer)
@@ -47,6 +75,7 @@ class Calculator(object):
 
         self.__ast = visitor.visit(parse_tree)
         self.models = {}
+        self.memo_tables: Dict[Hashable, MemoTable] = {}
 
     # region ast Property
 
@@ -83,6 +112,39 @@ class Calculator(object):
     def clear(self):
         self.__ast = None
         self.models = {}
+        self.memo_tables = {}
+
+    def memo_table(self, key: Hashable) -> MemoTable:
+        """
+        Get the calculator's memo table for a kind of visit result, creating it if there is none yet. Tables are kept
+        per calculator, so that memoized results are reused across the visits of its AST but never outlive it.
+
+        :param key: The kind of visit result, e.g. the type of the visitor producing it.
+        :return: The memo table.
+        """
+        if key not in self.memo_tables:
+            self.memo_tables[key] = MemoTable()
+
+        return self.memo_tables[key]
+
+    def abstract_class_names(self, ast: Optional[AST] = None) -> Set[str]:
+        """
+        Find the qualified names of the abstract classes and interfaces, as in dependency graphs.
+
+        :param ast: Abstract syntax tree to find abstract classes in.
+        :return: The names of the abstract classes.
+        """
+        symbol_table = self.symbol_table(ast)
+        ast = ast if ast else self.ast
+        if ast is None:
+            return set()
+        names = {name for name, nodes in symbol_table.classes.items()
+                 if any(ASTMiscModifier.ABSTRACT in node.modifiers for node in nodes)}
+        for node in ast.find_all(ASTInterfaceDefinitionNode):
+            if isinstance(node["name"], ASTIdentifierNode):
+                names.add(symbol_table.enclosing_scope(node).qualify(node["name"].name))
+
+        return names
 
     # endregion
 
@@ -103,6 +165,55 @@ class Calculator(object):
 
         return self.models[CFG]
 
+    def compact_control_flow_graph(self, cfg: Optional[CFG] = None) -> CompactCFG:
+        """
+        Generate compact control-flow graph.
+
+        :param cfg: Control-flow graph to generate compact CFG from.
+        :return: The corresponding compact control-flow graph, simplified if simplify_cfg is set.
+        """
+        if cfg:
+            compact = CompactCFG.from_cfg(cfg)
+            return compact.simplified() if self.simplify_cfg else compact
+
+        if CompactCFG not in self.models or not isinstance(self.models[CompactCFG], CompactCFG):
+            compact = CompactCFG.from_cfg(self.control_flow_graph())
+            self.models[CompactCFG] = compact.simplified() if self.simplify_cfg else compact
+
+        return self.models[CompactCFG]
+
+    def symbol_table(self, ast: Optional[AST] = None) -> SymbolTable:
+        """
+        Generate symbol table, shared by the structure generators.
+
+        :param ast: Abstract syntax tree to generate symbol table from.
+        :return: The corresponding symbol table.
+        """
+        if ast:
+            return SymbolTable.build(ast)
+
+        if SymbolTable not in self.models or not isinstance(self.models[SymbolTable], SymbolTable):
+            self.models[SymbolTable] = SymbolTable.build(self.ast)
+
+        return self.models[SymbolTable]
+
+    def function_control_flow_graphs(self, ast: Optional[AST] = None) -> FunctionCFGs:
+        """
+        Generate per-function control-flow graphs. Each function's CFG is only generated once it is looked up.
+
+        :param ast: Abstract syntax tree to generate function CFGs from.
+        :return: The corresponding function control-flow graphs, keyed by qualified name, simplified if simplify_cfg
+        is set.
+        """
+        visitor = FunctionCFGGenerationVisitor(self.simplify_cfg, self.memo_table((FunctionCFGs, self.simplify_cfg)))
+        if ast:
+            return visitor.visit(ast)
+
+        if FunctionCFGs not in self.models or not isinstance(self.models[FunctionCFGs], FunctionCFGs):
+            self.models[FunctionCFGs] = visitor.visit(self.ast)
+
+        return self.models[FunctionCFGs]
+
     def inheritance_tree(self, ast: Optional[AST] = None) -> InheritanceTree:
         """
         Generate inheritance tree.
@@ -114,7 +225,8 @@ class Calculator(object):
             return InheritanceTreeGenerationVisitor().visit(ast)
 
         if InheritanceTree not in self.models or not isinstance(self.models[InheritanceTree], InheritanceTree):
-            self.models[InheritanceTree] = InheritanceTreeGenerationVisitor().visit(self.ast)
+            self.models[InheritanceTree] = InheritanceTreeGenerationVisitor(
+                symbol_table=self.symbol_table()).visit(self.ast)
 
         return self.models[InheritanceTree]
 
@@ -129,10 +241,89 @@ class Calculator(object):
             return DependencyGraphGenerationVisitor().visit(ast)
 
         if DependencyGraph not in self.models or not isinstance(self.models[DependencyGraph], DependencyGraph):
-            self.models[DependencyGraph] = DependencyGraphGenerationVisitor().visit(self.ast)
+            self.models[DependencyGraph] = DependencyGraphGenerationVisitor(
+                symbol_table=self.symbol_table()).visit(self.ast)
 
         return self.models[DependencyGraph]
 
+    def indexed_dependency_graph(self, dg: Optional[DependencyGraph] = None) -> IndexedDependencyGraph:
+        """
+        Generate indexed dependency graph.
+
+        :param dg: Dependency graph to generate indexed dependency graph from.
+        :return: The corresponding indexed dependency graph.
+        """
+        if dg:
+            return IndexedDependencyGraph.from_graph(dg)
+
+        if IndexedDependencyGraph not in self.models or \
+                not isinstance(self.models[IndexedDependencyGraph], IndexedDependencyGraph):
+            self.models[IndexedDependencyGraph] = IndexedDependencyGraph.from_graph(self.dependency_graph())
+
+        return self.models[IndexedDependencyGraph]
+
+    def dependency_matrix(self, dg: Optional[DependencyGraph] = None) -> DependencyMatrix:
+        """
+        Generate sparse dependency matrix.
+
+        :param dg: Dependency graph to generate sparse dependency matrix from.
+        :return: The corresponding sparse dependency matrix.
+        """
+        if dg:
+            return dg.adjacency_matrix()
+
+        if DependencyMatrix not in self.models or not isinstance(self.models[DependencyMatrix], DependencyMatrix):
+            self.models[DependencyMatrix] = DependencyMatrix.from_graph(self.indexed_dependency_graph())
+
+        return self.models[DependencyMatrix]
+
+    def dependency_condensation(self, dg: Optional[DependencyGraph] = None) -> Condensation:
+        """
+        Generate the condensation of the dependency graph, with a component for each group of mutually dependent classes.
+
+        :param dg: Dependency graph to generate the condensation from.
+        :return: The corresponding condensation, over the classes of the indexed dependency graph.
+        """
+        if dg:
+            indexed = self.indexed_dependency_graph(dg)
+            return Condensation.build(indexed.offsets, indexed.targets)
+
+        if Condensation not in self.models or not isinstance(self.models[Condensation], Condensation):
+            indexed = self.indexed_dependency_graph()
+            self.models[Condensation] = Condensation.build(indexed.offsets, indexed.targets)
+
+        return self.models[Condensation]
+
+    def reachability_index(self, dg: Optional[DependencyGraph] = None) -> ReachabilityIndex:
+        """
+        Generate the reachability index of the dependency graph.
+
+        :param dg: Dependency graph to generate the reachability index from.
+        :return: The corresponding reachability index, over the classes of the indexed dependency graph.
+        """
+        if dg:
+            return ReachabilityIndex(self.dependency_condensation(dg))
+
+        if ReachabilityIndex not in self.models or not isinstance(self.models[ReachabilityIndex], ReachabilityIndex):
+            self.models[ReachabilityIndex] = ReachabilityIndex(self.dependency_condensation())
+
+        return self.models[ReachabilityIndex]
+
+    def inheritance_metrics(self, it: Optional[InheritanceTree] = None) -> InheritanceMetrics:
+        """
+        Calculate the inheritance metrics of each class.
+
+        :param it: Inheritance tree to calculate the inheritance metrics from.
+        :return: The corresponding depth of inheritance, number of children and number of descendants of each class.
+        """
+        if it:
+            return InheritanceMetrics.build(it)
+
+        if InheritanceMetrics not in self.models or not isinstance(self.models[InheritanceMetrics], InheritanceMetrics):
+            self.models[InheritanceMetrics] = InheritanceMetrics.build(self.inheritance_tree())
+
+        return self.models[InheritanceMetrics]
+
     def class_diagram(self, ast: Optional[AST] = None) -> ClassDiagram:
         """
         Generate class diagram.
@@ -159,10 +350,11 @@ class Calculator(object):
         :param ast: Abstract syntax tree to calculate logical lines of code from.
         :return: The corresponding logical lines of code.
         """
+        visitor = LLOCCalculationVisitor(self.memo_table(LLOCCalculationVisitor))
         if ast:
-            return LLOCCalculationVisitor().visit(ast)
+            return visitor.visit(ast)
 
-        return LLOCCalculationVisitor().visit(self.ast)
+        return visitor.visit(self.ast)
 
     def afferent_coupling(self, dg: Optional[DependencyGraph] = None) -> dict:
         """
@@ -170,10 +362,9 @@ class Calculator(object):
         :param dg: Dependency graph to calculate afferent coupling of code from.
         :return: The corresponding afferent coupling of code.
         """
-        if dg:
-            return ACCalculationVisitor().visit(dg)
+        afferent, _ = couplings(self.indexed_dependency_graph(dg))
 
-        return ACCalculationVisitor().visit(self.models[DependencyGraph])
+        return afferent
 
     def efferent_coupling(self, dg: Optional[DependencyGraph] = None) -> dict:
         """
@@ -182,10 +373,82 @@ class Calculator(object):
         :param dg: Dependency graph to calculate efferent coupling of code from.
         :return: The corresponding efferent coupling of code.
         """
-        if dg:
-            return ECCalculationVisitor().visit(dg)
+        _, efferent = couplings(self.indexed_dependency_graph(dg))
+
+        return efferent
+
+    def dependency_cycles(self, dg: Optional[DependencyGraph] = None) -> List[List[DGClass]]:
+        """
+        Find the dependency cycles within code.
+
+        :param dg: Dependency graph to find dependency cycles in.
+        :return: The classes of each group of mutually dependent classes (or of each class that depends on itself).
+        """
+        indexed = self.indexed_dependency_graph(dg)
+
+        return [[indexed.classes[cls] for cls in cycle] for cycle in self.dependency_condensation(dg).cycles()]
+
+    def dependency_layers(self, dg: Optional[DependencyGraph] = None) -> Dict[DGClass, int]:
+        """
+        Calculate the dependency layer of each class within code: 0 for classes without dependencies, and otherwise one
+        more than the highest layer of the classes it depends on, with mutually dependent classes sharing a layer.
+
+        :param dg: Dependency graph to calculate dependency layers from.
+        :return: The corresponding dependency layer of each class.
+        """
+        indexed = self.indexed_dependency_graph(dg)
+        condensation = self.dependency_condensation(dg)
+        layers = condensation.layers()
+
+        return {cls: layers[component] for cls, component in zip(indexed.classes, condensation.component)}
+
+    def transitive_dependencies(self, name: str, dg: Optional[DependencyGraph] = None) -> List[DGClass]:
+        """
+        Find the classes that a class depends on, directly or through other classes.
+
+        :param name: The name of the class. Every class with the name is looked up.
+        :param dg: Dependency graph to look the class up in.
+        :return: The class' transitive dependencies, in the order of the indexed dependency graph.
+        """
+        indexed = self.indexed_dependency_graph(dg)
+        index = self.reachability_index(dg)
+        found = set()
+        for number, cls in enumerate(indexed.classes):
+            if cls.name == name:
+                found.update(index.reachable_from(number))
+
+        return [indexed.classes[number] for number in sorted(found)]
+
+    def transitive_dependents(self, name: str, dg: Optional[DependencyGraph] = None) -> List[DGClass]:
+        """
+        Find the classes that depend on a class, directly or through other classes, i.e. the classes a change to the
+        class can affect.
+
+        :param name: The name of the class. Every class with the name is looked up.
+        :param dg: Dependency graph to look the class up in.
+        :return: The class' transitive dependents, in the order of the indexed dependency graph.
+        """
+        indexed = self.indexed_dependency_graph(dg)
+        index = self.reachability_index(dg)
+        found = set()
+        for number, cls in enumerate(indexed.classes):
+            if cls.name == name:
+                found.update(index.reaching(number))
 
-        return ECCalculationVisitor().visit(self.models[DependencyGraph])
+        return [indexed.classes[number] for number in sorted(found)]
+
+    def main_sequence_metrics(self, matrix: Optional[DependencyMatrix] = None) -> Dict[str, np.ndarray]:
+        """
+        Calculate the instability, abstractness and distance from the main sequence of each class within code, along
+        with its afferent and efferent coupling.
+
+        :param matrix: Sparse dependency matrix to calculate the metrics from.
+        :return: Mapping of each metric to its value for each class, in the order of the matrix' classes.
+        """
+        matrix = matrix if matrix is not None else self.dependency_matrix()
+        abstract_names = self.abstract_class_names()
+
+        return main_sequence_metrics(matrix, [cls.name in abstract_names for cls in matrix.classes])
 
     def cyclomatic_complexity(self, cfg: Optional[CFG] = None) -> int:
         """
@@ -197,7 +460,25 @@ class Calculator(object):
         if cfg:
             return CCCalculationVisitor().visit(cfg)
 
-        return CCCalculationVisitor().visit(self.models[CFG])
+        if self.cc_engine == "ast":
+            return ASTCCCalculationVisitor().visit(self.ast)
+
+        return CCCalculationVisitor().visit(self.compact_control_flow_graph())
+
+    def function_cyclomatic_complexity(self, cfgs: Optional[FunctionCFGs] = None) -> Dict[str, int]:
+        """
+        Calculate the cyclomatic complexity of each function within code.
+
+        :param cfgs: Function control-flow graphs to calculate cyclomatic complexity of functions from.
+        :return: The corresponding cyclomatic complexity of each function, keyed by qualified name.
+        """
+        if cfgs is None:
+            cfgs = self.function_control_flow_graphs()
+
+            if self.cc_engine == "ast":
+                return ASTCCCalculationVisitor().visit_functions(self.ast, cfgs.functions)
+
+        return {name: CCCalculationVisitor().visit(cfg) for name, cfg in cfgs.generate_all().items()}
 
     def maximum_inheritance_depth(self, it: Optional[InheritanceTree] = None) -> int:
         """
@@ -205,10 +486,36 @@ class Calculator(object):
         :param it: Inheritance tree to calculate inheritance depth of code from.
         :return: The corresponding inheritance depth of code.
         """
-        if it:
-            return MIDCalculationVisitor().visit(it)
+        return self.inheritance_metrics(it).maximum_depth
 
-        return MIDCalculationVisitor().visit(self.models[InheritanceTree])
+    def depth_of_inheritance(self, it: Optional[InheritanceTree] = None) -> Dict[ITKnownClass, int]:
+        """
+        Calculate the depth of inheritance of each class within code, i.e. the length of the longest path to it from
+        the base class.
+
+        :param it: Inheritance tree to calculate depth of inheritance from.
+        :return: The corresponding depth of inheritance of each class.
+        """
+        return self.inheritance_metrics(it).depth_of_inheritance()
+
+    def number_of_children(self, it: Optional[InheritanceTree] = None) -> Dict[ITKnownClass, int]:
+        """
+        Calculate the number of children of each class within code, i.e. the number of classes directly inheriting it.
+
+        :param it: Inheritance tree to calculate number of children from.
+        :return: The corresponding number of children of each class.
+        """
+        return self.inheritance_metrics(it).number_of_children()
+
+    def number_of_descendants(self, it: Optional[InheritanceTree] = None) -> Dict[ITKnownClass, int]:
+        """
+        Calculate the number of descendants of each class within code, i.e. the number of classes inheriting it,
+        directly or indirectly.
+
+        :param it: Inheritance tree to calculate number of descendants from.
+        :return: The corresponding number of descendants of each class.
+        """
+        return self.inheritance_metrics(it).number_of_descendants()
 
     def maximum_nesting_depth(self, cfg: Optional[CFG] = None) -> int:
         """
@@ -219,6 +526,18 @@ class Calculator(object):
         if cfg:
             return MNDCalculationVisitor().visit(cfg)
 
-        return MNDCalculationVisitor().visit(self.models[CFG])
+        return MNDCalculationVisitor().visit(self.compact_control_flow_graph())
+
+    def function_maximum_nesting_depth(self, cfgs: Optional[FunctionCFGs] = None) -> Dict[str, int]:
+        """
+        Calculate the maximum nesting depth of each function within code.
+
+        :param cfgs: Function control-flow graphs to calculate maximum nesting depth of functions from.
+        :return: The corresponding maximum nesting depth of each function, keyed by qualified name.
+        """
+        if cfgs is None:
+            cfgs = self.function_control_flow_graphs()
+
+        return {name: MNDCalculationVisitor().visit(cfg) for name, cfg in cfgs.generate_all().items()}
 
     # endregion
@@ -0,0 +1,82 @@
+from typing import Any, Dict, Hashable, List
+
+
+def compact_graph(nodes: List[Dict[str, Any]], links: List[Dict[str, Any]], id_key: str = "id") -> Dict[str, Any]:
+    """
+    Compact a formatted graph, i.e. its lists of node dicts and link dicts, into columns.
+
+    Each node id is stored once, in the names table, and everywhere else is referred to by its position in the table,
+    so links become parallel arrays of integers rather than dicts repeating both of their ends' ids. The compact graph
+    is a dict of:
+
+    - "names": the distinct node ids, in the order of the nodes, followed by the ids that only links refer to;
+    - "nodeCount": the number of distinct nodes, i.e. the names that are nodes;
+    - "nodes": each other node attribute, as an array parallel to the first nodeCount names;
+    - "links": "source" and "target" arrays of positions in the names table, and each other link attribute, as
+      parallel arrays.
+
+    Attributes missing from some nodes or links are None in their arrays, and the attributes of a node whose id was
+    already seen are dropped.
+
+    :param nodes: The formatted nodes, each a dict with its id under id_key.
+    :param links: The formatted links, each a dict with "source" and "target" node ids.
+    :param id_key: The key of each node's id.
+    :return: The compact graph.
+    """
+    names: List[Hashable] = []
+    positions: Dict[Hashable, int] = {}
+    node_columns: Dict[str, List[Any]] = {}
+
+    for node in nodes:
+        name = node[id_key]
+        if name in positions:
+            continue
+
+        position = positions[name] = len(names)
+        names.append(name)
+        for key, value in node.items():
+            if key != id_key:
+                _column(node_columns, key, position).append(value)
+
+    node_count = len(names)
+
+    def position_of(link_name: Hashable) -> int:
+        link_position = positions.get(link_name)
+        if link_position is None:
+            link_position = positions[link_name] = len(names)
+            names.append(link_name)
+
+        return link_position
+
+    link_columns: Dict[str, List[Any]] = {"source": [], "target": []}
+    for position, link in enumerate(links):
+        for key, value in link.items():
+            if key == "source" or key == "target":
+                value = position_of(value)
+
+            _column(link_columns, key, position).append(value)
+
+    for columns, length in ((node_columns, node_count), (link_columns, len(links))):
+        for column in columns.values():
+            column.extend([None] * (length - len(column)))
+
+    return {
+        "names": names,
+        "nodeCount": node_count,
+        "nodes": node_columns,
+        "links": link_columns
+    }
+
+
+def _column(columns: Dict[str, List[Any]], key: str, position: int) -> List[Any]:
+    """
+    Get the column of an attribute, padded with None up to a position.
+
+    :param columns: The columns, by attribute.
+    :param key: The attribute.
+    :param position: The position the next value of the column is at.
+    :return: The column, holding position values.
+    """
+    column = columns.setdefault(key, [])
+    column.extend([None] * (position - len(column)))
+    return column
@@ -1,4 +1,8 @@
+from typing import Any, Iterator, List, Optional, Tuple
+
 from metrics.calculator import Calculator
+from metrics.compact_graph import compact_graph
+from metrics.json_stream import JSONObject
 from metrics.visitors.formatting.ast_formatting_visitor import ASTFormattingVisitor
 from metrics.visitors.formatting.cfg_formatting_visitor import CFGFormattingVisitor
 from metrics.visitors.formatting.inheritance_tree_formatting_visitor import InheritanceTreeFormattingVisitor
@@ -11,8 +15,21 @@ class Formatter(object):
     Class for formatting metrics & models for front-end use.
     """
 
-    def __init__(self, calculator: Calculator, file_name: str):
+    def __init__(self, calculator: Calculator, file_name: str, ast_depth: Optional[int] = None,
+                 compact_graphs: bool = False):
+        """
+        Metric/model formatter.
+
+        :param calculator: The calculator of the metrics & models to format.
+        :param file_name: The name of the file the metrics & models are of.
+        :param ast_depth: The depth down to which to format the AST, with the nodes at that depth marked as truncated
+        and identified so that their subtrees can be requested later. None formats the whole AST.
+        :param compact_graphs: Whether to format the graph structures in compact form (see compact_graph), with block
+        ids of control-flow graphs as ints.
+        """
         self.calculator = calculator
+        self.ast_depth = ast_depth
+        self.compact_graphs = compact_graphs
         self.metric_info = {
             "fileName": file_name,
             "structures": {},
@@ -24,32 +41,74 @@ class Formatter(object):
         self.generate_metrics()
         return self.metric_info
 
+    def stream(self) -> JSONObject:
+        """
+        Get the metric info as a lazily produced JSON object, for encoding with the incremental JSON encoder. Each
+        structure and group of metrics is only formatted once the encoder reaches it, so it can be encoded and released
+        before the next one is formatted, rather than the whole metric info being held at once.
+
+        :return: The lazily produced metric info.
+        """
+        return JSONObject([
+            ("fileName", self.metric_info["fileName"]),
+            ("structures", JSONObject(self.iter_structures())),
+            ("metrics", JSONObject(self.iter_metrics()))
+        ])
+
     def generate_structures(self):
-        self.generate_inheritance_tree()
-        self.generate_dependency_graph()
-        self.generate_ast()
-        self.generate_control_flow_graph()
-        self.generate_class_diagram()
+        self.metric_info["structures"].update(self.iter_structures())
 
     def generate_metrics(self):
-        self.metric_info["metrics"]["logicalLinesOfCode"] = self.calculator.logical_lines_of_code()
-        self.metric_info["metrics"]["cyclomaticComplexity"] = self.calculator.cyclomatic_complexity()
-        self.metric_info["metrics"]["maximumInheritanceDepth"] = self.calculator.maximum_inheritance_depth()
-        self.metric_info["metrics"]["maximumNestingDepth"] = self.calculator.maximum_nesting_depth()
+        self.metric_info["metrics"].update(self.iter_metrics())
+
+    def iter_structures(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Format the structures one at a time.
+
+        :return: Iterator over the name and formatted value of each structure, in order.
+        """
+        yield "inheritanceTree", self.format_inheritance_tree()
+        yield "dependencyGraph", self.format_dependency_graph()
+        yield "abstractSyntaxTree", self.format_ast()
+        yield "controlFlowGraph", self.format_control_flow_graph()
+        yield "classDiagram", self.format_class_diagram()
+
+    def iter_metrics(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Calculate and format the metrics one group at a time.
+
+        :return: Iterator over the name and formatted value of each metric, in order.
+        """
+        yield "logicalLinesOfCode", self.calculator.logical_lines_of_code()
+        yield "cyclomaticComplexity", self.calculator.cyclomatic_complexity()
+        yield "maximumInheritanceDepth", self.calculator.maximum_inheritance_depth()
+        yield "maximumNestingDepth", self.calculator.maximum_nesting_depth()
 
         ac = self.calculator.afferent_coupling()
         ec = self.calculator.efferent_coupling()
-        self.metric_info["metrics"]["afferentCoupling"] = [{"name": node.name, "value": ac[node]} for node in ac]
-        self.metric_info["metrics"]["efferentCoupling"] = [{"name": node.name, "value": ec[node]} for node in ec]
+        yield "afferentCoupling", [{"name": node.name, "value": ac[node]} for node in ac]
+        yield "efferentCoupling", [{"name": node.name, "value": ec[node]} for node in ec]
+        yield "dependencyCycles", [[node.name for node in cycle] for cycle in self.calculator.dependency_cycles()]
+
+        dit = self.calculator.depth_of_inheritance()
+        noc = self.calculator.number_of_children()
+        nod = self.calculator.number_of_descendants()
+        yield "inheritance", [
+            {"name": node.name, "depthOfInheritance": dit[node], "numberOfChildren": noc[node],
+             "numberOfDescendants": nod[node]} for node in dit
+        ]
 
     def generate_inheritance_tree(self):
+        self.metric_info["structures"]["inheritanceTree"] = self.format_inheritance_tree()
+
+    def format_inheritance_tree(self) -> dict:
         nodes, links = InheritanceTreeFormattingVisitor().visit(self.calculator.inheritance_tree())
-        self.metric_info["structures"]["inheritanceTree"] = {
-            "nodes": nodes,
-            "links": links
-        }
+        return self.format_graph(nodes, links)
 
     def generate_dependency_graph(self):
+        self.metric_info["structures"]["dependencyGraph"] = self.format_dependency_graph()
+
+    def format_dependency_graph(self) -> dict:
         dependency_graph_graph_data = {
             "nodes": [],
             "links": [],
@@ -61,19 +120,59 @@ class Formatter(object):
                 for dependency in node.dependencies:
                     dependency_graph_graph_data["links"].append({"source": node.name, "target": dependency.name})
 
-        self.metric_info["structures"]["dependencyGraph"] = dependency_graph_graph_data
+        return self.format_graph(dependency_graph_graph_data["nodes"], dependency_graph_graph_data["links"])
 
     def generate_control_flow_graph(self):
-        nodes, links = CFGFormattingVisitor().visit(self.calculator.control_flow_graph())
-        self.metric_info["structures"]["controlFlowGraph"] = {
-            "nodes": nodes,
-            "links": links
-        }
+        self.metric_info["structures"]["controlFlowGraph"] = self.format_control_flow_graph()
+
+    def format_control_flow_graph(self) -> dict:
+        nodes, links = CFGFormattingVisitor(not self.compact_graphs).visit(self.calculator.compact_control_flow_graph())
+        return self.format_graph(nodes, links)
+
+    def format_functions(self) -> List[dict]:
+        """
+        Calculate and format the metrics of each function. Every function's CFG is generated for them, so they are only
+        formatted on request, rather than as part of the metric info.
+
+        :return: The name, cyclomatic complexity and maximum nesting depth of each function, in definition order.
+        """
+        cc = self.calculator.function_cyclomatic_complexity()
+        mnd = self.calculator.function_maximum_nesting_depth()
+        return [{"name": name, "cyclomaticComplexity": cc[name], "maximumNestingDepth": mnd[name]} for name in cc]
+
+    def generate_function_control_flow_graph(self, name: str) -> dict:
+        nodes, links = CFGFormattingVisitor(not self.compact_graphs).visit(
+            self.calculator.function_control_flow_graphs()[name])
+        return self.format_graph(nodes, links)
 
     def generate_ast(self):
-        self.metric_info["structures"]["abstractSyntaxTree"] = ASTFormattingVisitor().visit(self.calculator.ast)
+        self.metric_info["structures"]["abstractSyntaxTree"] = self.format_ast()
+
+    def format_ast(self, node_id: Optional[int] = None, depth: Optional[int] = None) -> dict:
+        """
+        Format the AST, or the subtree of one of its nodes, down to a maximum depth.
+
+        :param node_id: The id of the root of the subtree to format, as given to truncated nodes. Defaults to the AST's
+        root.
+        :param depth: The depth down to which to format the subtree. Defaults to the formatter's AST depth.
+        :return: The formatted AST or subtree.
+        """
+        ast = self.calculator.ast
+        depth = self.ast_depth if depth is None else depth
+        visitor = ASTFormattingVisitor(self.calculator.memo_table(ASTFormattingVisitor))
+        if node_id is None and depth is None:
+            return visitor.visit(ast)
+
+        node = ast.node(node_id) if node_id is not None else None
+        if depth is None:
+            return visitor.dispatch(node)
+
+        return visitor.visit_to_depth(ast, depth, node)
 
     def generate_class_diagram(self):
+        self.metric_info["structures"]["classDiagram"] = self.format_class_diagram()
+
+    def format_class_diagram(self) -> dict:
         formatted_class_diagram = {
             "nodes": [],
             "links": []
@@ -103,4 +202,20 @@ class Formatter(object):
                 formatted_class_diagram["links"].append({"source": cls.name, "target": relationship.relation.name,
                                                          "label": relationship.type.value, "value": 1})
 
-        self.metric_info["structures"]["classDiagram"] = formatted_class_diagram
+        return self.format_graph(formatted_class_diagram["nodes"], formatted_class_diagram["links"])
+
+    def format_graph(self, nodes: List[dict], links: List[dict]) -> dict:
+        """
+        Format a graph structure from its formatted nodes and links, in compact form if the formatter compacts graphs.
+
+        :param nodes: The formatted nodes.
+        :param links: The formatted links.
+        :return: The formatted graph.
+        """
+        if self.compact_graphs:
+            return compact_graph(nodes, links)
+
+        return {
+            "nodes": nodes,
+            "links": links
+        }
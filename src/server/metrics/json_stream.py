@@ -0,0 +1,161 @@
+import json
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+# The size that encoded chunks are gathered up to before being handed on, in characters.
+CHUNK_SIZE = 64 * 1024
+
+# The separators that json.dumps uses by default, between items and between keys and values.
+SEPARATORS = (", ", ": ")
+
+_END = object()
+
+
+class JSONObject(object):
+    """
+    JSON object whose members are produced lazily, e.g. by a generator, and encoded as they are produced.
+    """
+
+    def __init__(self, members: Iterable[Tuple[str, Any]], length: Optional[int] = None):
+        """
+        JSON object whose members are produced lazily.
+
+        :param members: The (key, value) pair of each member, in order.
+        :param length: The number of members, if known in advance, for encodings that need it before the members.
+        """
+        self.members = members
+        self.length = length
+
+    def __repr__(self):
+        return f"JSONObject(members={self.members!r}, length={self.length})"
+
+
+class JSONArray(object):
+    """
+    JSON array whose items are produced lazily, e.g. by a generator, and encoded as they are produced.
+    """
+
+    def __init__(self, items: Iterable[Any], length: Optional[int] = None):
+        """
+        JSON array whose items are produced lazily.
+
+        :param items: The items, in order.
+        :param length: The number of items, if known in advance, for encodings that need it before the items.
+        """
+        self.items = items
+        self.length = length
+
+    def __repr__(self):
+        return f"JSONArray(items={self.items!r}, length={self.length})"
+
+
+def iterencode(value: Any, encoder: Optional[json.JSONEncoder] = None, dumps: Optional[Callable[[Any], str]] = None,
+               separators: Tuple[str, str] = SEPARATORS) -> Iterator[str]:
+    """
+    Encode a value as JSON incrementally, producing the encoding piece by piece as the value is walked.
+
+    Dicts, lists and tuples are encoded like json.dumps would, and lazily produced objects and arrays are only consumed
+    as far as the encoding has got, so each of their members can be produced, encoded and released before the next one.
+    The value is walked with an explicit stack, so it is not bounded by the recursion limit.
+
+    :param value: The value to encode.
+    :param encoder: The encoder for scalars and values of other types. Defaults to json.JSONEncoder().
+    :param dumps: Function encoding a whole dict, list or tuple at once, e.g. with a faster encoder than json's. Values
+    that it fails to encode (raising TypeError, ValueError or RecursionError) are walked instead.
+    :param separators: The separators between items, and between keys and values.
+    :return: Iterator over the pieces of the encoding, in order.
+    """
+    encode = (encoder if encoder is not None else json.JSONEncoder()).encode
+    item_separator, key_separator = separators
+
+    # Frames are [iterator over the members or items, whether it is an object, whether nothing has been encoded yet].
+    stack: List[list] = []
+    while True:
+        encoded = None
+        if dumps is not None and isinstance(value, (dict, list, tuple)):
+            try:
+                encoded = dumps(value)
+            except (TypeError, ValueError, RecursionError):
+                pass
+
+        if encoded is not None:
+            yield encoded
+        elif isinstance(value, dict):
+            yield "{"
+            stack.append([iter(value.items()), True, True])
+        elif isinstance(value, JSONObject):
+            yield "{"
+            stack.append([iter(value.members), True, True])
+        elif isinstance(value, (list, tuple)):
+            yield "["
+            stack.append([iter(value), False, True])
+        elif isinstance(value, JSONArray):
+            yield "["
+            stack.append([iter(value.items), False, True])
+        else:
+            yield encode(value)
+
+        # Move on to the next value to encode, closing every object and array that has run out on the way.
+        while stack:
+            frame = stack[-1]
+            item = next(frame[0], _END)
+            if item is _END:
+                stack.pop()
+                yield "}" if frame[1] else "]"
+                continue
+
+            separator = "" if frame[2] else item_separator
+            frame[2] = False
+            if frame[1]:
+                key, value = item
+                yield f"{separator}{_encode_key(key)}{key_separator}"
+            else:
+                value = item
+                if separator:
+                    yield separator
+            break
+        else:
+            return
+
+
+def iterencode_chunks(value: Any, encoder: Optional[json.JSONEncoder] = None,
+                      dumps: Optional[Callable[[Any], str]] = None, separators: Tuple[str, str] = SEPARATORS,
+                      chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Encode a value as JSON incrementally, gathering the pieces of the encoding into chunks of bytes, e.g. to stream
+    as a response body.
+
+    :param value: The value to encode.
+    :param encoder: The encoder for scalars and values of other types. Defaults to json.JSONEncoder().
+    :param dumps: Function encoding a whole dict, list or tuple at once, e.g. with a faster encoder than json's.
+    :param separators: The separators between items, and between keys and values.
+    :param chunk_size: The size that pieces are gathered up to before a chunk is produced, in characters.
+    :return: Iterator over the chunks of the UTF-8 encoding, in order.
+    """
+    pieces = []
+    size = 0
+    for piece in iterencode(value, encoder, dumps, separators):
+        pieces.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield "".join(pieces).encode("utf-8")
+            pieces = []
+            size = 0
+
+    if pieces:
+        yield "".join(pieces).encode("utf-8")
+
+
+def _encode_key(key: Any) -> str:
+    """
+    Encode an object key as JSON, converting keys that are not strings like json.dumps would.
+
+    :param key: The key.
+    :return: The encoded key.
+    """
+    if isinstance(key, str):
+        return json.dumps(key)
+
+    if key is None or isinstance(key, (bool, int, float)):
+        return json.dumps(json.dumps(key))
+
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
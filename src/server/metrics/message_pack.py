@@ -0,0 +1,362 @@
+"""
+MessagePack encoding.
+
+A compact binary encoding of JSON-like values (see https://msgpack.org), implemented in-tree, with an optional string
+table: with it, each string long enough to be worth it is only encoded in full the first time it appears, and
+afterwards as a reference to that first appearance, held in an extension type. Structure payloads repeat the same keys
+and node names many times over, so the string table shrinks them considerably. Decoders that do not know the extension
+type still decode the rest of the value, with the references left as extension values.
+"""
+from collections.abc import Sized
+from itertools import chain
+from struct import Struct, error as StructError
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from metrics.json_stream import CHUNK_SIZE, JSONArray, JSONObject
+
+# The extension type of a reference to an earlier string, whose data is the string's number in the table.
+STRING_REFERENCE = 1
+
+# The shortest string, in bytes, that is added to the string table. Shorter strings are smaller than their references.
+STRING_TABLE_MINIMUM = 3
+
+_END = object()
+
+_UINT8, _UINT16, _UINT32, _UINT64 = Struct(">B"), Struct(">H"), Struct(">I"), Struct(">Q")
+_INT8, _INT16, _INT32, _INT64 = Struct(">b"), Struct(">h"), Struct(">i"), Struct(">q")
+_FLOAT32, _FLOAT64 = Struct(">f"), Struct(">d")
+
+
+class MessagePackError(ValueError):
+    """
+    Error raised when data is not valid MessagePack.
+    """
+    pass
+
+
+def iterpack(value: Any, string_table: bool = False, default: Optional[Callable[[Any], Any]] = None,
+             chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Encode a value as MessagePack incrementally, in chunks of bytes.
+
+    Values are walked with an explicit stack, so they are not bounded by the recursion limit. Lazily produced objects
+    and arrays are encoded as maps and arrays, which need their length up front: unless it was given when they were
+    created, their members or items are all produced before they are encoded.
+
+    :param value: The value to encode.
+    :param string_table: Whether to encode repeated strings as references to their first appearance.
+    :param default: Function converting values of other types into values that can be encoded. Values of other types
+    raise TypeError without it.
+    :param chunk_size: The size that the encoding is gathered up to before a chunk is produced, in bytes.
+    :return: Iterator over the chunks of the encoding, in order.
+    """
+    buffer = bytearray()
+    strings: Optional[Dict[str, int]] = {} if string_table else None
+    stack = [iter((value,))]
+    while stack:
+        value = next(stack[-1], _END)
+        if value is _END:
+            stack.pop()
+            continue
+
+        if isinstance(value, str):
+            _pack_string(buffer, value, strings)
+        elif value is None:
+            buffer.append(0xc0)
+        elif value is True:
+            buffer.append(0xc3)
+        elif value is False:
+            buffer.append(0xc2)
+        elif isinstance(value, int):
+            _pack_integer(buffer, value)
+        elif isinstance(value, float):
+            buffer.append(0xcb)
+            buffer += _FLOAT64.pack(value)
+        elif isinstance(value, dict):
+            _pack_header(buffer, len(value), 0x80, 0xde, 0xdf)
+            stack.append(chain.from_iterable(value.items()))
+        elif isinstance(value, (list, tuple)):
+            _pack_header(buffer, len(value), 0x90, 0xdc, 0xdd)
+            stack.append(iter(value))
+        elif isinstance(value, JSONObject):
+            members = value.members if value.length is not None or isinstance(value.members, Sized) \
+                else list(value.members)
+            _pack_header(buffer, value.length if value.length is not None else len(members), 0x80, 0xde, 0xdf)
+            stack.append(chain.from_iterable(members))
+        elif isinstance(value, JSONArray):
+            items = value.items if value.length is not None or isinstance(value.items, Sized) else list(value.items)
+            _pack_header(buffer, value.length if value.length is not None else len(items), 0x90, 0xdc, 0xdd)
+            stack.append(iter(items))
+        elif isinstance(value, (bytes, bytearray)):
+            _pack_header(buffer, len(value), None, 0xc4, 0xc5, 0xc6)
+            buffer += value
+        elif default is not None:
+            stack.append(iter((default(value),)))
+        else:
+            raise TypeError(f"Object of type {type(value).__name__} is not MessagePack serializable")
+
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+
+    if buffer:
+        yield bytes(buffer)
+
+
+def packb(value: Any, string_table: bool = False, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Encode a value as MessagePack.
+
+    :param value: The value to encode.
+    :param string_table: Whether to encode repeated strings as references to their first appearance.
+    :param default: Function converting values of other types into values that can be encoded.
+    :return: The encoding.
+    """
+    return b"".join(iterpack(value, string_table, default))
+
+
+def unpackb(data: bytes) -> Any:
+    """
+    Decode a MessagePack value, resolving string table references.
+
+    Maps are decoded as dicts, arrays as lists, and binary data as bytes. Extension values other than string references
+    are decoded as (type, data) tuples.
+
+    :param data: The encoding.
+    :return: The decoded value.
+    :raises MessagePackError: If the data is not a single valid MessagePack value.
+    """
+    view = memoryview(data)
+    position = 0
+    strings: List[str] = []
+
+    # Frames are [container, number of values still to decode, key waiting for its value (maps only)].
+    stack: List[list] = []
+    result = _END
+    try:
+        while True:
+            byte = view[position]
+            position += 1
+
+            container = None
+            length = 0
+            if byte <= 0x7f:
+                value = byte
+            elif byte >= 0xe0:
+                value = byte - 0x100
+            elif 0xa0 <= byte <= 0xbf:
+                value, position = _unpack_string(view, position, byte & 0x1f, strings)
+            elif 0x90 <= byte <= 0x9f:
+                container, length = [], byte & 0x0f
+            elif 0x80 <= byte <= 0x8f:
+                container, length = {}, (byte & 0x0f) * 2
+            elif byte == 0xc0:
+                value = None
+            elif byte == 0xc2:
+                value = False
+            elif byte == 0xc3:
+                value = True
+            elif byte in _UNSIGNED:
+                struct = _UNSIGNED[byte]
+                value = struct.unpack_from(view, position)[0]
+                position += struct.size
+            elif byte in _SIGNED:
+                struct = _SIGNED[byte]
+                value = struct.unpack_from(view, position)[0]
+                position += struct.size
+            elif byte in _FLOATS:
+                struct = _FLOATS[byte]
+                value = struct.unpack_from(view, position)[0]
+                position += struct.size
+            elif byte in _STRINGS:
+                struct = _STRINGS[byte]
+                size = struct.unpack_from(view, position)[0]
+                value, position = _unpack_string(view, position + struct.size, size, strings)
+            elif byte in _BINARIES:
+                struct = _BINARIES[byte]
+                size = struct.unpack_from(view, position)[0]
+                position += struct.size
+                value = bytes(view[position:position + size])
+                position += size
+            elif byte in _ARRAYS:
+                struct = _ARRAYS[byte]
+                container, length = [], struct.unpack_from(view, position)[0]
+                position += struct.size
+            elif byte in _MAPS:
+                struct = _MAPS[byte]
+                container, length = {}, struct.unpack_from(view, position)[0] * 2
+                position += struct.size
+            elif byte in _EXTENSIONS:
+                struct = _EXTENSIONS[byte]
+                if isinstance(struct, int):
+                    size = struct
+                else:
+                    size = struct.unpack_from(view, position)[0]
+                    position += struct.size
+                type_ = _INT8.unpack_from(view, position)[0]
+                extension = bytes(view[position + 1:position + 1 + size])
+                position += 1 + size
+                if len(extension) != size:
+                    raise MessagePackError("Truncated extension value.")
+                value = strings[int.from_bytes(extension, "big")] if type_ == STRING_REFERENCE else (type_, extension)
+            else:
+                raise MessagePackError(f"Invalid type byte 0x{byte:02x} at position {position - 1}.")
+
+            if container is not None:
+                if length:
+                    stack.append([container, length, _END])
+                    continue
+                value = container
+
+            # Add the value to the containers it completes, innermost first.
+            while stack:
+                frame = stack[-1]
+                if isinstance(frame[0], list):
+                    frame[0].append(value)
+                elif frame[2] is _END:
+                    frame[2] = value
+                else:
+                    frame[0][frame[2]] = value
+                    frame[2] = _END
+
+                frame[1] -= 1
+                if frame[1]:
+                    break
+
+                stack.pop()
+                value = frame[0]
+            else:
+                result = value
+                break
+    except (IndexError, KeyError, TypeError, StructError, UnicodeDecodeError) as e:
+        raise MessagePackError(f"Invalid MessagePack data: {e}") from e
+
+    if position != len(view):
+        raise MessagePackError(f"Extra data after the value, at position {position}.")
+
+    return result
+
+
+def _pack_header(buffer: bytearray, length: int, fix: Optional[int], *types: int) -> None:
+    """
+    Encode the header of a string, binary data, array or map: its type and length.
+
+    :param buffer: The buffer to encode into.
+    :param length: The length.
+    :param fix: The type byte of the fixed-length form, or None if there is none.
+    :param types: The type bytes of the 8-bit (strings and binary data only), 16-bit and 32-bit length forms.
+    """
+    if fix is not None and length < (32 if fix == 0xa0 else 16):
+        buffer.append(fix | length)
+    elif len(types) == 3 and length <= 0xff:
+        buffer.append(types[0])
+        buffer += _UINT8.pack(length)
+    elif length <= 0xffff:
+        buffer.append(types[-2])
+        buffer += _UINT16.pack(length)
+    elif length <= 0xffffffff:
+        buffer.append(types[-1])
+        buffer += _UINT32.pack(length)
+    else:
+        raise ValueError(f"Length {length} is too large for MessagePack.")
+
+
+def _pack_integer(buffer: bytearray, value: int) -> None:
+    """
+    Encode an integer in its most compact form.
+
+    :param buffer: The buffer to encode into.
+    :param value: The integer.
+    """
+    if 0 <= value <= 0x7f or -32 <= value < 0:
+        buffer.append(value & 0xff)
+    elif value >= 0:
+        if value <= 0xff:
+            buffer.append(0xcc)
+            buffer += _UINT8.pack(value)
+        elif value <= 0xffff:
+            buffer.append(0xcd)
+            buffer += _UINT16.pack(value)
+        elif value <= 0xffffffff:
+            buffer.append(0xce)
+            buffer += _UINT32.pack(value)
+        elif value <= 0xffffffffffffffff:
+            buffer.append(0xcf)
+            buffer += _UINT64.pack(value)
+        else:
+            raise OverflowError(f"Integer {value} is too large for MessagePack.")
+    elif value >= -0x80:
+        buffer.append(0xd0)
+        buffer += _INT8.pack(value)
+    elif value >= -0x8000:
+        buffer.append(0xd1)
+        buffer += _INT16.pack(value)
+    elif value >= -0x80000000:
+        buffer.append(0xd2)
+        buffer += _INT32.pack(value)
+    elif value >= -0x8000000000000000:
+        buffer.append(0xd3)
+        buffer += _INT64.pack(value)
+    else:
+        raise OverflowError(f"Integer {value} is too small for MessagePack.")
+
+
+def _pack_string(buffer: bytearray, value: str, strings: Optional[Dict[str, int]]) -> None:
+    """
+    Encode a string, or a reference to its first appearance if it is in the string table.
+
+    :param buffer: The buffer to encode into.
+    :param value: The string.
+    :param strings: The number of each string in the string table, or None if there is no string table.
+    """
+    if strings is not None:
+        number = strings.get(value)
+        if number is not None:
+            if number <= 0xff:
+                buffer += b"\xd4\x01"
+                buffer += _UINT8.pack(number)
+            elif number <= 0xffff:
+                buffer += b"\xd5\x01"
+                buffer += _UINT16.pack(number)
+            else:
+                buffer += b"\xd6\x01"
+                buffer += _UINT32.pack(number)
+            return
+
+    encoded = value.encode("utf-8")
+    if strings is not None and len(encoded) >= STRING_TABLE_MINIMUM:
+        strings[value] = len(strings)
+
+    _pack_header(buffer, len(encoded), 0xa0, 0xd9, 0xda, 0xdb)
+    buffer += encoded
+
+
+def _unpack_string(view: memoryview, position: int, size: int, strings: List[str]):
+    """
+    Decode a string, adding it to the string table if it is long enough to have been added when encoding.
+
+    :param view: The encoding.
+    :param position: The position of the string's first byte.
+    :param size: The length of the string, in bytes.
+    :param strings: The string table.
+    :return: The string, and the position after it.
+    """
+    if position + size > len(view):
+        raise MessagePackError("Truncated string.")
+
+    value = str(view[position:position + size], "utf-8")
+    if size >= STRING_TABLE_MINIMUM:
+        strings.append(value)
+
+    return value, position + size
+
+
+_UNSIGNED = {0xcc: _UINT8, 0xcd: _UINT16, 0xce: _UINT32, 0xcf: _UINT64}
+_SIGNED = {0xd0: _INT8, 0xd1: _INT16, 0xd2: _INT32, 0xd3: _INT64}
+_FLOATS = {0xca: _FLOAT32, 0xcb: _FLOAT64}
+_STRINGS = {0xd9: _UINT8, 0xda: _UINT16, 0xdb: _UINT32}
+_BINARIES = {0xc4: _UINT8, 0xc5: _UINT16, 0xc6: _UINT32}
+_ARRAYS = {0xdc: _UINT16, 0xdd: _UINT32}
+_MAPS = {0xde: _UINT16, 0xdf: _UINT32}
+# The data size of each fixed-size extension form, or the struct of each variable-size form's size.
+_EXTENSIONS = {0xd4: 1, 0xd5: 2, 0xd6: 4, 0xd7: 8, 0xd8: 16, 0xc7: _UINT8, 0xc8: _UINT16, 0xc9: _UINT32}
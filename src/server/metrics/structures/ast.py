@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 from enum import Enum
-from typing import TYPE_CHECKING, Optional, Sequence, Union, Dict, Any
+from hashlib import blake2b
+from heapq import merge
+from itertools import count
+from typing import TYPE_CHECKING, Optional, Sequence, Union, Dict, Any, Iterator, List
 
 from metrics.structures.base.graph import Node, Graph
 
@@ -15,6 +18,11 @@ class AST(Graph):
 
     A tree structure that represents a program in a language-independent
     tree-like manner.
+
+    The AST indexes its nodes by type the first time they are looked up, so passes that only need a few kinds of node
+    can find them without walking the whole tree, and ASTs that are never queried never pay for the index. Each node is
+    also identified by its position in the AST in pre-order, which is stable across ASTs generated from the same
+    content.
     """
 
     def __init__(self, root: Optional[ASTNode] = None):
@@ -24,6 +32,9 @@ class AST(Graph):
         :param root: The root node of the AST.
         """
         super().__init__(root)
+        self._index: Optional[Dict[type, List[ASTNode]]] = None
+        self._positions: Dict[int, int] = {}
+        self._nodes: List[ASTNode] = []
 
     def __str__(self):
         return f"Abstract syntax tree.\nRoot: {self.root}"
@@ -40,22 +51,148 @@ class AST(Graph):
         """
         return super().accept(visitor)
 
+    @property
+    def index(self) -> Dict[type, List[ASTNode]]:
+        """
+        The AST's nodes by type, in document order, built on first use.
+
+        :return: The index.
+        """
+        if self._index is None:
+            self.build_index()
+
+        return self._index
+
+    def build_index(self) -> None:
+        """
+        Index the AST's nodes by type, in document order. Must be called again if the tree is changed after the index
+        is first used.
+        """
+        index = {}
+        positions = self._positions = {}
+        nodes = self._nodes = []
+
+        if isinstance(self.root, ASTNode):
+            for position, node in enumerate(self.root.iter_preorder()):
+                positions[id(node)] = position
+                nodes.append(node)
+                if type(node) in index:
+                    index[type(node)].append(node)
+                else:
+                    index[type(node)] = [node]
+
+        self._index = index
+
+    def node_id(self, node: ASTNode) -> int:
+        """
+        Get the id of one of the AST's nodes, i.e. its position in the AST in pre-order.
+
+        :param node: The node.
+        :return: The node's id.
+        """
+        if self._index is None:
+            self.build_index()
+
+        try:
+            return self._positions[id(node)]
+        except KeyError:
+            raise KeyError(f"Node {node!r} is not in the AST.") from None
+
+    def node(self, node_id: int) -> ASTNode:
+        """
+        Get one of the AST's nodes by id.
+
+        :param node_id: The node's id, i.e. its position in the AST in pre-order.
+        :return: The node.
+        """
+        if self._index is None:
+            self.build_index()
+
+        if not 0 <= node_id < len(self._nodes):
+            raise KeyError(f"No node with id {node_id} in the AST.")
+
+        return self._nodes[node_id]
+
+    def find_all(self, *node_types: type) -> List[ASTNode]:
+        """
+        Find the AST's nodes of any of the supplied types, including their subclasses.
+
+        :param node_types: The types of node to find.
+        :return: The nodes found, in document order.
+        """
+        found = [nodes for node_type, nodes in self.index.items() if issubclass(node_type, node_types)]
+        if len(found) == 1:
+            return list(found[0])
+
+        positions = self._positions
+        return list(merge(*found, key=lambda node: positions[id(node)]))
+
+    def find_outermost(self, *node_types: type) -> List[ASTNode]:
+        """
+        Find the AST's nodes of any of the supplied types, including their subclasses, that are not nested inside
+        another node of any of the types.
+
+        :param node_types: The types of node to find.
+        :return: The nodes found, in document order.
+        """
+        return [node for node in self.find_all(*node_types)
+                if not any(isinstance(ancestor, node_types) for ancestor in node.iter_ancestors())]
+
+    def compute_structural_hashes(self) -> Optional[str]:
+        """
+        Compute the structural hash of every subtree in the AST up front, rather than as each is first used.
+
+        :return: The structural hash of the root node. None if the AST has no root.
+        """
+        if not isinstance(self.root, ASTNode):
+            return None
+
+        return self.root.structural_hash
+
+
+# AST node attributes that are not part of the node's structure, so are left out of its structural hash.
+_UNHASHED_ATTRIBUTES = frozenset({"children", "_structural_hash", "subtree_kinds", "parent"})
+
+# Source of the bits identifying each kind (class) of AST node. Bit 0 identifies ASTNode itself.
+_kind_bits = count(1)
+
 
 class ASTNode(Node):
     """
     Node.
 
     Generic abstract syntax tree node.
+
+    Each class of node is a node kind, identified by its own bit in kind_mask. Each node's subtree_kinds is the union of
+    the kind masks of every node in its subtree, computed at construction, so visitors can skip subtrees that contain
+    none of the kinds they handle.
+
+    Each node links to its parent, set when the node is made a child of another node.
     """
 
+    kind_mask: int = 1
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.kind_mask = 1 << next(_kind_bits)
+
     def __init__(self, children: Optional[Dict[Any, ASTNode]] = None):
         """
         Node.
 
         :param children: The child nodes of the node.
         """
-        super().__init__()
+        # Node.__init__ is not called, as it would only build an ordered set of children that the dict replaces.
         self.children: Dict[Any, ASTNode] = children if children is not None else {}
+        self._structural_hash: Optional[str] = None
+        self.parent: Optional[ASTNode] = None
+
+        subtree_kinds = self.kind_mask
+        for child in self.children.values():
+            if isinstance(child, ASTNode):
+                child.parent = self
+                subtree_kinds |= child.subtree_kinds
+        self.subtree_kinds: int = subtree_kinds
 
     def __str__(self):
         return f"Generic abstract syntax tree node.\nChildren: {self.children}"
@@ -63,11 +200,35 @@ class ASTNode(Node):
     def __repr__(self):
         return f"ASTNode(children={self.children})"
 
+    def __getstate__(self):
+        # A pickled subtree leaves its parent behind, rather than dragging the rest of the tree along with it.
+        state = self.__dict__.copy()
+        state["parent"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        for child in self.children.values():
+            if isinstance(child, ASTNode):
+                child.parent = self
+
     def __getitem__(self, item):
         return self.children[item]
 
     def __setitem__(self, key, value: ASTNode):
+        previous = self.children.get(key)
+        if isinstance(previous, ASTNode) and previous.parent is self:
+            previous.parent = None
+
         self.children[key] = value
+        if isinstance(value, ASTNode):
+            self.adopt(value)
+
+        # The structural hashes of the node and its ancestors covered the replaced child.
+        node = self
+        while node is not None and node._structural_hash is not None:
+            node._structural_hash = None
+            node = node.parent
 
     def __contains__(self, item):
         return item in self.children
@@ -75,14 +236,146 @@ class ASTNode(Node):
     def values(self):
         return list(self.children.values())
 
-    def accept(self, visitor: "ASTVisitor"):
+    def adopt(self, child: ASTNode) -> None:
         """
-        Accept an AST visitor.
+        Link a new child to the node, adding the kinds in the child's subtree to the node's and its ancestors' subtree
+        kinds.
 
-        :param visitor: The AST visitor to accept.
-        :return: The result of the accept.
+        :param child: The child node.
         """
-        return super().accept(visitor)
+        child.parent = self
+
+        node = self
+        while node is not None and child.subtree_kinds & ~node.subtree_kinds:
+            node.subtree_kinds |= child.subtree_kinds
+            node = node.parent
+
+    def iter_ancestors(self) -> Iterator[ASTNode]:
+        """
+        Iterate over the node's ancestors, from its parent up to the root.
+
+        :return: Iterator over the node's ancestors.
+        """
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+    def has_kinds(self, mask: int) -> bool:
+        """
+        Check whether the node's subtree contains any of the node kinds in a kind mask.
+
+        :param mask: The kind mask to check against, e.g. from kinds_mask.
+        :return: Whether any node in the subtree is of one of the kinds.
+        """
+        return bool(self.subtree_kinds & mask)
+
+    def iter_preorder(self) -> Iterator[ASTNode]:
+        """
+        Iterate over the node's subtree in pre-order, i.e. each node before its children, in document order.
+
+        :return: Iterator over the nodes of the subtree.
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed([child for child in node.children.values() if isinstance(child, ASTNode)]))
+
+    def iter_postorder(self) -> Iterator[ASTNode]:
+        """
+        Iterate over the node's subtree in post-order, i.e. each node after its children, in document order.
+
+        :return: Iterator over the nodes of the subtree.
+        """
+        stack = [(self, iter(self.children.values()))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if isinstance(child, ASTNode):
+                    stack.append((child, iter(child.children.values())))
+                    break
+            else:
+                stack.pop()
+                yield node
+
+    @property
+    def structural_hash(self) -> str:
+        """
+        Getter for structural_hash property. Structurally identical subtrees share the same hash, across files and
+        processes. The hash is computed on first use, bottom-up along with those of the nodes in the subtree that do not
+        have one yet, so only the subtrees that are looked up, e.g. by memoizing visitors, are ever hashed.
+
+        :return: The structural hash of the node's subtree.
+        """
+        if self._structural_hash is None:
+            stack = [(self, iter(self.children.values()))]
+            while stack:
+                node, children = stack[-1]
+                for child in children:
+                    if isinstance(child, ASTNode) and child._structural_hash is None:
+                        stack.append((child, iter(child.children.values())))
+                        break
+                else:
+                    stack.pop()
+                    node.compute_structural_hash()
+
+        return self._structural_hash
+
+    def compute_structural_hash(self) -> str:
+        """
+        Compute the node's structural hash from its type, its non-child attributes and the structural hashes of its
+        children, computing theirs first if they have none yet.
+
+        :return: The structural hash of the node's subtree.
+        """
+        parts = [type(self).__name__]
+        for attribute, value in sorted(vars(self).items()):
+            if attribute not in _UNHASHED_ATTRIBUTES:
+                parts.append(f"{attribute}={_encode_hash_value(value)}")
+
+        for key, child in self.children.items():
+            child_hash = child.structural_hash if isinstance(child, ASTNode) else _encode_hash_value(child)
+            parts.append(f"{key!r}:{child_hash}")
+
+        self._structural_hash = blake2b("|".join(parts).encode(), digest_size=16).hexdigest()
+        return self._structural_hash
+
+
+def kinds_mask(*node_types: type) -> int:
+    """
+    Get the kind mask covering the supplied node types and all of their subclasses.
+
+    :param node_types: The AST node types to cover.
+    :return: The union of the kind masks of the node types and their subclasses.
+    """
+    mask = 0
+    stack = list(node_types)
+    while stack:
+        node_type = stack.pop()
+        mask |= node_type.kind_mask
+        stack.extend(node_type.__subclasses__())
+
+    return mask
+
+
+def _encode_hash_value(value: Any) -> str:
+    """
+    Encode a node attribute as a string that is stable across processes, for use in structural hashing.
+
+    :param value: The attribute value to encode.
+    :return: The encoded value.
+    """
+    if value is None or type(value) is str:
+        return repr(value)
+
+    if isinstance(value, Enum):
+        return f"{type(value).__name__}.{value.name}"
+
+    if isinstance(value, (list, tuple)):
+        return f"[{','.join(_encode_hash_value(item) for item in value)}]"
+
+    return repr(value)
 
 
 # region Terminals
@@ -187,6 +480,8 @@ class ASTMultiplesNode(ASTNode):
                 if k >= key:
                     key = k + 1
             self.children[key] = child
+            if isinstance(child, ASTNode):
+                self.adopt(child)
         elif not isinstance(child, Node):
             raise TypeError(f"Node.add_child(child): child is not Node (child={child}, type={type(child)}).")
         else:
@@ -1,5 +1,7 @@
 from typing import Optional, Any, TYPE_CHECKING
 
+from metrics.structures.base.ordered_set import OrderedSet
+
 if TYPE_CHECKING:
     from metrics.visitors.base.graph_visitor import GraphVisitor
 
@@ -35,9 +37,12 @@ class Node(object):
         """
         Generic graph node.
 
-        :param children: The child nodes of the node.
+        Children are held in an insertion-ordered set, so checking whether a node is a child, adding a child and
+        removing one take constant time, and iterating over them follows the order they were added in.
+
+        :param children: The child nodes of the node. Repeated children are only kept once.
         """
-        self.children = list([child for child in children if child is not None])
+        self.children = OrderedSet(child for child in children if child is not None)
 
     def __str__(self):
         return f"Generic graph node.\nChildren: {self.children}"
@@ -61,7 +66,7 @@ class Node(object):
         :param child: The child to add.
         """
         if isinstance(child, Node) and child not in self.children:
-            self.children.append(child)
+            self.children.add(child)
         elif not isinstance(child, Node):
             raise TypeError(f"Node.add_child(child): child is not Node (child={child}, type={type(child)}).")
         else:
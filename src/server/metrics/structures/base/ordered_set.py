@@ -0,0 +1,109 @@
+from collections.abc import MutableSet, Set
+from typing import Any, Dict, Generic, Iterable, Iterator, List, TypeVar, Union, overload
+
+T = TypeVar("T")
+
+
+class OrderedSet(MutableSet, Generic[T]):
+    """
+    Insertion-ordered set.
+
+    Backed by a dict, so membership tests, adding and removing are O(1), and iteration follows the order items were
+    first added in. Also supports indexing. Like any other set, it compares equal to the sets holding the same items,
+    whatever their order, and never to lists or tuples, so order is only checked by comparing list(...) explicitly.
+    """
+
+    def __init__(self, items: Iterable[T] = ()):
+        """
+        Insertion-ordered set.
+
+        :param items: The initial items, in order. Repeated items are only kept once, where they first appear.
+        """
+        self._items: Dict[T, None] = dict.fromkeys(items)
+
+    def __str__(self):
+        return str(list(self._items))
+
+    def __repr__(self):
+        return f"OrderedSet({list(self._items)})"
+
+    def __contains__(self, item: Any) -> bool:
+        try:
+            return item in self._items
+        except TypeError:
+            # Unhashable items cannot be in the set.
+            return False
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._items)
+
+    def __reversed__(self) -> Iterator[T]:
+        return reversed(self._items.keys())
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @overload
+    def __getitem__(self, index: int) -> T:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[T]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, List[T]]:
+        """
+        Get the item(s) at a position, in insertion order. O(n), as the items are not held in a sequence.
+
+        :param index: The position or slice of positions.
+        :return: The item, or a list of the items in the slice.
+        """
+        return list(self._items)[index]
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, OrderedSet):
+            return self._items.keys() == other._items.keys()
+        if isinstance(other, Set):
+            return self._items.keys() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def add(self, item: T) -> None:
+        """
+        Add an item to the end of the set, if it is not in the set already.
+
+        :param item: The item to add.
+        """
+        self._items[item] = None
+
+    def discard(self, item: T) -> None:
+        """
+        Remove an item from the set, if it is in the set.
+
+        :param item: The item to remove.
+        """
+        self._items.pop(item, None)
+
+    def remove(self, item: T) -> None:
+        """
+        Remove an item from the set.
+
+        :param item: The item to remove.
+        :raises KeyError: If the item is not in the set.
+        """
+        del self._items[item]
+
+    def clear(self) -> None:
+        """
+        Remove every item from the set.
+        """
+        self._items.clear()
+
+    def copy(self) -> "OrderedSet[T]":
+        """
+        Copy the set.
+
+        :return: A shallow copy of the set.
+        """
+        return OrderedSet(self._items)
@@ -7,6 +7,12 @@ from metrics.structures.base.graph import Graph, Node
 if TYPE_CHECKING:
     from metrics.visitors.base.cfg_visitor import CFGVisitor
 
+# Returned by a block's append step once the appended block has been made the block's exit block.
+_APPENDED = object()
+
+# Incremented whenever a child of a block is replaced, which may change the exit chains cached by appends.
+_structure_version = 0
+
 
 class CFG(Graph):
     def __init__(self, entry_block: Optional[CFGBlock] = None):
@@ -62,6 +68,22 @@ class CFG(Graph):
 
 
 class CFGBlock(Node):
+    """
+    Basic block.
+
+    Appending a block follows the exit chain to its end iteratively. Each append through a block caches where the chain
+    ended, so later appends of blocks that are not yet part of the graph skip the part of the chain already walked, and
+    linking a sequence of n blocks costs O(n) rather than O(n^2). Appends of blocks that are already part of the graph
+    walk the whole chain, as they may stop early where the chain already leads to the block. An exit chain that loops
+    back on itself has no end, so nothing is appended to it.
+    """
+
+    # Whether the block is the child of another block.
+    _linked: bool = False
+
+    # (structure version, block whose exit block was set, the exit block) for the last append through the block.
+    _append_cache: Optional[tuple] = None
+
     def __init__(self, children: Optional[Dict[str, Union[CFGBlock, Sequence[CFGBlock]]]] = None):
         """
         Basic block.
@@ -71,6 +93,9 @@ class CFGBlock(Node):
         super().__init__()
         self.children = children if children is not None else {}
 
+        for child in self.children.values():
+            _mark_linked(child)
+
     def __str__(self):
         s = f"Basic block.\nChildren: {self.children}"
 
@@ -83,7 +108,13 @@ class CFGBlock(Node):
         return self.children[item]
 
     def __setitem__(self, key, value: CFGBlock):
+        global _structure_version
+
+        if key in self.children and self.children[key] is not value:
+            _structure_version += 1
+
         self.children[key] = value
+        _mark_linked(value)
 
     def __contains__(self, item):
         return item in self.children
@@ -97,10 +128,53 @@ class CFGBlock(Node):
 
         :param block: The block to append.
         """
+        cacheable = isinstance(block, CFGBlock) and not block._linked and type(block).append is CFGBlock.append
+        path = []
+        seen = set()
+        current = self
+        while True:
+            if id(current) in seen:
+                # The exit chain loops back on itself (e.g. through a continue block), so nothing falls through it.
+                return
+
+            seen.add(id(current))
+            path.append(current)
+
+            cache = current._append_cache
+            if cacheable and cache is not None and cache[0] == _structure_version \
+                    and cache[1].children.get("exit_block") is cache[2]:
+                current = cache[2]
+                continue
+
+            following = current.append_step(block)
+            if following is _APPENDED:
+                break
+
+            if not isinstance(following, CFGBlock) or type(following).append is not CFGBlock.append:
+                # Blocks with their own append, and non-block exits, are appended to as they define.
+                following.append(block)
+                return
+
+            current = following
+
+        if cacheable:
+            cache = (_structure_version, current, block)
+            for node in path:
+                node._append_cache = cache
+
+    def append_step(self, block: Optional[CFGBlock]):
+        """
+        Take one step of appending a block: either make it the block's exit block or get the block to append it to
+        instead.
+
+        :param block: The block to append.
+        :return: The block to append to instead. _APPENDED if the block was made the exit block.
+        """
         if "exit_block" in self and self["exit_block"] != block:
-            self["exit_block"].append(block)
-        else:
-            self["exit_block"] = block
+            return self["exit_block"]
+
+        self["exit_block"] = block
+        return _APPENDED
 
     def accept(self, visitor: "CFGVisitor"):
         """
@@ -182,13 +256,14 @@ class CFGIfElseBlock(CFGBlock):
     def __repr__(self):
         return f"CFGIfElseBlock(success_block={self['success_block']}, fail_block={self['fail_block']})"
 
-    def append(self, block):
+    def append_step(self, block):
         """
         Append a block to the if-else's success block.
 
         :param block: The block to append.
+        :return: The success block.
         """
-        self["success_block"].append(block)
+        return self["success_block"]
 
     def accept(self, visitor: "CFGVisitor"):
         """
@@ -264,13 +339,14 @@ class CFGLoopElseBlock(CFGBlock):
     def __repr__(self):
         return f"CFGLoopElseBlock(success_block={self['success_block']}, fail_block={self['fail_block']})"
 
-    def append(self, block):
+    def append_step(self, block):
         """
         Append a block to the loop-else's fail block.
 
         :param block: The block to append.
+        :return: The fail block.
         """
-        self["fail_block"].append(block)
+        return self["fail_block"]
 
     def accept(self, visitor: "CFGVisitor"):
         """
@@ -385,3 +461,17 @@ class CFGContinueBlock(CFGBlock):
         :return: The result of the accept.
         """
         return visitor.visit_continue_block(self)
+
+
+def _mark_linked(child: Union[CFGBlock, Sequence[CFGBlock], None]) -> None:
+    """
+    Mark a block, or each block in a sequence, as the child of another block.
+
+    :param child: The child block or sequence of blocks.
+    """
+    if isinstance(child, CFGBlock):
+        child._linked = True
+    elif isinstance(child, (list, tuple)):
+        for block in child:
+            if isinstance(block, CFGBlock):
+                block._linked = True
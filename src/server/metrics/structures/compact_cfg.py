@@ -0,0 +1,294 @@
+from array import array
+from typing import Dict, Iterator, List, Tuple, Type, Union
+
+from metrics.structures.cfg import CFG, CFGBlock, CFGIfBlock, CFGIfElseBlock, CFGLoopBlock, CFGLoopElseBlock, \
+    CFGSwitchBlock, CFGBreakBlock, CFGContinueBlock
+
+# Block kinds.
+BLOCK, IF_BLOCK, IF_ELSE_BLOCK, LOOP_BLOCK, LOOP_ELSE_BLOCK, SWITCH_BLOCK, BREAK_BLOCK, CONTINUE_BLOCK = range(8)
+
+# Edge kinds.
+EXIT_EDGE, SUCCESS_EDGE, FAIL_EDGE, CASE_EDGE = range(4)
+
+_BLOCK_KINDS: Dict[Type[CFGBlock], int] = {
+    CFGBlock: BLOCK,
+    CFGIfBlock: IF_BLOCK,
+    CFGIfElseBlock: IF_ELSE_BLOCK,
+    CFGLoopBlock: LOOP_BLOCK,
+    CFGLoopElseBlock: LOOP_ELSE_BLOCK,
+    CFGSwitchBlock: SWITCH_BLOCK,
+    CFGBreakBlock: BREAK_BLOCK,
+    CFGContinueBlock: CONTINUE_BLOCK,
+}
+_BLOCK_TYPES: Dict[int, Type[CFGBlock]] = {kind: block_type for block_type, kind in _BLOCK_KINDS.items()}
+
+_EDGE_KINDS: Dict[str, int] = {
+    "exit_block": EXIT_EDGE,
+    "success_block": SUCCESS_EDGE,
+    "fail_block": FAIL_EDGE,
+    "case_blocks": CASE_EDGE,
+}
+_EDGE_KEYS: Dict[int, str] = {kind: key for key, kind in _EDGE_KINDS.items()}
+
+
+class CompactCFG(object):
+    def __init__(self, kinds: array = None, offsets: array = None, targets: array = None, edge_kinds: array = None):
+        """
+        Compact control-flow graph.
+
+        Blocks are numbered from 0, with the entry block (if any) numbered 0, and edges are held in compressed sparse
+        row form: the edges out of block i lead to targets[offsets[i]:offsets[i + 1]] and have the edge kinds
+        edge_kinds[offsets[i]:offsets[i + 1]]. The graph holds no references between blocks, so it is cheap to walk
+        and to collect however many loops it has.
+
+        :param kinds: The kind of each block.
+        :param offsets: The offset of each block's first edge, followed by the number of edges.
+        :param targets: The block each edge leads to.
+        :param edge_kinds: The kind of each edge.
+        """
+        self.kinds = kinds if kinds is not None else array("B")
+        self.offsets = offsets if offsets is not None else array("l", [0])
+        self.targets = targets if targets is not None else array("l")
+        self.edge_kinds = edge_kinds if edge_kinds is not None else array("B")
+
+    def __str__(self):
+        return f"Compact control-flow graph.\nBlocks: {len(self)}\nEdges: {self.edge_count}"
+
+    def __repr__(self):
+        return f"CompactCFG(kinds={self.kinds}, offsets={self.offsets}, targets={self.targets}, " \
+               f"edge_kinds={self.edge_kinds})"
+
+    def __len__(self):
+        return len(self.kinds)
+
+    @property
+    def edge_count(self) -> int:
+        """
+        Getter for edge_count property.
+
+        :return: The number of edges in the graph.
+        """
+        return len(self.targets)
+
+    def successors(self, block: int) -> array:
+        """
+        Get the blocks that a block's edges lead to, in order.
+
+        :param block: The block whose successors to get.
+        :return: The block's successors.
+        """
+        return self.targets[self.offsets[block]:self.offsets[block + 1]]
+
+    def edges(self, block: int) -> List[Tuple[int, int]]:
+        """
+        Get a block's edges, in order.
+
+        :param block: The block whose edges to get.
+        :return: A (target, edge kind) pair for each of the block's edges.
+        """
+        start, end = self.offsets[block], self.offsets[block + 1]
+
+        return list(zip(self.targets[start:end], self.edge_kinds[start:end]))
+
+    def iter_depth_first(self) -> Iterator[Tuple[int, bool]]:
+        """
+        Traverse the blocks depth-first from the entry block, with an explicit stack.
+
+        Blocks are numbered in the pre-order of this traversal, so it enters the blocks in the order 0, 1, 2, ...
+
+        :return: Iterator over (block, entering) pairs, yielded with entering True when the traversal enters a block
+        and with entering False when it leaves the block, after all of its successors have been left.
+        """
+        if not self.kinds:
+            return
+
+        offsets, targets = self.offsets, self.targets
+        visited = bytearray(len(self.kinds))
+
+        visited[0] = 1
+        yield 0, True
+
+        # Frames are [block, offset of the next edge to follow].
+        stack = [[0, offsets[0]]]
+        while stack:
+            frame = stack[-1]
+            block, position = frame
+            end = offsets[block + 1]
+            while position < end and visited[targets[position]]:
+                position += 1
+
+            if position < end:
+                child = targets[position]
+                frame[1] = position + 1
+                visited[child] = 1
+                yield child, True
+                stack.append([child, offsets[child]])
+            else:
+                stack.pop()
+                yield block, False
+
+    def simplified(self) -> "CompactCFG":
+        """
+        Simplify the graph by removing its pass-through blocks.
+
+        A pass-through block is a plain block with a single edge to another block, such as the empty placeholder blocks
+        generated for missing success, fail and exit blocks, or the block wrapping the whole CFG. Each one is removed by
+        redirecting the edges into it to its successor, which merges straight-line chains of blocks into their last
+        block. Every removal takes away one block and one edge, so E - N (and the cyclomatic complexity) is preserved.
+        Blocks whose removal would give a predecessor two edges to the same block are kept, so the branches of a block
+        stay apart and the nesting depth is preserved too.
+
+        :return: The simplified graph, with its blocks renumbered in depth-first pre-order from the (possibly new)
+        entry block.
+        """
+        block_count = len(self.kinds)
+        if not block_count:
+            return CompactCFG()
+
+        successors = [list(self.successors(block)) for block in range(block_count)]
+        # The number of edges from each predecessor of each block.
+        predecessors: List[Dict[int, int]] = [{} for _ in range(block_count)]
+        for block, targets in enumerate(successors):
+            for target in targets:
+                predecessors[target][block] = predecessors[target].get(block, 0) + 1
+
+        entry = 0
+        for block in range(block_count):
+            if self.kinds[block] != BLOCK or len(successors[block]) != 1:
+                continue
+
+            successor = successors[block][0]
+            if successor == block or any(predecessor in predecessors[successor] for predecessor in predecessors[block]):
+                continue
+
+            for predecessor, count in predecessors[block].items():
+                successors[predecessor] = [successor if target == block else target
+                                           for target in successors[predecessor]]
+                predecessors[successor][predecessor] = count
+            del predecessors[successor][block]
+
+            if block == entry:
+                entry = successor
+
+        numbers = [-1] * block_count
+        numbers[entry] = 0
+        blocks = [entry]
+
+        stack = [iter(successors[entry])]
+        while stack:
+            for target in stack[-1]:
+                if numbers[target] < 0:
+                    numbers[target] = len(blocks)
+                    blocks.append(target)
+                    stack.append(iter(successors[target]))
+                    break
+            else:
+                stack.pop()
+
+        simplified = CompactCFG()
+        for block in blocks:
+            simplified.kinds.append(self.kinds[block])
+            simplified.targets.extend(numbers[target] for target in successors[block])
+            simplified.edge_kinds.extend(self.edge_kinds[self.offsets[block]:self.offsets[block + 1]])
+            simplified.offsets.append(len(simplified.targets))
+
+        return simplified
+
+    @classmethod
+    def from_cfg(cls, cfg: Union[CFG, "CompactCFG"]) -> "CompactCFG":
+        """
+        Convert a control-flow graph into compact form.
+
+        Only the blocks reachable from the entry block are kept. They are numbered in the order a CFG visitor visits
+        them, and each block's edges keep the order of its children, with sequences of blocks (e.g. switch case
+        blocks) flattened into one edge per block.
+
+        :param cfg: The control-flow graph to convert. Compact graphs are returned as they are.
+        :return: The compact control-flow graph.
+        """
+        if isinstance(cfg, CompactCFG):
+            return cfg
+
+        compact = cls()
+        if not isinstance(cfg.entry_block, CFGBlock):
+            return compact
+
+        numbers: Dict[int, int] = {id(cfg.entry_block): 0}
+        blocks: List[CFGBlock] = [cfg.entry_block]
+
+        stack = [iter(_child_blocks(cfg.entry_block))]
+        while stack:
+            for _, child in stack[-1]:
+                if id(child) not in numbers:
+                    numbers[id(child)] = len(blocks)
+                    blocks.append(child)
+                    stack.append(iter(_child_blocks(child)))
+                    break
+            else:
+                stack.pop()
+
+        for block in blocks:
+            compact.kinds.append(_block_kind(block))
+
+            for edge_kind, child in _child_blocks(block):
+                compact.targets.append(numbers[id(child)])
+                compact.edge_kinds.append(edge_kind)
+
+            compact.offsets.append(len(compact.targets))
+
+        return compact
+
+    def to_cfg(self) -> CFG:
+        """
+        Convert the compact control-flow graph back into block objects.
+
+        :return: The control-flow graph.
+        """
+        blocks = [_BLOCK_TYPES[kind].__new__(_BLOCK_TYPES[kind]) for kind in self.kinds]
+        for block in blocks:
+            CFGBlock.__init__(block)
+
+        for number, block in enumerate(blocks):
+            children = {}
+            for target, edge_kind in self.edges(number):
+                if edge_kind == CASE_EDGE:
+                    children.setdefault(_EDGE_KEYS[CASE_EDGE], []).append(blocks[target])
+                else:
+                    children[_EDGE_KEYS[edge_kind]] = blocks[target]
+
+            for key, child in children.items():
+                block[key] = child
+
+        return CFG(blocks[0] if blocks else None)
+
+
+def _block_kind(block: CFGBlock) -> int:
+    """
+    Get the kind of a block, which for blocks of other types is the kind of their closest known base type.
+
+    :param block: The block whose kind to get.
+    :return: The block's kind.
+    """
+    for block_type in type(block).__mro__:
+        if block_type in _BLOCK_KINDS:
+            return _BLOCK_KINDS[block_type]
+
+    return BLOCK
+
+
+def _child_blocks(block: CFGBlock) -> List[Tuple[int, CFGBlock]]:
+    """
+    Get a block's child blocks, in order, each with the kind of edge leading to it, flattening sequences of blocks.
+
+    :param block: The block whose child blocks to get.
+    :return: An (edge kind, child block) pair for each child block.
+    """
+    children = []
+    for key, child in block.children.items():
+        edge_kind = _EDGE_KINDS.get(key, EXIT_EDGE)
+        if isinstance(child, CFGBlock):
+            children.append((edge_kind, child))
+        elif isinstance(child, (list, tuple)):
+            children.extend((edge_kind, grandchild) for grandchild in child if isinstance(grandchild, CFGBlock))
+
+    return children
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Optional, Sequence, List
+from typing import TYPE_CHECKING, Iterable, Optional, Sequence
 
 from metrics.structures.base.graph import Graph, Node
+from metrics.structures.base.ordered_set import OrderedSet
 
 if TYPE_CHECKING:
+    from metrics.structures.dependency_matrix import DependencyMatrix
     from metrics.visitors.base.dependency_graph_visitor import DependencyGraphVisitor
 
 
@@ -59,6 +61,16 @@ class DependencyGraph(Graph):
         """
         return {cls: cls.accept(visitor) for cls in self.classes}
 
+    def adjacency_matrix(self) -> "DependencyMatrix":
+        """
+        Export the graph's sparse adjacency matrix.
+
+        :return: The sparse dependency matrix, with its mapping from classes to indices.
+        """
+        from metrics.structures.dependency_matrix import DependencyMatrix
+
+        return DependencyMatrix.from_graph(self)
+
 
 class Class(Node):
     """
@@ -85,7 +97,7 @@ class Class(Node):
         return f"Class(name={self.name}, dependencies={self.dependencies})"
 
     @property
-    def dependencies(self) -> List["Class"]:
+    def dependencies(self) -> OrderedSet["Class"]:
         """
         Getter for dependencies property.
 
@@ -94,13 +106,13 @@ class Class(Node):
         return self.children
 
     @dependencies.setter
-    def dependencies(self, new_dependencies: List["Class"]):
+    def dependencies(self, new_dependencies: Iterable["Class"]):
         """
         Setter for dependencies property.
 
         :param new_dependencies: Value to assign to dependencies.
         """
-        self.children = new_dependencies
+        self.children = new_dependencies if isinstance(new_dependencies, OrderedSet) else OrderedSet(new_dependencies)
 
     @dependencies.deleter
     def dependencies(self):
@@ -0,0 +1,86 @@
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from metrics.structures.dependency_graph import DependencyGraph, Class
+from metrics.structures.indexed_dependency_graph import IndexedDependencyGraph
+
+
+class DependencyMatrix(object):
+    def __init__(self, classes: Optional[List[Class]] = None, indptr: Optional[np.ndarray] = None,
+                 indices: Optional[np.ndarray] = None):
+        """
+        Sparse dependency matrix.
+
+        The adjacency matrix of a dependency graph in compressed sparse row form, held in NumPy arrays: row i has a
+        (non-zero) entry in each column indices[indptr[i]:indptr[i + 1]], one for each class that class i directly
+        depends on. Rows and columns are numbered in the same order as the classes of an indexed dependency graph, which
+        only depends on the graph, so the mapping from classes to indices is stable.
+
+        :param classes: The class numbered by each index.
+        :param indptr: The offset of each row's first entry, followed by the number of entries.
+        :param indices: The column of each entry.
+        """
+        self.classes = classes if classes is not None else []
+        self.indptr = indptr if indptr is not None else np.zeros(1, dtype=np.int64)
+        self.indices = indices if indices is not None else np.zeros(0, dtype=np.int64)
+        self.index: Dict[Class, int] = {cls: number for number, cls in enumerate(self.classes)}
+
+    def __str__(self):
+        return f"Sparse dependency matrix.\nShape: {self.shape}\nEntries: {self.nnz}"
+
+    def __repr__(self):
+        return f"DependencyMatrix(classes={self.classes}, indptr={self.indptr!r}, indices={self.indices!r})"
+
+    def __len__(self):
+        return len(self.classes)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """
+        Getter for shape property.
+
+        :return: The number of rows and columns of the matrix.
+        """
+        return len(self.classes), len(self.classes)
+
+    @property
+    def nnz(self) -> int:
+        """
+        Getter for nnz property.
+
+        :return: The number of (non-zero) entries in the matrix.
+        """
+        return len(self.indices)
+
+    def rows(self) -> np.ndarray:
+        """
+        Get the row of each entry, i.e. the class whose dependency each entry is.
+
+        :return: The row of each entry.
+        """
+        return np.repeat(np.arange(len(self.classes), dtype=np.int64), np.diff(self.indptr))
+
+    def to_dense(self) -> np.ndarray:
+        """
+        Convert the matrix into a dense matrix of dependency counts.
+
+        :return: The dense matrix.
+        """
+        dense = np.zeros(self.shape, dtype=np.int64)
+        np.add.at(dense, (self.rows(), self.indices), 1)
+
+        return dense
+
+    @classmethod
+    def from_graph(cls, graph: Union[DependencyGraph, IndexedDependencyGraph]) -> "DependencyMatrix":
+        """
+        Convert a dependency graph into a sparse dependency matrix.
+
+        :param graph: The dependency graph to convert.
+        :return: The sparse dependency matrix.
+        """
+        indexed = IndexedDependencyGraph.from_graph(graph)
+
+        return cls(list(indexed.classes), np.array(indexed.offsets, dtype=np.int64),
+                   np.array(indexed.targets, dtype=np.int64))
@@ -0,0 +1,139 @@
+from collections.abc import Mapping
+from concurrent.futures import Executor
+from concurrent.futures.process import BrokenProcessPool
+from os import cpu_count
+from pickle import PicklingError
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional
+
+from metrics.structures.compact_cfg import CompactCFG
+
+if TYPE_CHECKING:
+    from metrics.structures.ast import ASTNode
+    from metrics.visitors.base.memo_table import MemoTable
+
+
+class FunctionCFGs(Mapping):
+    """
+    Per-function control-flow graphs.
+
+    Maps the qualified name of each function, method, constructor, accessor, etc. to its control-flow graph, in compact
+    form. Each CFG is generated the first time it is looked up, and kept from then on. CFGs are also kept in a memo
+    table (if supplied) keyed by the structural hash of the function, so structurally identical functions, in this file
+    or in others, are only generated once.
+    """
+
+    # The number of CFGs to generate at once, at least, before generate_all uses a supplied executor. On
+    # benchmarks.function_cfgs, pickling a function to send it to a worker process takes about as long as generating
+    # its CFG here, so a process pool does not pay off for typical functions at any batch size, and small batches are
+    # never worth its round trips.
+    parallel_threshold: int = 1000
+
+    def __init__(self, functions: Optional[Dict[str, "ASTNode"]] = None,
+                 generate: Optional[Callable[["ASTNode"], CompactCFG]] = None,
+                 memo_table: Optional["MemoTable"] = None):
+        """
+        Per-function control-flow graphs.
+
+        :param functions: Mapping of each function's qualified name to its definition node.
+        :param generate: Function that generates the CFG of a definition node. Must be defined at module level for CFGs
+        to be generated in parallel.
+        :param memo_table: Table to keep the CFGs in, keyed by structural hash, e.g. a calculator's.
+        """
+        self.functions = functions if functions is not None else {}
+        self.generate = generate
+        self.memo_table = memo_table
+        self._cfgs: Dict[str, CompactCFG] = {}
+
+    def __str__(self):
+        return f"Function control-flow graphs.\nFunctions: {list(self.functions)}\nGenerated: {list(self._cfgs)}"
+
+    def __repr__(self):
+        return f"FunctionCFGs(functions={self.functions})"
+
+    def __getitem__(self, name: str) -> CompactCFG:
+        if name not in self._cfgs:
+            node = self.functions[name]
+            cfg = self._lookup(node)
+            if cfg is None:
+                cfg = self.generate(node)
+                self._store(node, cfg)
+
+            self._cfgs[name] = cfg
+
+        return self._cfgs[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.functions)
+
+    def __len__(self):
+        return len(self.functions)
+
+    def is_generated(self, name: str) -> bool:
+        """
+        Check whether a function's CFG has been generated.
+
+        :param name: The qualified name of the function.
+        :return: Whether the function's CFG has been generated.
+        """
+        return name in self._cfgs
+
+    def generate_all(self, executor: Optional[Executor] = None) -> Dict[str, CompactCFG]:
+        """
+        Generate every function's CFG that has not been generated yet.
+
+        CFGs are generated here by default. If an executor is supplied and at least parallel_threshold CFGs are left to
+        generate, they are generated across the executor instead, falling back to generating them here if the
+        executor's worker processes fail or a function cannot be sent to them. The executor is the caller's to create and shut down.
+
+        :param executor: Executor to generate CFGs across, e.g. a process pool. generate must be defined at module level
+        for it to be sent to worker processes.
+        :return: Mapping of each function's qualified name to its CFG, in definition order.
+        """
+        missing: List[str] = []
+        for name in self.functions:
+            if name in self._cfgs:
+                continue
+
+            cfg = self._lookup(self.functions[name])
+            if cfg is None:
+                missing.append(name)
+            else:
+                self._cfgs[name] = cfg
+
+        if executor is not None and len(missing) >= self.parallel_threshold:
+            nodes = [self.functions[name] for name in missing]
+            chunk_size = max(1, len(nodes) // (cpu_count() or 1))
+            try:
+                cfgs = list(executor.map(self.generate, nodes, chunksize=chunk_size))
+            except (BrokenProcessPool, PicklingError):
+                # Errors raised by generate itself are not caught, so they are not hidden by generating again here.
+                cfgs = None
+
+            if cfgs is not None:
+                for name, node, cfg in zip(missing, nodes, cfgs):
+                    self._store(node, cfg)
+                    self._cfgs[name] = cfg
+
+        return {name: self[name] for name in self.functions}
+
+    def _lookup(self, node: "ASTNode") -> Optional[CompactCFG]:
+        """
+        Look up the CFG memoized for a function.
+
+        :param node: The function's definition node.
+        :return: The memoized CFG. None if none is memoized.
+        """
+        if self.memo_table is None:
+            return None
+
+        return self.memo_table.get(node.structural_hash)
+
+    def _store(self, node: "ASTNode", cfg: CompactCFG) -> None:
+        """
+        Memoize the CFG generated for a function.
+
+        :param node: The function's definition node.
+        :param cfg: The function's CFG.
+        """
+        if self.memo_table is not None:
+            self.memo_table.put(node.structural_hash, cfg)
@@ -0,0 +1,146 @@
+from array import array
+from typing import Dict, List, Optional, Sequence, Union
+
+from metrics.structures.dependency_graph import DependencyGraph, Class, UnknownClass
+
+
+class IndexedDependencyGraph(object):
+    def __init__(self, classes: Optional[List[Class]] = None, roots: array = None, offsets: array = None,
+                 targets: array = None):
+        """
+        Indexed dependency graph.
+
+        Classes are numbered from 0, and dependencies are held in compressed sparse row form: the dependencies of class
+        i are the classes numbered targets[offsets[i]:offsets[i + 1]]. The graph holds no references between classes,
+        so it can be swept over with plain loops, however deep or cyclic the dependencies are.
+
+        :param classes: The class numbered by each index.
+        :param roots: The numbers of the classes listed in the dependency graph, in order.
+        :param offsets: The offset of each class' first dependency, followed by the number of dependencies.
+        :param targets: The class each dependency leads to.
+        """
+        self.classes = classes if classes is not None else []
+        self.roots = roots if roots is not None else array("l")
+        self.offsets = offsets if offsets is not None else array("l", [0])
+        self.targets = targets if targets is not None else array("l")
+
+    def __str__(self):
+        return f"Indexed dependency graph.\nClasses: {len(self)}\nDependencies: {self.dependency_count}"
+
+    def __repr__(self):
+        return f"IndexedDependencyGraph(classes={self.classes}, roots={self.roots}, offsets={self.offsets}, " \
+               f"targets={self.targets})"
+
+    def __len__(self):
+        return len(self.classes)
+
+    @property
+    def dependency_count(self) -> int:
+        """
+        Getter for dependency_count property.
+
+        :return: The number of dependencies in the graph.
+        """
+        return len(self.targets)
+
+    def dependencies(self, cls: int) -> array:
+        """
+        Get the classes that a class directly depends on, in order.
+
+        :param cls: The number of the class whose dependencies to get.
+        :return: The numbers of the class' dependencies.
+        """
+        return self.targets[self.offsets[cls]:self.offsets[cls + 1]]
+
+    @classmethod
+    def from_graph(cls, graph: Union[DependencyGraph, "IndexedDependencyGraph"]) -> "IndexedDependencyGraph":
+        """
+        Convert a dependency graph into indexed form.
+
+        The classes reachable from the classes listed in the graph are numbered in the order a dependency graph visitor
+        visits them: depth-first, in pre-order, starting from each listed class in turn.
+
+        :param graph: The dependency graph to convert. Indexed graphs are returned as they are.
+        :return: The indexed dependency graph.
+        """
+        if isinstance(graph, IndexedDependencyGraph):
+            return graph
+
+        indexed = cls()
+        numbers: Dict[int, int] = {}
+
+        def number(node: Class) -> bool:
+            if id(node) in numbers:
+                return False
+
+            numbers[id(node)] = len(indexed.classes)
+            indexed.classes.append(node)
+            return True
+
+        listed = [node for scope in graph.classes for node in scope]
+        for root in listed:
+            if not number(root):
+                continue
+
+            stack = [iter(root.dependencies or [])]
+            while stack:
+                for dependency in stack[-1]:
+                    if number(dependency):
+                        stack.append(iter(dependency.dependencies or []))
+                        break
+                else:
+                    stack.pop()
+
+        seen = set()
+        for root in listed:
+            if id(root) not in seen:
+                seen.add(id(root))
+                indexed.roots.append(numbers[id(root)])
+
+        for node in indexed.classes:
+            indexed.targets.extend(numbers[id(dependency)] for dependency in node.dependencies or [])
+            indexed.offsets.append(len(indexed.targets))
+
+        return indexed
+
+    @classmethod
+    def merge(cls, graphs: Sequence[Union[DependencyGraph, "IndexedDependencyGraph"]]) -> "IndexedDependencyGraph":
+        """
+        Merge the dependency graphs of several files into one project-wide graph.
+
+        Classes with the same name are taken to be the same class, and are merged into the first of them, with the
+        dependencies of each. Unknown and unnamed classes are kept apart. Classes are numbered in the order they are
+        first met, going through each graph in turn.
+
+        :param graphs: The dependency graphs to merge.
+        :return: The merged indexed dependency graph.
+        """
+        merged = cls()
+        numbers: Dict[Union[str, int], int] = {}
+        dependencies: List[Dict[int, None]] = []
+        roots: Dict[int, None] = {}
+
+        for graph in graphs:
+            indexed = cls.from_graph(graph)
+
+            mapping = []
+            for node in indexed.classes:
+                key = node.name if node.name is not None and not isinstance(node, UnknownClass) else id(node)
+                if key not in numbers:
+                    numbers[key] = len(merged.classes)
+                    merged.classes.append(node)
+                    dependencies.append({})
+
+                mapping.append(numbers[key])
+
+            for number, node in enumerate(mapping):
+                dependencies[node].update(dict.fromkeys(mapping[target] for target in indexed.dependencies(number)))
+
+            roots.update(dict.fromkeys(mapping[root] for root in indexed.roots))
+
+        merged.roots.extend(roots)
+        for targets in dependencies:
+            merged.targets.extend(targets)
+            merged.offsets.append(len(merged.targets))
+
+        return merged
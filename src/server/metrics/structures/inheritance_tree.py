@@ -1,6 +1,7 @@
-from typing import TYPE_CHECKING, Optional, Sequence, List, Union
+from typing import TYPE_CHECKING, Iterable, Optional, Sequence, Union
 
 from metrics.structures.base.graph import Graph, Node
+from metrics.structures.base.ordered_set import OrderedSet
 
 if TYPE_CHECKING:
     from metrics.visitors.base.inheritance_tree_visitor import InheritanceTreeVisitor
@@ -85,7 +86,7 @@ class Class(Node):
         return f"Class(name={self.name}, subclasses={self.subclasses})"
 
     @property
-    def subclasses(self) -> List["Class"]:
+    def subclasses(self) -> OrderedSet["Class"]:
         """
         Getter for subclasses property.
 
@@ -94,13 +95,13 @@ class Class(Node):
         return self.children
 
     @subclasses.setter
-    def subclasses(self, new_subclasses: List["Class"]):
+    def subclasses(self, new_subclasses: Iterable["Class"]):
         """
         Setter for subclasses property.
 
         :param new_subclasses: The value to assign to subclasses.
         """
-        self.children = new_subclasses
+        self.children = new_subclasses if isinstance(new_subclasses, OrderedSet) else OrderedSet(new_subclasses)
 
     @subclasses.deleter
     def subclasses(self):
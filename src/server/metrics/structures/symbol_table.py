@@ -0,0 +1,151 @@
+from sys import intern
+from typing import Dict, List, Optional, Tuple
+
+from metrics.structures.ast import AST, ASTNode, ASTClassDefinitionNode, ASTFunctionDefinitionNode, \
+    ASTIdentifierNode, ASTMemberNode
+
+# Definitions that open a scope of their own.
+SCOPE_TYPES = (ASTClassDefinitionNode, ASTFunctionDefinitionNode)
+
+
+class Scope(object):
+    def __init__(self, name: Optional[str] = None, parent: Optional["Scope"] = None, node: Optional[ASTNode] = None):
+        """
+        Scope.
+
+        The scope opened by a class or function definition (or the global scope), with the qualified names of the
+        definition and of the names defined inside it, interned so that they can be compared and hashed cheaply. Names
+        defined within functions are qualified with <locals>.
+
+        :param name: The name of the definition. None for the global scope.
+        :param parent: The enclosing scope. None for the global scope.
+        :param node: The definition node. None for the global scope.
+        """
+        self.name = name
+        self.parent = parent
+        self.node = node
+        self.children: List[Scope] = []
+
+        if name is None:
+            self.qualified_name: Optional[str] = None
+            self.prefix: Optional[str] = None
+        else:
+            self.qualified_name = parent.qualify(name) if parent is not None else intern(name)
+            self.prefix = intern(f"{self.qualified_name}.<locals>") if isinstance(node, ASTFunctionDefinitionNode) \
+                else self.qualified_name
+
+        self._candidates: Dict[str, Tuple[str, ...]] = {}
+
+    def __str__(self):
+        return f"Scope.\nQualified name: {self.qualified_name}\nChildren: {len(self.children)}"
+
+    def __repr__(self):
+        return f"Scope(name={self.name}, qualified_name={self.qualified_name})"
+
+    def qualify(self, name: str) -> str:
+        """
+        Qualify a name defined in the scope.
+
+        :param name: The name to qualify.
+        :return: The interned qualified name.
+        """
+        return intern(f"{self.prefix}.{name}" if self.prefix else name)
+
+    def candidates(self, name: str) -> Tuple[str, ...]:
+        """
+        Get the qualified names that a name used in the scope can refer to, in the order to look them up: a definition
+        in the same scope, then a global one.
+
+        :param name: The name used.
+        :return: The interned qualified names.
+        """
+        candidates = self._candidates.get(name)
+        if candidates is None:
+            candidates = (self.qualify(name), intern(name)) if self.prefix else (intern(name),)
+            self._candidates[name] = candidates
+
+        return candidates
+
+
+class SymbolTable(object):
+    def __init__(self):
+        """
+        Symbol table.
+
+        The scopes of an AST's class and function definitions, nested in a tree under the global scope, and the
+        definitions of each class by qualified name. Built once per AST and shared by the structure generators, so that
+        each one can look up the scope of a definition and the names it can refer to in constant time instead of
+        deriving them while visiting.
+        """
+        self.global_scope = Scope()
+        self.scopes: Dict[int, Scope] = {}
+        self.classes: Dict[str, List[ASTClassDefinitionNode]] = {}
+
+    def __str__(self):
+        return f"Symbol table.\nScopes: {len(self.scopes)}\nClasses: {len(self.classes)}"
+
+    def __repr__(self):
+        return f"SymbolTable(scopes={len(self.scopes)}, classes={list(self.classes)})"
+
+    def scope_of(self, node: ASTNode) -> Scope:
+        """
+        Get the scope opened by a definition.
+
+        :param node: The class or function definition node.
+        :return: The definition's scope.
+        """
+        return self.scopes[id(node)]
+
+    def enclosing_scope(self, node: ASTNode) -> Scope:
+        """
+        Get the innermost scope that a node is in.
+
+        :param node: The node.
+        :return: The scope of the closest enclosing class or function definition. The global scope if there is none.
+        """
+        for ancestor in node.iter_ancestors():
+            scope = self.scopes.get(id(ancestor))
+            if scope is not None:
+                return scope
+
+        return self.global_scope
+
+    @classmethod
+    def build(cls, ast: AST) -> "SymbolTable":
+        """
+        Build the symbol table of an AST.
+
+        :param ast: The AST.
+        :return: The symbol table.
+        """
+        table = cls()
+        if ast is None or ast.root is None:
+            return table
+
+        # Definitions are found in document order, so each enclosing definition's scope exists before it is needed.
+        for node in ast.find_all(*SCOPE_TYPES):
+            parent = table.enclosing_scope(node)
+            scope = Scope(_get_name(node["name"]), parent, node)
+            parent.children.append(scope)
+            table.scopes[id(node)] = scope
+
+            if isinstance(node, ASTClassDefinitionNode):
+                table.classes.setdefault(scope.qualified_name, []).append(node)
+
+        return table
+
+
+def _get_name(node: Optional[ASTNode]) -> str:
+    """
+    Get the dot-separated name held by an identifier or member node.
+
+    :param node: The name node.
+    :return: The name. <anonymous> if the node holds no name.
+    """
+    if isinstance(node, ASTIdentifierNode):
+        return node.name
+
+    if isinstance(node, ASTMemberNode):
+        return f"{_get_name(node['parent'])}.{_get_name(node['member'])}"
+
+    return "<anonymous>"
@@ -1,18 +1,443 @@
-from typing import TYPE_CHECKING
+from functools import wraps
+from inspect import getattr_static
+from types import GeneratorType
+from typing import TYPE_CHECKING, Optional, Tuple, Callable, Dict, Any, List, Generator, Union
 
+from metrics.structures.ast import kinds_mask
+from metrics.structures.base.graph import Node
 from metrics.visitors.base.graph_visitor import GraphVisitor
+from metrics.visitors.base.memo_table import MemoTable
 
 if TYPE_CHECKING:
     from metrics.structures.ast import *
 
+# Marks a frame that has not received a value yet, and a node that has not been visited yet.
+_STARTED = object()
+
+# ASTVisitor methods that drive the traversal itself, rather than delegating to another visit method.
+_TRAVERSAL_METHODS = frozenset({"visit", "visit_children", "dispatch", "dispatch_iteratively"})
+
+
+class _Dispatched(Exception):
+    def __init__(self, method_name: str):
+        """
+        Raised by a dispatch recorder when a visit method is called on it.
+
+        :param method_name: The name of the visit method that was called.
+        """
+        super().__init__(method_name)
+        self.method_name = method_name
+
+
+class _DispatchRecorder(object):
+    """
+    Dispatch recorder.
+
+    Stand-in visitor that records the name of the first visit method called on it, used to resolve which visit method
+    an accept method or a delegating visit method calls without executing it.
+    """
+
+    def __getattr__(self, name: str):
+        def record(*args, **kwargs):
+            raise _Dispatched(name)
+
+        return record
+
+
+def _record_dispatch(call: Callable[[_DispatchRecorder], Any]) -> Optional[str]:
+    """
+    Record the visit method called by the supplied call.
+
+    :param call: The call to make, supplied with a dispatch recorder.
+    :return: The name of the visit method called. None if no visit method was called.
+    """
+    try:
+        call(_DispatchRecorder())
+    except _Dispatched as dispatched:
+        return dispatched.method_name
+    except Exception:
+        return None
+
+    return None
+
+
+def fold(function: Callable[[Any, Any, List], Any]) -> Callable:
+    """
+    Decorate a visit method as a fold over the visit results of a node's children.
+
+    The decorated method takes the visitor, the node and the list of the node's children's visit results, in order.
+    During dispatch the children are visited by the traversal engine itself, so fold handlers cost no generator. Calling
+    the decorated method with just the node returns a generator that visits the children and then folds their results,
+    for use with ``yield from`` in generator handlers.
+
+    :param function: The fold, taking the visitor, the node and the children's results.
+    :return: The decorated visit method.
+    """
+
+    @wraps(function)
+    def visit(self, node, results=None):
+        if results is None:
+            return _fold_children(self, node, function)
+
+        return function(self, node, results)
+
+    visit.fold = function
+    return visit
+
+
+def _fold_children(visitor, node, function: Callable[[Any, Any, List], Any]) -> Generator:
+    """
+    Visit each of a node's children and fold their visit results.
+
+    :param visitor: The visitor.
+    :param node: The node whose children to visit.
+    :param function: The fold, taking the visitor, the node and the children's results.
+    :return: The folded result.
+    """
+    results = []
+    for child in visitor.children_to_visit(node):
+        results.append((yield child))
+
+    return function(visitor, node, results)
+
+
+class _Fold(object):
+    """
+    Dispatch table entry for a fold handler.
+    """
+
+    __slots__ = ("function",)
+
+    def __init__(self, function: Callable[[Any, Any, List], Any]):
+        self.function = function
+
+
+class _Static(object):
+    """
+    Dispatch table entry for a static handler, which only takes the node.
+    """
+
+    __slots__ = ("function",)
+
+    def __init__(self, function: Callable[[Any], Any]):
+        self.function = function
+
+    def __call__(self, visitor, node):
+        return self.function(node)
+
 
 class ASTVisitor(GraphVisitor):
     """
     Abstract syntax tree visitor.
 
     Base class for visiting abstract syntax tree structures.
+
+    Nodes are visited via dispatch, which looks the node's type up in a per-visitor-class table of handlers instead of
+    going through the node's accept method. Each table entry is resolved once, skipping any of ASTVisitor's default
+    visit methods that only delegate to another visit method (e.g. visit_if_statement -> visit_statement ->
+    visit_children) unless the visitor overrides them.
+
+    Visitors whose results are pure functions of a subtree can set memo_table and memoized_types so that dispatch
+    reuses the result of any structurally identical subtree visited before. Memoized results are shared,
+    so they must not be mutated.
+
+    Visitors that only act on a few kinds of node can set interesting_kinds, so that when visiting the children of a
+    node whose subtree contains any of those kinds, children whose subtrees contain none of them are skipped, as if
+    they were None. Nodes yielded by generator handlers, and the whole subtree of a node with none of the kinds, are
+    always visited, so handlers still get the full result of any node they ask for.
     """
 
+    memo_table: Optional[MemoTable] = None
+    memoized_types: Tuple[type, ...] = ()
+    interesting_kinds: Tuple[type, ...] = ()
+
+    # The depth below which dispatch visits nodes recursively, before switching to an explicit stack. Each level costs at
+    # most two interpreter frames, leaving plenty of the default recursion limit to the caller.
+    RECURSION_BUDGET = 100
+
+    _dispatch_table: Dict[type, Union[Callable[["ASTVisitor", Any], Any], _Fold]] = {}
+    _interesting_mask: Optional[int] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch_table = {}
+        cls._interesting_mask = None
+
+    @classmethod
+    def interesting_mask(cls) -> int:
+        """
+        Get the kind mask of the visitor class' interesting kinds, including their subclasses.
+
+        :return: The kind mask. -1, i.e. every kind, if the visitor class does not set interesting_kinds.
+        """
+        if cls._interesting_mask is None:
+            cls._interesting_mask = kinds_mask(*cls.interesting_kinds) if cls.interesting_kinds else -1
+
+        return cls._interesting_mask
+
+    def children_to_visit(self, node: "ASTNode") -> List["ASTNode"]:
+        """
+        Get the children of a node that visiting its children visits, in order.
+
+        :param node: The parent AST node.
+        :return: The node's children, without None children and, if the node's subtree contains any of the visitor's
+        interesting kinds, without children whose subtrees contain none of them.
+        """
+        mask = self.interesting_mask()
+        if mask != -1 and node.has_kinds(mask):
+            return [child for child in node.children.values() if child is not None and child.has_kinds(mask)]
+
+        return [child for child in node.children.values() if child is not None]
+
+    @classmethod
+    def _resolve_handler(cls, node_type: type) -> Union[Callable[["ASTVisitor", Any], Any], _Fold]:
+        """
+        Resolve the handler for a node type and add it to the visitor class' dispatch table.
+
+        :param node_type: The type of node to resolve the handler for.
+        :return: The handler, taking the visitor and the node, or the fold entry for a fold handler.
+        """
+        name = _record_dispatch(lambda recorder: node_type.__new__(node_type).accept(recorder))
+        if name is None:
+            raise TypeError(f"ASTVisitor.dispatch(node): cannot dispatch node of type {node_type}.")
+
+        while name not in _TRAVERSAL_METHODS and getattr_static(cls, name) is ASTVisitor.__dict__.get(name):
+            function = ASTVisitor.__dict__[name]
+            if isinstance(function, staticmethod):
+                break
+
+            delegate = _record_dispatch(lambda recorder: function(recorder, None))
+            if delegate is None:
+                break
+
+            name = delegate
+
+        attribute = getattr_static(cls, name)
+        if isinstance(attribute, staticmethod):
+            handler = _Static(attribute.__func__)
+        elif hasattr(attribute, "fold"):
+            handler = _Fold(attribute.fold)
+        else:
+            handler = getattr(cls, name)
+
+        cls._dispatch_table[node_type] = handler
+        return handler
+
+    def dispatch(self, node: "ASTNode"):
+        """
+        Visit an AST node and its subtree.
+
+        Nodes are visited recursively down to RECURSION_BUDGET levels below the node, which is the fastest way to walk
+        the shallow subtrees that make up most ASTs. The subtree of any node at that depth is visited with an explicit
+        stack instead (see dispatch_iteratively), so the depth of the AST is not bounded by the interpreter's recursion
+        limit. Handlers are looked up in the visitor class' dispatch table and come in three kinds:
+
+        - plain handlers return their result directly;
+        - fold handlers (see fold) receive the results of visiting all of the node's children, which the engine visits
+          itself;
+        - generator handlers yield each node they want visited (None yields None), receive that node's result in
+          return, and return their own result, e.g.
+
+            def visit_if_statement(self, node):
+                body = yield node["body"]
+                return CFGIfBlock(body)
+
+        Work done by a generator handler before its first yield is pre-order, and work done after its last yield is
+        post-order.
+
+        :param node: The AST node to visit.
+        :return: The result of the visit.
+        """
+        table = self._dispatch_table
+        mask = self.interesting_mask()
+        prune = mask != -1
+        memo_table = self.memo_table
+        memoized_types = self.memoized_types if memo_table is not None else ()
+        visitor_type = type(self)
+        budget = self.RECURSION_BUDGET
+
+        # Children are visited with plain loops rather than comprehensions, which would cost another frame per node.
+        def visit(node, depth):
+            if depth == budget:
+                return self.dispatch_iteratively(node)
+
+            handler = table.get(type(node))
+            if handler is None:
+                handler = self._resolve_handler(type(node))
+
+            kind = type(handler)
+            if kind is _Static:
+                return handler.function(node)
+
+            depth += 1
+            if kind is _Fold:
+                results = []
+                if prune and node.subtree_kinds & mask:
+                    for child in node.children.values():
+                        if child is not None and child.subtree_kinds & mask:
+                            results.append(descend(child, depth))
+                else:
+                    for child in node.children.values():
+                        if child is not None:
+                            results.append(descend(child, depth))
+
+                return handler.function(self, node, results)
+
+            value = handler(self, node)
+            if type(value) is GeneratorType:
+                generator = value
+                try:
+                    child = generator.send(None)
+                    while True:
+                        child = generator.send(None if child is None else descend(child, depth))
+                except StopIteration as stop:
+                    value = stop.value
+
+            return value
+
+        def visit_memoized(node, depth):
+            if not isinstance(node, memoized_types):
+                return visit(node, depth)
+
+            key = (visitor_type, node.structural_hash)
+            value = memo_table.get(key, _STARTED)
+            if value is _STARTED:
+                value = visit(node, depth)
+                memo_table.put(key, value)
+
+            return value
+
+        descend = visit_memoized if memoized_types else visit
+        return None if node is None else descend(node, 0)
+
+    def dispatch_iteratively(self, node: "ASTNode"):
+        """
+        Visit an AST node and its subtree like dispatch, but with an explicit stack rather than recursion, so the depth
+        of the subtree is not bounded by the interpreter's recursion limit.
+
+        :param node: The AST node to visit.
+        :return: The result of the visit.
+        """
+        table = self._dispatch_table
+        mask = self.interesting_mask()
+        prune = mask != -1
+        memo_table = self.memo_table
+        memoized_types = self.memoized_types if memo_table is not None else ()
+        visitor_type = type(self)
+
+        # Frames are (generator, children, results, memo key, fold, node), with generator None for fold frames.
+        stack = []
+        value = _STARTED
+        while True:
+            # Descend into the node.
+            if node is None:
+                value = None
+            else:
+                key = None
+                if memoized_types and isinstance(node, memoized_types):
+                    key = (visitor_type, node.structural_hash)
+                    value = memo_table.get(key, _STARTED)
+
+                if value is _STARTED:
+                    handler = table.get(type(node))
+                    if handler is None:
+                        handler = self._resolve_handler(type(node))
+
+                    if type(handler) is _Fold:
+                        children = node.children.values()
+                        if prune and node.subtree_kinds & mask:
+                            children = [child for child in children if child is not None and child.subtree_kinds & mask]
+
+                        stack.append((None, iter(children), [], key, handler.function, node))
+                    else:
+                        value = handler.function(node) if type(handler) is _Static else handler(self, node)
+                        if type(value) is GeneratorType:
+                            stack.append((value, None, None, key, None, None))
+                            value = _STARTED
+                        elif key is not None:
+                            memo_table.put(key, value)
+
+            # Ascend, passing the value to the top frame until a frame yields another node to descend into.
+            while stack:
+                generator, children, results, key, function, parent = stack[-1]
+                if generator is None:
+                    if value is not _STARTED:
+                        results.append(value)
+
+                    node = next(children, _STARTED)
+                    while node is None:
+                        node = next(children, _STARTED)
+
+                    if node is not _STARTED:
+                        value = _STARTED
+                        break
+
+                    value = function(self, parent, results)
+                else:
+                    try:
+                        node = generator.send(None if value is _STARTED else value)
+                        value = _STARTED
+                        break
+                    except StopIteration as stop:
+                        value = stop.value
+
+                stack.pop()
+                if key is not None:
+                    memo_table.put(key, value)
+            else:
+                return value
+
+    def dispatch_to_depth(self, node: "ASTNode", depth: int, truncate: Callable[["ASTNode", Any], Any]):
+        """
+        Visit an AST node and its subtree down to a maximum depth.
+
+        Fold handlers of nodes at the maximum depth receive no children's results, and the result of each such node
+        that has children to visit is passed to truncate, e.g. to mark it as having been cut short. Nodes handled by
+        plain or generator handlers are visited whole, so this is only useful for visitors handling the nodes that have
+        children with folds.
+
+        :param node: The AST node to visit.
+        :param depth: The maximum depth to visit, relative to the node. 0 only visits the node itself.
+        :param truncate: Function taking a node at the maximum depth whose children were not visited and its result,
+        and returning the result to use in its place.
+        :return: The result of the visit.
+        """
+        table = self._dispatch_table
+
+        # Frames are (node, children, results), one for each fold above the current node.
+        stack = []
+        value = _STARTED
+        while True:
+            # Descend into the node, unless it is at the maximum depth.
+            handler = table.get(type(node))
+            if handler is None:
+                handler = self._resolve_handler(type(node))
+
+            if type(handler) is not _Fold:
+                value = self.dispatch(node)
+            elif len(stack) < depth:
+                stack.append((node, iter(self.children_to_visit(node)), []))
+            else:
+                value = handler.function(self, node, [])
+                if self.children_to_visit(node):
+                    value = truncate(node, value)
+
+            # Ascend, folding each frame whose children have all been visited.
+            while stack:
+                parent, children, results = stack[-1]
+                if value is not _STARTED:
+                    results.append(value)
+
+                node = next(children, None)
+                if node is not None:
+                    value = _STARTED
+                    break
+
+                stack.pop()
+                value = table[type(parent)].function(self, parent, results)
+            else:
+                return value
+
     def visit(self, ast: "AST"):
         """
         Visit an AST structure.
@@ -20,16 +445,19 @@ class ASTVisitor(GraphVisitor):
         :param ast: The AST to visit.
         :return: The output of the visiting process.
         """
-        return super().visit(ast)
+        if isinstance(ast.root, Node):
+            return self.dispatch(ast.root)
 
-    def visit_children(self, node: "ASTNode"):
+    @fold
+    def visit_children(self, node: "ASTNode", results: List):
         """
         Visit each of an AST node's children.
 
         :param node: The parent AST node whose children to visit.
-        :return: Mapping of each child to their visit result.
+        :param results: The children's visit results, in order.
+        :return: List of the children's visit results, in order.
         """
-        return {child: child.accept(self) for child in node.children.values()}
+        return results
 
     # region Terminals
 
@@ -1,5 +1,6 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, List
 
+from metrics.structures.cfg import CFGBlock
 from metrics.visitors.base.graph_visitor import GraphVisitor
 
 if TYPE_CHECKING:
@@ -11,10 +12,13 @@ class CFGVisitor(GraphVisitor):
     Control-flow graph visitor.
 
     Base class for visiting control-flow graph structures.
+
+    Visiting a CFG calls each reachable block's visit method exactly once, in depth-first pre-order from the entry
+    block, without recursing through the blocks.
     """
 
     def __init__(self):
-        self._visited = []
+        super().__init__()
 
     def visit(self, cfg: "CFG"):
         """
@@ -23,17 +27,37 @@ class CFGVisitor(GraphVisitor):
         :param cfg: The CFG to visit.
         :return: The output of the visiting process.
         """
-        self._visited = []
-        return super().visit(cfg)
+        self.reset_visited()
+
+        if isinstance(cfg.entry_block, CFGBlock):
+            for block in self.iter_preorder(cfg.entry_block):
+                block.accept(self)
+
+    def successors(self, block: "CFGBlock") -> List["CFGBlock"]:
+        """
+        Get a block's child blocks, in order, flattening sequences of blocks (e.g. switch case blocks).
+
+        :param block: The block whose child blocks to get.
+        :return: The block's child blocks.
+        """
+        successors = []
+        for child in block.children.values():
+            if isinstance(child, CFGBlock):
+                successors.append(child)
+            elif isinstance(child, (list, tuple)):
+                successors.extend(grandchild for grandchild in child if isinstance(grandchild, CFGBlock))
+
+        return successors
 
     def visit_children(self, block: "CFGBlock"):
         """
-        Visit each of a block's children.
+        "Visit" each of a block's children. (Actually just returns the list of child blocks, as the traversal visits
+        them).
 
         :param block: The parent block whose children to visit.
-        :return: Mapping of each child block to their visit result
+        :return: A list of the block's child blocks.
         """
-        return super().visit_children(block)
+        return self.successors(block)
 
     def visit_block(self, block: "CFGBlock"):
         """
@@ -42,9 +66,7 @@ class CFGVisitor(GraphVisitor):
         :param block: The CFG basic block.
         :return: The result of the visit.
         """
-        if block not in self._visited:
-            self._visited.append(block)
-            return self.visit_children(block)
+        return self.visit_children(block)
 
     def visit_if_block(self, block: "CFGIfBlock"):
         """
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, List
 
 from metrics.visitors.base.graph_visitor import GraphVisitor
 
@@ -14,7 +14,7 @@ class DependencyGraphVisitor(GraphVisitor):
     """
 
     def __init__(self):
-        self._visited = {}
+        super().__init__()
 
     def visit(self, graph: "DependencyGraph"):
         """
@@ -23,10 +23,19 @@ class DependencyGraphVisitor(GraphVisitor):
         :param graph: The dependency graph to visit.
         :return: The output of the visiting process.
         """
-        self._visited = {}
+        self.reset_visited()
 
         return super().visit(graph)
 
+    def successors(self, cls: "Class") -> List["Class"]:
+        """
+        Get a class' dependencies.
+
+        :param cls: The class whose dependencies to get.
+        :return: The class' dependencies.
+        """
+        return list(cls.dependencies) if cls.dependencies else []
+
     def visit_children(self, cls: "Class"):
         """
         "Visit" each of a class' dependencies. (Actually just returns the list of dependencies to avoid susceptibility
@@ -44,10 +53,7 @@ class DependencyGraphVisitor(GraphVisitor):
         :param cls: The generic class.
         :return: The result of the visit.
         """
-        if cls not in self._visited:
-            self._visited[cls] = self.visit_children(cls)
-
-        return self._visited[cls]
+        return self.visit_children(cls)
 
     def visit_known_class(self, cls: "KnownClass"):
         """
@@ -1,9 +1,24 @@
-from typing import Any
+from typing import Any, Iterator, List, Set, Tuple
 
 from metrics.structures.base.graph import Graph, Node
 
 
 class GraphVisitor(object):
+    """
+    Graph visitor.
+
+    Base class for visiting graph structures.
+
+    Graphs can be deep and cyclic, so traversals use an explicit worklist rather than recursion, and keep the nodes
+    visited so far in a set keyed by identity, so that each membership test is O(1) however nodes define equality.
+    """
+
+    def __init__(self):
+        """
+        Graph visitor.
+        """
+        self._visited: Set[int] = set()
+
     def visit(self, graph: Graph):
         """
         Visit a graph structure.
@@ -20,3 +35,90 @@ class GraphVisitor(object):
         :return: Mapping of each child to their visit result.
         """
         return {child: child.accept(self) for child in node.children}
+
+    def successors(self, node: Node) -> List[Node]:
+        """
+        Get the nodes that a traversal moves on to from a node, in order.
+
+        :param node: The node whose successors to get.
+        :return: The node's successors.
+        """
+        return list(node.children)
+
+    def reset_visited(self) -> None:
+        """
+        Forget every node visited so far.
+        """
+        self._visited = set()
+
+    def mark_visited(self, node: Node) -> bool:
+        """
+        Mark a node as visited.
+
+        :param node: The node to mark.
+        :return: Whether the node had not been visited before.
+        """
+        key = id(node)
+        if key in self._visited:
+            return False
+
+        self._visited.add(key)
+        return True
+
+    def is_visited(self, node: Node) -> bool:
+        """
+        Check whether a node has been visited.
+
+        :param node: The node to check.
+        :return: Whether the node has been visited.
+        """
+        return id(node) in self._visited
+
+    def iter_depth_first(self, *roots: Node) -> Iterator[Tuple[Node, bool]]:
+        """
+        Traverse the nodes reachable from the roots depth-first, skipping nodes that have already been visited.
+
+        The traversal visits nodes in the same order as a recursive depth-first search over the nodes' successors, but
+        with an explicit stack, so it is not bounded by the recursion limit. Nodes are marked as visited on entry.
+
+        :param roots: The nodes to start from, in order.
+        :return: Iterator over (node, entering) pairs, yielded with entering True when the traversal enters a node and
+        with entering False when it leaves the node, after all of its successors have been left.
+        """
+        successors = self.successors
+        mark_visited = self.mark_visited
+
+        for root in roots:
+            if not mark_visited(root):
+                continue
+
+            yield root, True
+            stack = [(root, iter(successors(root)))]
+            while stack:
+                node, children = stack[-1]
+                for child in children:
+                    if mark_visited(child):
+                        yield child, True
+                        stack.append((child, iter(successors(child))))
+                        break
+                else:
+                    stack.pop()
+                    yield node, False
+
+    def iter_preorder(self, *roots: Node) -> Iterator[Node]:
+        """
+        Traverse the nodes reachable from the roots depth-first, yielding each node when it is entered.
+
+        :param roots: The nodes to start from, in order.
+        :return: Iterator over the nodes, in pre-order.
+        """
+        return (node for node, entering in self.iter_depth_first(*roots) if entering)
+
+    def iter_postorder(self, *roots: Node) -> Iterator[Node]:
+        """
+        Traverse the nodes reachable from the roots depth-first, yielding each node when it is left.
+
+        :param roots: The nodes to start from, in order.
+        :return: Iterator over the nodes, in post-order.
+        """
+        return (node for node, entering in self.iter_depth_first(*roots) if not entering)
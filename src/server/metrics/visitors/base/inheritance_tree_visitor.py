@@ -11,10 +11,13 @@ class InheritanceTreeVisitor(GraphVisitor):
     Inheritance tree visitor.
 
     Base class for visiting inheritance tree structures.
+
+    Visiting an inheritance tree calls each reachable class' visit method exactly once, in depth-first pre-order from
+    the base class, without recursing through the classes.
     """
 
     def __init__(self):
-        self._visited = []
+        super().__init__()
 
     def visit(self, tree):
         """
@@ -24,19 +27,32 @@ class InheritanceTreeVisitor(GraphVisitor):
         :return: The output of the visiting process.
         :rtype: Any
         """
-        self._visited = []
+        self.reset_visited()
+
+        if tree.base is not None:
+            for cls in self.iter_preorder(tree.base):
+                cls.accept(self)
 
-        return super().visit(tree)
+    def successors(self, cls):
+        """
+        Get a class' subclasses.
+        :param cls: The class whose subclasses to get.
+        :type cls: Class
+        :return: The class' subclasses.
+        :rtype: list[Class]
+        """
+        return list(cls.subclasses) if cls.subclasses else []
 
     def visit_children(self, cls):
         """
-        Visit each of the class' subclasses.
+        "Visit" each of the class' subclasses. (Actually just returns the list of subclasses, as the traversal visits
+        them).
         :param cls: The parent class whose subclasses to visit.
         :type cls: Class
-        :return: Mapping of each subclass to their visit result.
-        :rtype: dict{Class, Any}
+        :return: A list of the class' subclasses.
+        :rtype: list[Class]
         """
-        return super().visit_children(cls)
+        return self.successors(cls)
 
     def visit_class(self, cls):
         """
@@ -46,9 +62,7 @@ class InheritanceTreeVisitor(GraphVisitor):
         :return: The result of the visit.
         :rtype: Any
         """
-        if cls not in self._visited:
-            self._visited.append(cls)
-            return self.visit_children(cls)
+        return self.visit_children(cls)
 
     def visit_known_class(self, cls):
         """
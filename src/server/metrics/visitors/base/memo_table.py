@@ -0,0 +1,71 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable
+
+
+class MemoTable(object):
+    """
+    Memo table.
+
+    Bounded, thread-safe mapping from subtree keys (e.g. AST structural hashes) to visit results. Tables can be shared
+    between visitor instances, e.g. those of one calculator, so results are reused across their visits. The least
+    recently used entries are evicted once the table is full.
+    """
+
+    def __init__(self, max_size: int = 4096):
+        """
+        Memo table.
+
+        :param max_size: The maximum number of results to hold.
+        """
+        self.max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def __str__(self):
+        return f"Memo table.\nSize: {len(self)}\nMax size: {self.max_size}"
+
+    def __repr__(self):
+        return f"MemoTable(max_size={self.max_size})"
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable):
+        return key in self._entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get the result memoized for a key, marking it as recently used.
+
+        :param key: The key to look up.
+        :param default: The value to return if no result is memoized for the key.
+        :return: The memoized result. The default if no result is memoized for the key.
+        """
+        with self._lock:
+            if key not in self._entries:
+                return default
+
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Memoize a result for a key, evicting the least recently used result if the table is full.
+
+        :param key: The key to memoize the result for.
+        :param value: The result to memoize.
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Remove all memoized results.
+        """
+        with self._lock:
+            self._entries.clear()
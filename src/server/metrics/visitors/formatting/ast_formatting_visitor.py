@@ -1,17 +1,54 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, List, Optional
 
-from metrics.visitors.base.ast_visitor import ASTVisitor
+from metrics.structures.ast import ASTDefinitionNode
+from metrics.visitors.base.ast_visitor import ASTVisitor, fold
+from metrics.visitors.base.memo_table import MemoTable
 
 if TYPE_CHECKING:
     from metrics.structures.ast import *
 
 
 class ASTFormattingVisitor(ASTVisitor):
+    memoized_types = (ASTDefinitionNode,)
+
+    def __init__(self, memo_table: Optional[MemoTable] = None):
+        """
+        AST formatting visitor.
+
+        :param memo_table: Table to reuse the formatted definitions of earlier visits from, keyed by structural hash
+        (e.g. a calculator's, across the queries of its AST). None formats every definition afresh.
+        """
+        self.memo_table = memo_table
+
     def visit(self, ast: "AST"):
         return super().visit(ast)
 
-    def visit_children(self, node: "ASTNode"):
-        return [child.accept(self) for child in node.children.values() if child is not None] if node.children else None
+    def visit_to_depth(self, ast: "AST", depth: int, node: Optional["ASTNode"] = None):
+        """
+        Visit an AST, or the subtree of one of its nodes, down to a maximum depth. Nodes at the maximum depth that have
+        children are formatted without them, and marked as truncated with their id in the AST, so that their subtrees
+        can be requested on demand.
+
+        :param ast: The AST to visit.
+        :param depth: The maximum depth to visit, relative to the subtree's root. 0 only visits the root itself.
+        :param node: The root of the subtree to visit. Defaults to the AST's root.
+        :return: The output of the visiting process.
+        """
+        node = ast.root if node is None else node
+        if node is None:
+            return None
+
+        def truncate(truncated_node: "ASTNode", result: dict) -> dict:
+            result.pop("children", None)
+            result["id"] = ast.node_id(truncated_node)
+            result["truncated"] = True
+            return result
+
+        return self.dispatch_to_depth(node, depth, truncate)
+
+    @fold
+    def visit_children(self, node: "ASTNode", results: List):
+        return results if node.children else None
 
     @staticmethod
     def visit_identifier(node: "ASTIdentifierNode"):
@@ -21,365 +58,486 @@ class ASTFormattingVisitor(ASTVisitor):
     def visit_literal(node: "ASTLiteralNode"):
         return {"name": node.value}
 
-    def visit_multiples(self, node: "ASTMultiplesNode"):
-        return {"name": "Multiples", "children": self.visit_children(node)}
+    @fold
+    def visit_multiples(self, node: "ASTMultiplesNode", results: List):
+        return {"name": "Multiples", "children": self.visit_children(node, results)}
 
-    def visit_statements(self, node: "ASTStatementsNode"):
-        return {"name": "Statements", "children": self.visit_children(node)}
+    @fold
+    def visit_statements(self, node: "ASTStatementsNode", results: List):
+        return {"name": "Statements", "children": self.visit_children(node, results)}
 
-    def visit_expressions(self, node: "ASTExpressionsNode"):
-        return {"name": "Expressions", "children": self.visit_children(node)}
+    @fold
+    def visit_expressions(self, node: "ASTExpressionsNode", results: List):
+        return {"name": "Expressions", "children": self.visit_children(node, results)}
 
-    def visit_variables(self, node: "ASTVariablesNode"):
-        return {"name": "Variables", "children": self.visit_children(node)}
+    @fold
+    def visit_variables(self, node: "ASTVariablesNode", results: List):
+        return {"name": "Variables", "children": self.visit_children(node, results)}
 
-    def visit_elements(self, node: "ASTElementsNode"):
-        return {"name": "Elements", "children": self.visit_children(node)}
+    @fold
+    def visit_elements(self, node: "ASTElementsNode", results: List):
+        return {"name": "Elements", "children": self.visit_children(node, results)}
 
-    def visit_parameters(self, node: "ASTParametersNode"):
-        return {"name": "Parameters", "children": self.visit_children(node)}
+    @fold
+    def visit_parameters(self, node: "ASTParametersNode", results: List):
+        return {"name": "Parameters", "children": self.visit_children(node, results)}
 
-    def visit_arguments(self, node: "ASTArgumentsNode"):
-        return {"name": "Arguments", "children": self.visit_children(node)}
+    @fold
+    def visit_arguments(self, node: "ASTArgumentsNode", results: List):
+        return {"name": "Arguments", "children": self.visit_children(node, results)}
 
-    def visit_subscripts(self, node: "ASTSubscriptsNode"):
-        return {"name": "Subscripts", "children": self.visit_children(node)}
+    @fold
+    def visit_subscripts(self, node: "ASTSubscriptsNode", results: List):
+        return {"name": "Subscripts", "children": self.visit_children(node, results)}
 
-    def visit_catches(self, node: "ASTCatchesNode"):
-        return {"name": "Catches", "children": self.visit_children(node)}
+    @fold
+    def visit_catches(self, node: "ASTCatchesNode", results: List):
+        return {"name": "Catches", "children": self.visit_children(node, results)}
 
-    def visit_decorators(self, node: "ASTDecoratorsNode"):
-        return {"name": "Decorators", "children": self.visit_children(node)}
+    @fold
+    def visit_decorators(self, node: "ASTDecoratorsNode", results: List):
+        return {"name": "Decorators", "children": self.visit_children(node, results)}
 
-    def visit_statement(self, node: "ASTStatementNode"):
-        return {"name": "Statement", "children": self.visit_children(node)}
+    @fold
+    def visit_statement(self, node: "ASTStatementNode", results: List):
+        return {"name": "Statement", "children": self.visit_children(node, results)}
 
-    def visit_del_statement(self, node: "ASTDelStatementNode"):
-        return {"name": "Del statement", "children": self.visit_children(node)}
+    @fold
+    def visit_del_statement(self, node: "ASTDelStatementNode", results: List):
+        return {"name": "Del statement", "children": self.visit_children(node, results)}
 
-    def visit_variable_declaration(self, node: "ASTVariableDeclarationNode"):
-        return {"name": "Variable declaration", "children": self.visit_children(node)}
+    @fold
+    def visit_variable_declaration(self, node: "ASTVariableDeclarationNode", results: List):
+        return {"name": "Variable declaration", "children": self.visit_children(node, results)}
 
-    def visit_assignment_statement(self, node: "ASTAssignmentStatementNode"):
-        return {"name": "Assignment statement", "children": self.visit_children(node)}
+    @fold
+    def visit_assignment_statement(self, node: "ASTAssignmentStatementNode", results: List):
+        return {"name": "Assignment statement", "children": self.visit_children(node, results)}
 
-    def visit_augmented_assignment_statement(self, node: "ASTAugmentedAssignmentStatementNode"):
-        return {"name": f"Augmented Assignment: {node.operation}", "children": self.visit_children(node)}
+    @fold
+    def visit_augmented_assignment_statement(self, node: "ASTAugmentedAssignmentStatementNode", results: List):
+        return {"name": f"Augmented Assignment: {node.operation}", "children": self.visit_children(node, results)}
 
-    def visit_annotated_assignment_statement(self, node: "ASTAnnotatedAssignmentStatementNode"):
-        return {"name": "Annotated Assignment", "children": self.visit_children(node)}
+    @fold
+    def visit_annotated_assignment_statement(self, node: "ASTAnnotatedAssignmentStatementNode", results: List):
+        return {"name": "Annotated Assignment", "children": self.visit_children(node, results)}
 
-    def visit_yield_statement(self, node: "ASTYieldStatementNode"):
-        return {"name": "Yield statement", "children": self.visit_children(node)}
+    @fold
+    def visit_yield_statement(self, node: "ASTYieldStatementNode", results: List):
+        return {"name": "Yield statement", "children": self.visit_children(node, results)}
 
-    def visit_pass_statement(self, node: "ASTPassStatementNode"):
-        return {"name": "Pass statement", "children": self.visit_children(node)}
+    @fold
+    def visit_pass_statement(self, node: "ASTPassStatementNode", results: List):
+        return {"name": "Pass statement", "children": self.visit_children(node, results)}
 
-    def visit_break_statement(self, node: "ASTBreakStatementNode"):
-        return {"name": "Break statement", "children": self.visit_children(node)}
+    @fold
+    def visit_break_statement(self, node: "ASTBreakStatementNode", results: List):
+        return {"name": "Break statement", "children": self.visit_children(node, results)}
 
-    def visit_continue_statement(self, node: "ASTContinueStatementNode"):
-        return {"name": "Continue statement", "children": self.visit_children(node)}
+    @fold
+    def visit_continue_statement(self, node: "ASTContinueStatementNode", results: List):
+        return {"name": "Continue statement", "children": self.visit_children(node, results)}
 
-    def visit_return_statement(self, node: "ASTReturnStatementNode"):
-        return {"name": "Return statement", "children": self.visit_children(node)}
+    @fold
+    def visit_return_statement(self, node: "ASTReturnStatementNode", results: List):
+        return {"name": "Return statement", "children": self.visit_children(node, results)}
 
-    def visit_throw_statement(self, node: "ASTThrowStatementNode"):
-        return {"name": "Throw statement", "children": self.visit_children(node)}
+    @fold
+    def visit_throw_statement(self, node: "ASTThrowStatementNode", results: List):
+        return {"name": "Throw statement", "children": self.visit_children(node, results)}
 
-    def visit_import_statement(self, node: "ASTImportStatementNode"):
-        return {"name": "Import statement", "children": self.visit_children(node)}
+    @fold
+    def visit_import_statement(self, node: "ASTImportStatementNode", results: List):
+        return {"name": "Import statement", "children": self.visit_children(node, results)}
 
-    def visit_global_statement(self, node: "ASTGlobalStatementNode"):
-        return {"name": "Global statement", "children": self.visit_children(node)}
+    @fold
+    def visit_global_statement(self, node: "ASTGlobalStatementNode", results: List):
+        return {"name": "Global statement", "children": self.visit_children(node, results)}
 
-    def visit_non_local_statement(self, node: "ASTNonLocalStatementNode"):
-        return {"name": "Non-local statement", "children": self.visit_children(node)}
+    @fold
+    def visit_non_local_statement(self, node: "ASTNonLocalStatementNode", results: List):
+        return {"name": "Non-local statement", "children": self.visit_children(node, results)}
 
-    def visit_assert_statement(self, node: "ASTAssertStatementNode"):
-        return {"name": "Assert statement", "children": self.visit_children(node)}
+    @fold
+    def visit_assert_statement(self, node: "ASTAssertStatementNode", results: List):
+        return {"name": "Assert statement", "children": self.visit_children(node, results)}
 
-    def visit_if_statement(self, node: "ASTIfStatementNode"):
-        return {"name": "If statement", "children": self.visit_children(node)}
+    @fold
+    def visit_if_statement(self, node: "ASTIfStatementNode", results: List):
+        return {"name": "If statement", "children": self.visit_children(node, results)}
 
-    def visit_loop_statement(self, node: "ASTLoopStatementNode"):
-        return {"name": "Loop statement", "children": self.visit_children(node)}
+    @fold
+    def visit_loop_statement(self, node: "ASTLoopStatementNode", results: List):
+        return {"name": "Loop statement", "children": self.visit_children(node, results)}
 
-    def visit_try_statement(self, node: "ASTTryStatementNode"):
-        return {"name": "Try statement", "children": self.visit_children(node)}
+    @fold
+    def visit_try_statement(self, node: "ASTTryStatementNode", results: List):
+        return {"name": "Try statement", "children": self.visit_children(node, results)}
 
-    def visit_catch(self, node: "ASTCatchNode"):
-        return {"name": "Catch clause", "children": self.visit_children(node)}
+    @fold
+    def visit_catch(self, node: "ASTCatchNode", results: List):
+        return {"name": "Catch clause", "children": self.visit_children(node, results)}
 
-    def visit_finally(self, node: "ASTFinallyNode"):
-        return {"name": "Finally clause", "children": self.visit_children(node)}
+    @fold
+    def visit_finally(self, node: "ASTFinallyNode", results: List):
+        return {"name": "Finally clause", "children": self.visit_children(node, results)}
 
-    def visit_with_statement(self, node: "ASTWithStatementNode"):
-        return {"name": "With statement", "children": self.visit_children(node)}
+    @fold
+    def visit_with_statement(self, node: "ASTWithStatementNode", results: List):
+        return {"name": "With statement", "children": self.visit_children(node, results)}
 
-    def visit_function_definition(self, node: "ASTFunctionDefinitionNode"):
-        return {"name": "Function definition", "children": self.visit_children(node)}
+    @fold
+    def visit_function_definition(self, node: "ASTFunctionDefinitionNode", results: List):
+        return {"name": "Function definition", "children": self.visit_children(node, results)}
 
-    def visit_class_definition(self, node: "ASTClassDefinitionNode"):
-        return {"name": "Class definition", "children": self.visit_children(node)}
+    @fold
+    def visit_class_definition(self, node: "ASTClassDefinitionNode", results: List):
+        return {"name": "Class definition", "children": self.visit_children(node, results)}
 
-    def visit_yield_expression(self, node: "ASTYieldExpressionNode"):
-        return {"name": "Yield expression", "children": self.visit_children(node)}
+    @fold
+    def visit_yield_expression(self, node: "ASTYieldExpressionNode", results: List):
+        return {"name": "Yield expression", "children": self.visit_children(node, results)}
 
-    def visit_binary_operation(self, node: "ASTBinaryOperationNode"):
-        return {"name": f"Binary operation: {node.operation}", "children": self.visit_children(node)}
+    @fold
+    def visit_binary_operation(self, node: "ASTBinaryOperationNode", results: List):
+        return {"name": f"Binary operation: {node.operation}", "children": self.visit_children(node, results)}
 
-    def visit_unary_operation(self, node: "ASTUnaryOperationNode"):
-        return {"name": f"Unary operation: {node.operation}", "children": self.visit_children(node)}
+    @fold
+    def visit_unary_operation(self, node: "ASTUnaryOperationNode", results: List):
+        return {"name": f"Unary operation: {node.operation}", "children": self.visit_children(node, results)}
 
-    def visit_alias(self, node: "ASTAliasNode"):
-        return {"name": "Alias", "children": self.visit_children(node)}
+    @fold
+    def visit_alias(self, node: "ASTAliasNode", results: List):
+        return {"name": "Alias", "children": self.visit_children(node, results)}
 
-    def visit_from(self, node: "ASTFromNode"):
-        return {"name": "From", "children": self.visit_children(node)}
+    @fold
+    def visit_from(self, node: "ASTFromNode", results: List):
+        return {"name": "From", "children": self.visit_children(node, results)}
 
-    def visit_parameter(self, node: "ASTParameterNode"):
-        return {"name": "Parameter", "children": self.visit_children(node)}
+    @fold
+    def visit_parameter(self, node: "ASTParameterNode", results: List):
+        return {"name": "Parameter", "children": self.visit_children(node, results)}
 
-    def visit_positional_arguments_parameter(self, node: "ASTPositionalArgumentsParameterNode"):
-        return {"name": "Positional arguments parameter", "children": self.visit_children(node)}
+    @fold
+    def visit_positional_arguments_parameter(self, node: "ASTPositionalArgumentsParameterNode", results: List):
+        return {"name": "Positional arguments parameter", "children": self.visit_children(node, results)}
 
-    def visit_keyword_arguments_parameter(self, node: "ASTKeywordArgumentsParameterNode"):
-        return {"name": "Keyword arguments parameter", "children": self.visit_children(node)}
+    @fold
+    def visit_keyword_arguments_parameter(self, node: "ASTKeywordArgumentsParameterNode", results: List):
+        return {"name": "Keyword arguments parameter", "children": self.visit_children(node, results)}
 
-    def visit_anonymous_function_definition(self, node: "ASTAnonymousFunctionDefinitionNode"):
-        return {"name": "Anonymous function definition", "children": self.visit_children(node)}
+    @fold
+    def visit_anonymous_function_definition(self, node: "ASTAnonymousFunctionDefinitionNode", results: List):
+        return {"name": "Anonymous function definition", "children": self.visit_children(node, results)}
 
-    def visit_positional_unpack_expression(self, node: "ASTPositionalUnpackExpressionNode"):
-        return {"name": "Positional unpack expression", "children": self.visit_children(node)}
+    @fold
+    def visit_positional_unpack_expression(self, node: "ASTPositionalUnpackExpressionNode", results: List):
+        return {"name": "Positional unpack expression", "children": self.visit_children(node, results)}
 
-    def visit_keyword_unpack_expression(self, node: "ASTKeywordUnpackExpressionNode"):
-        return {"name": "Keyword unpack expression", "children": self.visit_children(node)}
+    @fold
+    def visit_keyword_unpack_expression(self, node: "ASTKeywordUnpackExpressionNode", results: List):
+        return {"name": "Keyword unpack expression", "children": self.visit_children(node, results)}
 
-    def visit_async(self, node: "ASTAsyncNode"):
-        return {"name": "Async", "children": self.visit_children(node)}
+    @fold
+    def visit_async(self, node: "ASTAsyncNode", results: List):
+        return {"name": "Async", "children": self.visit_children(node, results)}
 
-    def visit_await(self, node: "ASTAwaitNode"):
-        return {"name": "Await", "children": self.visit_children(node)}
+    @fold
+    def visit_await(self, node: "ASTAwaitNode", results: List):
+        return {"name": "Await", "children": self.visit_children(node, results)}
 
-    def visit_member(self, node: "ASTMemberNode"):
-        return {"name": "Member", "children": self.visit_children(node)}
+    @fold
+    def visit_member(self, node: "ASTMemberNode", results: List):
+        return {"name": "Member", "children": self.visit_children(node, results)}
 
-    def visit_access(self, node: "ASTAccessNode"):
-        return {"name": "Access", "children": self.visit_children(node)}
+    @fold
+    def visit_access(self, node: "ASTAccessNode", results: List):
+        return {"name": "Access", "children": self.visit_children(node, results)}
 
-    def visit_index(self, node: "ASTIndexNode"):
-        return {"name": "Index", "children": self.visit_children(node)}
+    @fold
+    def visit_index(self, node: "ASTIndexNode", results: List):
+        return {"name": "Index", "children": self.visit_children(node, results)}
 
-    def visit_slice(self, node: "ASTSliceNode"):
-        return {"name": "Slice", "children": self.visit_children(node)}
+    @fold
+    def visit_slice(self, node: "ASTSliceNode", results: List):
+        return {"name": "Slice", "children": self.visit_children(node, results)}
 
-    def visit_call(self, node: "ASTCallNode"):
-        return {"name": "Call", "children": self.visit_children(node)}
+    @fold
+    def visit_call(self, node: "ASTCallNode", results: List):
+        return {"name": "Call", "children": self.visit_children(node, results)}
 
-    def visit_argument(self, node: "ASTArgumentNode"):
-        return {"name": "Argument", "children": self.visit_children(node)}
+    @fold
+    def visit_argument(self, node: "ASTArgumentNode", results: List):
+        return {"name": "Argument", "children": self.visit_children(node, results)}
 
-    def visit_keyword_argument(self, node: "ASTKeywordArgumentNode"):
-        return {"name": "Keyword argument", "children": self.visit_children(node)}
+    @fold
+    def visit_keyword_argument(self, node: "ASTKeywordArgumentNode", results: List):
+        return {"name": "Keyword argument", "children": self.visit_children(node, results)}
 
-    def visit_generator_expression(self, node: "ASTGeneratorExpressionNode"):
-        return {"name": "Generator expression", "children": self.visit_children(node)}
+    @fold
+    def visit_generator_expression(self, node: "ASTGeneratorExpressionNode", results: List):
+        return {"name": "Generator expression", "children": self.visit_children(node, results)}
 
-    def visit_comprehension(self, node: "ASTComprehensionNode"):
-        return {"name": "Comprehension", "children": self.visit_children(node)}
+    @fold
+    def visit_comprehension(self, node: "ASTComprehensionNode", results: List):
+        return {"name": "Comprehension", "children": self.visit_children(node, results)}
 
-    def visit_list(self, node: "ASTListNode"):
-        return {"name": "List", "children": self.visit_children(node)}
+    @fold
+    def visit_list(self, node: "ASTListNode", results: List):
+        return {"name": "List", "children": self.visit_children(node, results)}
 
-    def visit_tuple(self, node: "ASTTupleNode"):
-        return {"name": "Tuple", "children": self.visit_children(node)}
+    @fold
+    def visit_tuple(self, node: "ASTTupleNode", results: List):
+        return {"name": "Tuple", "children": self.visit_children(node, results)}
 
-    def visit_set(self, node: "ASTSetNode"):
-        return {"name": "Set", "children": self.visit_children(node)}
+    @fold
+    def visit_set(self, node: "ASTSetNode", results: List):
+        return {"name": "Set", "children": self.visit_children(node, results)}
 
-    def visit_map(self, node: "ASTMapNode"):
-        return {"name": "Map", "children": self.visit_children(node)}
+    @fold
+    def visit_map(self, node: "ASTMapNode", results: List):
+        return {"name": "Map", "children": self.visit_children(node, results)}
 
-    def visit_key_value_pair(self, node: "ASTKeyValuePairNode"):
-        return {"name": "Key-value pair", "children": self.visit_children(node)}
+    @fold
+    def visit_key_value_pair(self, node: "ASTKeyValuePairNode", results: List):
+        return {"name": "Key-value pair", "children": self.visit_children(node, results)}
 
-    def visit_decorated(self, node: "ASTDecoratedNode"):
-        return {"name": "Decorated", "children": self.visit_children(node)}
+    @fold
+    def visit_decorated(self, node: "ASTDecoratedNode", results: List):
+        return {"name": "Decorated", "children": self.visit_children(node, results)}
 
-    def visit_decorator(self, node: "ASTDecoratorNode"):
-        return {"name": "Decorator", "children": self.visit_children(node)}
+    @fold
+    def visit_decorator(self, node: "ASTDecoratorNode", results: List):
+        return {"name": "Decorator", "children": self.visit_children(node, results)}
 
-    def visit_switch_sections(self, node: "ASTSwitchSectionsNode"):
-        return {"name": "Switch sections", "children": self.visit_children(node)}
+    @fold
+    def visit_switch_sections(self, node: "ASTSwitchSectionsNode", results: List):
+        return {"name": "Switch sections", "children": self.visit_children(node, results)}
 
-    def visit_switch_labels(self, node: "ASTSwitchLabelsNode"):
-        return {"name": "Switch labels", "children": self.visit_children(node)}
+    @fold
+    def visit_switch_labels(self, node: "ASTSwitchLabelsNode", results: List):
+        return {"name": "Switch labels", "children": self.visit_children(node, results)}
 
-    def visit_variable_declarations(self, node: "ASTVariableDeclarationsNode"):
-        return {"name": "Variable declarations", "children": self.visit_children(node)}
+    @fold
+    def visit_variable_declarations(self, node: "ASTVariableDeclarationsNode", results: List):
+        return {"name": "Variable declarations", "children": self.visit_children(node, results)}
 
-    def visit_constant_declarations(self, node: "ASTConstantDeclarationsNode"):
-        return {"name": "Constant declarations", "children": self.visit_children(node)}
+    @fold
+    def visit_constant_declarations(self, node: "ASTConstantDeclarationsNode", results: List):
+        return {"name": "Constant declarations", "children": self.visit_children(node, results)}
 
-    def visit_attributes(self, node: "ASTAttributesNode"):
-        return {"name": "Attributes", "children": self.visit_children(node)}
+    @fold
+    def visit_attributes(self, node: "ASTAttributesNode", results: List):
+        return {"name": "Attributes", "children": self.visit_children(node, results)}
 
-    def visit_attribute_sections(self, node: "ASTAttributeSectionsNode"):
-        return {"name": "Attribute", "children": self.visit_children(node)}
+    @fold
+    def visit_attribute_sections(self, node: "ASTAttributeSectionsNode", results: List):
+        return {"name": "Attribute", "children": self.visit_children(node, results)}
 
-    def visit_constraints_clauses(self, node: "ASTConstraintsClausesNode"):
-        return {"name": "Constraints clauses", "children": self.visit_children(node)}
+    @fold
+    def visit_constraints_clauses(self, node: "ASTConstraintsClausesNode", results: List):
+        return {"name": "Constraints clauses", "children": self.visit_children(node, results)}
 
-    def visit_constraints(self, node: "ASTConstraintsNode"):
-        return {"name": "Constraints", "children": self.visit_children(node)}
+    @fold
+    def visit_constraints(self, node: "ASTConstraintsNode", results: List):
+        return {"name": "Constraints", "children": self.visit_children(node, results)}
 
-    def visit_namespace_declaration(self, node: "ASTNamespaceDeclarationNode"):
-        return {"name": "Namespace declaration", "children": self.visit_children(node)}
+    @fold
+    def visit_namespace_declaration(self, node: "ASTNamespaceDeclarationNode", results: List):
+        return {"name": "Namespace declaration", "children": self.visit_children(node, results)}
 
-    def visit_switch_statement(self, node: "ASTSwitchStatementNode"):
-        return {"name": "Switch statement", "children": self.visit_children(node)}
+    @fold
+    def visit_switch_statement(self, node: "ASTSwitchStatementNode", results: List):
+        return {"name": "Switch statement", "children": self.visit_children(node, results)}
 
-    def visit_jump_statement(self, node: "ASTJumpStatementNode"):
-        return {"name": "Jump statement", "children": self.visit_children(node)}
+    @fold
+    def visit_jump_statement(self, node: "ASTJumpStatementNode", results: List):
+        return {"name": "Jump statement", "children": self.visit_children(node, results)}
 
-    def visit_lock_statement(self, node: "ASTLockStatementNode"):
-        return {"name": "Lock statement", "children": self.visit_children(node)}
+    @fold
+    def visit_lock_statement(self, node: "ASTLockStatementNode", results: List):
+        return {"name": "Lock statement", "children": self.visit_children(node, results)}
 
-    def visit_extern_alias_directive(self, node: "ASTExternAliasDirectiveNode"):
-        return {"name": "Extern aliasd directive", "children": self.visit_children(node)}
+    @fold
+    def visit_extern_alias_directive(self, node: "ASTExternAliasDirectiveNode", results: List):
+        return {"name": "Extern aliasd directive", "children": self.visit_children(node, results)}
 
-    def visit_constant_declaration(self, node: "ASTConstantDeclarationNode"):
-        return {"name": "Constant declaration", "children": self.visit_children(node)}
+    @fold
+    def visit_constant_declaration(self, node: "ASTConstantDeclarationNode", results: List):
+        return {"name": "Constant declaration", "children": self.visit_children(node, results)}
 
-    def visit_definition(self, node: "ASTDefinitionNode"):
-        return {"name": "Definition", "children": self.visit_children(node)}
+    @fold
+    def visit_definition(self, node: "ASTDefinitionNode", results: List):
+        return {"name": "Definition", "children": self.visit_children(node, results)}
 
-    def visit_event_definition(self, node: "ASTEventDefinitionNode"):
-        return {"name": "Event definition", "children": self.visit_children(node)}
+    @fold
+    def visit_event_definition(self, node: "ASTEventDefinitionNode", results: List):
+        return {"name": "Event definition", "children": self.visit_children(node, results)}
 
-    def visit_conversion_operator_definition(self, node: "ASTConversionOperatorDefinitionNode"):
-        return {"name": "Conversion operator definition", "children": self.visit_children(node)}
+    @fold
+    def visit_conversion_operator_definition(self, node: "ASTConversionOperatorDefinitionNode", results: List):
+        return {"name": "Conversion operator definition", "children": self.visit_children(node, results)}
 
-    def visit_constructor_definition(self, node: "ASTConstructorDefinitionNode"):
-        return {"name": "Constructor definition", "children": self.visit_children(node)}
+    @fold
+    def visit_constructor_definition(self, node: "ASTConstructorDefinitionNode", results: List):
+        return {"name": "Constructor definition", "children": self.visit_children(node, results)}
 
-    def visit_destructor_definition(self, node: "ASTDestructorDefinitionNode"):
-        return {"name": "Destructor definition", "children": self.visit_children(node)}
+    @fold
+    def visit_destructor_definition(self, node: "ASTDestructorDefinitionNode", results: List):
+        return {"name": "Destructor definition", "children": self.visit_children(node, results)}
 
-    def visit_accessor_definition(self, node: "ASTAccessorDefinitionNode"):
-        return {"name": "Accessor definition", "children": self.visit_children(node)}
+    @fold
+    def visit_accessor_definition(self, node: "ASTAccessorDefinitionNode", results: List):
+        return {"name": "Accessor definition", "children": self.visit_children(node, results)}
 
-    def visit_struct_definition(self, node: "ASTStructDefinitionNode"):
-        return {"name": "Struct definition", "children": self.visit_children(node)}
+    @fold
+    def visit_struct_definition(self, node: "ASTStructDefinitionNode", results: List):
+        return {"name": "Struct definition", "children": self.visit_children(node, results)}
 
-    def visit_interface_definition(self, node: "ASTInterfaceDefinitionNode"):
-        return {"name": "Interface definition", "children": self.visit_children(node)}
+    @fold
+    def visit_interface_definition(self, node: "ASTInterfaceDefinitionNode", results: List):
+        return {"name": "Interface definition", "children": self.visit_children(node, results)}
 
-    def visit_property_definition(self, node: "ASTPropertyDefinitionNode"):
-        return {"name": "Property definition", "children": self.visit_children(node)}
+    @fold
+    def visit_property_definition(self, node: "ASTPropertyDefinitionNode", results: List):
+        return {"name": "Property definition", "children": self.visit_children(node, results)}
 
-    def visit_enum_definition(self, node: "ASTEnumDefinitionNode"):
-        return {"name": "Enum definition", "children": self.visit_children(node)}
+    @fold
+    def visit_enum_definition(self, node: "ASTEnumDefinitionNode", results: List):
+        return {"name": "Enum definition", "children": self.visit_children(node, results)}
 
-    def visit_delegate_definition(self, node: "ASTDelegateDefinitionNode"):
-        return {"name": "Delegate definition", "children": self.visit_children(node)}
+    @fold
+    def visit_delegate_definition(self, node: "ASTDelegateDefinitionNode", results: List):
+        return {"name": "Delegate definition", "children": self.visit_children(node, results)}
 
-    def visit_indexer_definition(self, node: "ASTIndexerDefinitionNode"):
-        return {"name": "Indexer definition", "children": self.visit_children(node)}
+    @fold
+    def visit_indexer_definition(self, node: "ASTIndexerDefinitionNode", results: List):
+        return {"name": "Indexer definition", "children": self.visit_children(node, results)}
 
-    def visit_operator_overload_definition(self, node: "ASTOperatorOverloadDefinitionNode"):
-        return {"name": "Operator overload definition", "children": self.visit_children(node)}
+    @fold
+    def visit_operator_overload_definition(self, node: "ASTOperatorOverloadDefinitionNode", results: List):
+        return {"name": "Operator overload definition", "children": self.visit_children(node, results)}
 
-    def visit_fixed_size_buffer_definition(self, node: "ASTFixedSizeBufferDefinitionNode"):
-        return {"name": "Fixed size buffer definition", "children": self.visit_children(node)}
+    @fold
+    def visit_fixed_size_buffer_definition(self, node: "ASTFixedSizeBufferDefinitionNode", results: List):
+        return {"name": "Fixed size buffer definition", "children": self.visit_children(node, results)}
 
-    def visit_positional_only_parameter(self, node: "ASTPositionalOnlyParameterNode"):
-        return {"name": "Positional-only parameter", "children": self.visit_children(node)}
+    @fold
+    def visit_positional_only_parameter(self, node: "ASTPositionalOnlyParameterNode", results: List):
+        return {"name": "Positional-only parameter", "children": self.visit_children(node, results)}
 
-    def visit_keyword_only_parameter(self, node: "ASTKeywordOnlyParameterNode"):
-        return {"name": "Keyword-only parameter", "children": self.visit_children(node)}
+    @fold
+    def visit_keyword_only_parameter(self, node: "ASTKeywordOnlyParameterNode", results: List):
+        return {"name": "Keyword-only parameter", "children": self.visit_children(node, results)}
 
-    def visit_conditional_expression(self, node: "ASTConditionalExpressionNode"):
-        return {"name": "Conditional expression", "children": self.visit_children(node)}
+    @fold
+    def visit_conditional_expression(self, node: "ASTConditionalExpressionNode", results: List):
+        return {"name": "Conditional expression", "children": self.visit_children(node, results)}
 
-    def visit_null_coalescing_expression(self, node: "ASTNullCoalescingExpressionNode"):
-        return {"name": "Null-coalescing expression", "children": self.visit_children(node)}
+    @fold
+    def visit_null_coalescing_expression(self, node: "ASTNullCoalescingExpressionNode", results: List):
+        return {"name": "Null-coalescing expression", "children": self.visit_children(node, results)}
 
-    def visit_type_cast(self, node: "ASTTypeCastNode"):
-        return {"name": "Type case", "children": self.visit_children(node)}
+    @fold
+    def visit_type_cast(self, node: "ASTTypeCastNode", results: List):
+        return {"name": "Type case", "children": self.visit_children(node, results)}
 
-    def visit_type(self, node: "ASTTypeNode"):
-        return {"name": "Type", "children": self.visit_children(node)}
+    @fold
+    def visit_type(self, node: "ASTTypeNode", results: List):
+        return {"name": "Type", "children": self.visit_children(node, results)}
 
-    def visit_object_creation(self, node: "ASTObjectCreationNode"):
-        return {"name": "Object creation", "children": self.visit_children(node)}
+    @fold
+    def visit_object_creation(self, node: "ASTObjectCreationNode", results: List):
+        return {"name": "Object creation", "children": self.visit_children(node, results)}
 
-    def visit_array_creation(self, node: "ASTArrayCreationNode"):
-        return {"name": "Array creation", "children": self.visit_children(node)}
+    @fold
+    def visit_array_creation(self, node: "ASTArrayCreationNode", results: List):
+        return {"name": "Array creation", "children": self.visit_children(node, results)}
 
-    def visit_initializer(self, node: "ASTInitializerNode"):
-        return {"name": "Initializer", "children": self.visit_children(node)}
+    @fold
+    def visit_initializer(self, node: "ASTInitializerNode", results: List):
+        return {"name": "Initializer", "children": self.visit_children(node, results)}
 
-    def visit_query(self, node: "ASTQueryNode"):
-        return {"name": "Query", "children": self.visit_children(node)}
+    @fold
+    def visit_query(self, node: "ASTQueryNode", results: List):
+        return {"name": "Query", "children": self.visit_children(node, results)}
 
-    def visit_from_clause(self, node: "ASTFromClauseNode"):
-        return {"name": "From clause", "children": self.visit_children(node)}
+    @fold
+    def visit_from_clause(self, node: "ASTFromClauseNode", results: List):
+        return {"name": "From clause", "children": self.visit_children(node, results)}
 
-    def visit_let_clause(self, node: "ASTLetClauseNode"):
-        return {"name": "Let clause", "children": self.visit_children(node)}
+    @fold
+    def visit_let_clause(self, node: "ASTLetClauseNode", results: List):
+        return {"name": "Let clause", "children": self.visit_children(node, results)}
 
-    def visit_where_clause(self, node: "ASTWhereClauseNode"):
-        return {"name": "Where clause", "children": self.visit_children(node)}
+    @fold
+    def visit_where_clause(self, node: "ASTWhereClauseNode", results: List):
+        return {"name": "Where clause", "children": self.visit_children(node, results)}
 
-    def visit_join_clause(self, node: "ASTJoinClauseNode"):
-        return {"name": "Join clause", "children": self.visit_children(node)}
+    @fold
+    def visit_join_clause(self, node: "ASTJoinClauseNode", results: List):
+        return {"name": "Join clause", "children": self.visit_children(node, results)}
 
-    def visit_order_by_clause(self, node: "ASTOrderByClauseNode"):
-        return {"name": "Order-by clause", "children": self.visit_children(node)}
+    @fold
+    def visit_order_by_clause(self, node: "ASTOrderByClauseNode", results: List):
+        return {"name": "Order-by clause", "children": self.visit_children(node, results)}
 
-    def visit_ordering(self, node: "ASTOrderingNode"):
-        return {"name": "Ordering", "children": self.visit_children(node)}
+    @fold
+    def visit_ordering(self, node: "ASTOrderingNode", results: List):
+        return {"name": "Ordering", "children": self.visit_children(node, results)}
 
-    def visit_select_clause(self, node: "ASTSelectClauseNode"):
-        return {"name": "Select clause", "children": self.visit_children(node)}
+    @fold
+    def visit_select_clause(self, node: "ASTSelectClauseNode", results: List):
+        return {"name": "Select clause", "children": self.visit_children(node, results)}
 
-    def visit_group_by_clause(self, node: "ASTGroupByClauseNode"):
-        return {"name": "Group-by clause", "children": self.visit_children(node)}
+    @fold
+    def visit_group_by_clause(self, node: "ASTGroupByClauseNode", results: List):
+        return {"name": "Group-by clause", "children": self.visit_children(node, results)}
 
-    def visit_into_clause(self, node: "ASTIntoClauseNode"):
-        return {"name": "Into clause", "children": self.visit_children(node)}
+    @fold
+    def visit_into_clause(self, node: "ASTIntoClauseNode", results: List):
+        return {"name": "Into clause", "children": self.visit_children(node, results)}
 
-    def visit_label(self, node: "ASTLabelNode"):
-        return {"name": "Label", "children": self.visit_children(node)}
+    @fold
+    def visit_label(self, node: "ASTLabelNode", results: List):
+        return {"name": "Label", "children": self.visit_children(node, results)}
 
-    def visit_switch_section(self, node: "ASTSwitchSectionNode"):
-        return {"name": "Switch section", "children": self.visit_children(node)}
+    @fold
+    def visit_switch_section(self, node: "ASTSwitchSectionNode", results: List):
+        return {"name": "Switch section", "children": self.visit_children(node, results)}
 
-    def visit_case_label(self, node: "ASTCaseLabelNode"):
-        return {"name": "Case label", "children": self.visit_children(node)}
+    @fold
+    def visit_case_label(self, node: "ASTCaseLabelNode", results: List):
+        return {"name": "Case label", "children": self.visit_children(node, results)}
 
-    def visit_default_label(self, node: "ASTDefaultLabelNode"):
-        return {"name": "Default label", "children": self.visit_children(node)}
+    @fold
+    def visit_default_label(self, node: "ASTDefaultLabelNode", results: List):
+        return {"name": "Default label", "children": self.visit_children(node, results)}
 
-    def visit_attribute_section(self, node: "ASTAttributeSectionNode"):
-        return {"name": "Attribute section", "children": self.visit_children(node)}
+    @fold
+    def visit_attribute_section(self, node: "ASTAttributeSectionNode", results: List):
+        return {"name": "Attribute section", "children": self.visit_children(node, results)}
 
-    def visit_attribute(self, node: "ASTAttributeNode"):
-        return {"name": "Attribute", "children": self.visit_children(node)}
+    @fold
+    def visit_attribute(self, node: "ASTAttributeNode", results: List):
+        return {"name": "Attribute", "children": self.visit_children(node, results)}
 
-    def visit_pointer_type(self, node: "ASTPointerTypeNode"):
-        return {"name": "Pointer type", "children": self.visit_children(node)}
+    @fold
+    def visit_pointer_type(self, node: "ASTPointerTypeNode", results: List):
+        return {"name": "Pointer type", "children": self.visit_children(node, results)}
 
-    def visit_nullable_type(self, node: "ASTNullableTypeNode"):
-        return {"name": "Nullable type", "children": self.visit_children(node)}
+    @fold
+    def visit_nullable_type(self, node: "ASTNullableTypeNode", results: List):
+        return {"name": "Nullable type", "children": self.visit_children(node, results)}
 
-    def visit_array_type(self, node: "ASTArrayTypeNode"):
-        return {"name": "Array type", "children": self.visit_children(node)}
+    @fold
+    def visit_array_type(self, node: "ASTArrayTypeNode", results: List):
+        return {"name": "Array type", "children": self.visit_children(node, results)}
 
-    def visit_constraints_clause(self, node: "ASTConstraintsClauseNode"):
-        return {"name": "Constraints clause", "children": self.visit_children(node)}
+    @fold
+    def visit_constraints_clause(self, node: "ASTConstraintsClauseNode", results: List):
+        return {"name": "Constraints clause", "children": self.visit_children(node, results)}
 
-    def visit_stack_allocation(self, node: "ASTStackAllocationNode"):
-        return {"name": "Stack allocation", "children": self.visit_children(node)}
+    @fold
+    def visit_stack_allocation(self, node: "ASTStackAllocationNode", results: List):
+        return {"name": "Stack allocation", "children": self.visit_children(node, results)}
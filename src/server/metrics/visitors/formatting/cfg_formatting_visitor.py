@@ -1,6 +1,6 @@
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Union
 
-from metrics.structures.cfg import CFGBlock
+from metrics.structures.compact_cfg import CompactCFG
 from metrics.visitors.base.cfg_visitor import CFGVisitor
 
 
@@ -12,72 +12,40 @@ class CFGFormattingVisitor(CFGVisitor):
     both formatted for front-end request response.
     """
 
-    def __init__(self):
+    def __init__(self, string_ids: bool = True):
         """
         CFG formatting visitor.
+
+        :param string_ids: Whether to format block ids as strings, rather than as ints.
         """
         super().__init__()
-        self._visited: Dict[CFGBlock, str] = {}
-        self.current_id: int = 1
-        self._blocks: List[Dict[str, str]] = []
-        self._links: List[Dict[str, str]] = []
+        self.string_ids = string_ids
+        self._blocks: List[Dict[str, Union[str, int]]] = []
+        self._links: List[Dict[str, Union[str, int]]] = []
 
-    def visit(self, tree) -> Tuple[List[Dict[str, str]], List[Dict[str, str]]]:
+    def visit(self, tree) -> Tuple[List[Dict[str, Union[str, int]]], List[Dict[str, Union[str, int]]]]:
         """
         Visit an CFG structure and return a list of classes and a list of links, formatted for front-end
         request response.
 
+        The CFG is converted into compact form (unless it already is one), whose blocks are numbered in the order they
+        are entered, so each block's id is its number plus one. Each block's links are added once all of its children
+        have been left.
+
         :param tree: The CFG to visit.
         :return: Formatted lists of classes and links respectively.
         """
-        self._visited = {}
-        self.current_id = 1
+        compact = CompactCFG.from_cfg(tree)
 
-        self._blocks = []
+        ids = [str(block + 1) if self.string_ids else block + 1 for block in range(len(compact))]
+
+        self._blocks = [{"id": id_} for id_ in ids]
         self._links = []
 
-        tree.accept(self)
+        for block, entering in compact.iter_depth_first():
+            if not entering:
+                id_ = ids[block]
+                for child in compact.successors(block):
+                    self._links.append({"source": id_, "target": ids[child]})
 
         return self._blocks, self._links
-
-    def visit_children(self, block) -> List:
-        """
-        Visit each of a block's children.
-
-        :param block: The parent block whose subclasses to visit.
-        :return: A list of the child blocks' ids.
-        """
-        results = []
-        if block.children:
-            for child in block.children.values():
-                result = child.accept(self) if child is not None else None
-                if result:
-                    if isinstance(result, list):
-                        results.extend(result)
-                    else:
-                        results.append(result)
-        return results
-
-    def visit_block(self, block) -> str:
-        """
-        Visit a block.
-
-        If the block has not yet been visited, add it to visited, add it to blocks and add its child links.
-
-        :param block: The block to visit.
-        :return: The block's id.
-        """
-        if block in self._visited:
-            return self._visited[block]
-        else:
-            id_ = str(self.current_id)
-            self.current_id += 1
-
-            self._visited[block] = id_
-
-            self._blocks.append({"id": id_})
-
-            for child_id in self.visit_children(block):
-                self._links.append({"source": id_, "target": child_id})
-
-            return id_
@@ -27,39 +27,21 @@ class InheritanceTreeFormattingVisitor(InheritanceTreeVisitor):
         :param tree: The inheritance tree to visit.
         :return: Formatted lists of classes and links respectively.
         """
-        self._visited = []
         self._classes = []
         self._links = []
 
-        tree.accept(self)
+        super().visit(tree)
 
         return self._classes, self._links
 
-    def visit_children(self, cls) -> None:
-        """
-        Visit each of a class' subclasses.
-
-        :param cls: The parent class whose subclasses to visit.
-        """
-        if cls.subclasses:
-            for subclass in cls.subclasses:
-                subclass.accept(self)
-
     def visit_class(self, cls) -> None:
         """
-        Visit a class.
-
-        If the class has not yet been visited, add it to visited, add it to classes and add its subclass links.
+        Visit a class, adding it to classes and adding its subclass links.
 
         :param cls: The class to visit.
         """
-        if cls not in self._visited:
-            self._visited.append(cls)
-
-            self._classes.append({"id": cls.name})
-
-            if cls.subclasses:
-                for subclass in cls.subclasses:
-                    self._links.append({"source": cls.name, "target": subclass.name})
+        self._classes.append({"id": cls.name})
 
-            self.visit_children(cls)
+        if cls.subclasses:
+            for subclass in cls.subclasses:
+                self._links.append({"source": cls.name, "target": subclass.name})
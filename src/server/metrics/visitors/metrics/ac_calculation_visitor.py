@@ -15,48 +15,29 @@ class ACCalculationVisitor(DependencyGraphVisitor):
 
     def __init__(self):
         super().__init__()
-        self._visited = []
         self.afferent_couplings = {}
 
     def visit(self, graph) -> Dict[Class, int]:
-        self._visited = []
+        self.reset_visited()
         self.afferent_couplings = {}
         for cls in graph.classes:
             for node in cls:
                 self.afferent_couplings[node] = 0
 
-        copy = {}
-        while copy != self.afferent_couplings:
-            copy = self.afferent_couplings.copy()
-            for cls in copy:
-                cls.accept(self)
+        for cls in self.iter_preorder(*self.afferent_couplings):
+            cls.accept(self)
 
         return self.afferent_couplings
 
-    def visit_children(self, cls) -> None:
-        """
-        Visit each of a class' dependencies.
-
-        :param cls: The parent class whose dependencies to visit.
-        """
-        if cls.dependencies:
-            for dependency in cls.dependencies:
-                dependency.accept(self)
-
     def visit_class(self, cls) -> None:
         """
         Visit dependency graph generic class and update afferent couplings.
 
         :param cls: The generic class.
         """
-        if cls not in self._visited:
-            self._visited.append(cls)
-
-            if cls.dependencies:
-                for dependency in cls.dependencies:
-                    if dependency in self.afferent_couplings:
-                        self.afferent_couplings[dependency] += 1
-                    else:
-                        self.afferent_couplings[dependency] = 1
-
-            self.visit_children(cls)
+        if cls.dependencies:
+            for dependency in cls.dependencies:
+                if dependency in self.afferent_couplings:
+                    self.afferent_couplings[dependency] += 1
+                else:
+                    self.afferent_couplings[dependency] = 1
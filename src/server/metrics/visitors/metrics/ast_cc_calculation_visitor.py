@@ -0,0 +1,121 @@
+from typing import Dict, Mapping, Optional
+
+from metrics.structures.ast import ASTNode, ASTIfStatementNode, ASTLoopStatementNode, ASTCatchNode, ASTCaseLabelNode, \
+    ASTBinaryOperationNode, ASTConditionalExpressionNode, ASTJumpStatementNode, ASTLogicalOperation
+from metrics.visitors.base.ast_visitor import ASTVisitor
+from metrics.visitors.structures.function_cfg_generation_visitor import FUNCTION_TYPES
+
+
+class ASTCCCalculationVisitor(ASTVisitor):
+    """
+    Abstract syntax tree visitor for calculating extended cyclomatic complexity.
+
+    Provides functionality for visiting an abstract syntax tree and returning its extended cyclomatic complexity by
+    counting decision points, without building a control-flow graph:
+
+    CC = D + 1
+
+    Where D = the number of if statements, loop statements, catch clauses, switch case labels, short-circuit logical
+    operations and conditional expressions.
+
+    The decision points are found through the AST's index, and each is visited on its own, returning its weight, so the
+    rest of the tree is never walked.
+
+    Extended cyclomatic complexity is a different metric from the one CCCalculationVisitor calculates, not a faster
+    drop-in for it: the control-flow graph only branches at if and loop statements. On code without breaks and
+    continues, this visitor's value is the control-flow graph's plus one for each catch clause, switch case label,
+    short-circuit logical operation and conditional expression, e.g. 3 rather than 2 for `if a and b`. Breaks and
+    continues add edges to the control-flow graph that are not counted here.
+    """
+
+    interesting_kinds = (ASTIfStatementNode, ASTLoopStatementNode, ASTCatchNode, ASTCaseLabelNode,
+                         ASTBinaryOperationNode, ASTConditionalExpressionNode)
+
+    def visit(self, ast) -> Optional[int]:
+        """
+        Visit an AST structure and return its cyclomatic complexity.
+
+        :param ast: The AST to visit.
+        :return: The cyclomatic complexity of the AST.
+        """
+        return 1 + sum(self.dispatch(node) for node in ast.find_all(*self.interesting_kinds))
+
+    def visit_functions(self, ast, functions: Mapping[str, ASTNode]) -> Dict[str, int]:
+        """
+        Visit an AST structure and return the cyclomatic complexity of each of its functions, counting each decision
+        point towards the function most closely enclosing it only.
+
+        :param ast: The AST to visit.
+        :param functions: Mapping of each function's qualified name to its definition node, e.g. from FunctionCFGs.
+        :return: The cyclomatic complexity of each function, keyed by qualified name.
+        """
+        complexities = {id(node): 1 for node in functions.values()}
+
+        for node in ast.find_all(*self.interesting_kinds):
+            for ancestor in node.iter_ancestors():
+                if isinstance(ancestor, FUNCTION_TYPES):
+                    if id(ancestor) in complexities:
+                        complexities[id(ancestor)] += self.dispatch(node)
+                    break
+
+        return {name: complexities[id(node)] for name, node in functions.items()}
+
+    @staticmethod
+    def visit_if_statement(node) -> int:
+        """
+        Visit AST if statement node.
+
+        :param node: The AST if statement node to visit.
+        :return: 1.
+        """
+        return 1
+
+    @staticmethod
+    def visit_loop_statement(node) -> int:
+        """
+        Visit AST loop statement node.
+
+        :param node: The AST loop statement node to visit.
+        :return: 1.
+        """
+        return 1
+
+    @staticmethod
+    def visit_catch(node) -> int:
+        """
+        Visit AST catch node.
+
+        :param node: The AST catch node to visit.
+        :return: 1.
+        """
+        return 1
+
+    @staticmethod
+    def visit_case_label(node) -> int:
+        """
+        Visit AST case label node.
+
+        :param node: The AST case label node to visit.
+        :return: 1 for the label of a switch section. 0 for the target of a jump (e.g. goto case).
+        """
+        return 0 if isinstance(node.parent, ASTJumpStatementNode) else 1
+
+    @staticmethod
+    def visit_binary_operation(node) -> int:
+        """
+        Visit AST binary operation node.
+
+        :param node: The AST binary operation node to visit.
+        :return: 1 for a short-circuit logical operation. 0 otherwise.
+        """
+        return 1 if isinstance(node.operation, ASTLogicalOperation) else 0
+
+    @staticmethod
+    def visit_conditional_expression(node) -> int:
+        """
+        Visit AST conditional expression node.
+
+        :param node: The AST conditional expression node to visit.
+        :return: 1.
+        """
+        return 1
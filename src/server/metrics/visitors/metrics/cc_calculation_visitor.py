@@ -1,5 +1,6 @@
 from typing import TYPE_CHECKING
 
+from metrics.structures.compact_cfg import CompactCFG
 from metrics.visitors.base.cfg_visitor import CFGVisitor
 
 if TYPE_CHECKING:
@@ -20,49 +21,19 @@ class CCCalculationVisitor(CFGVisitor):
 
     """
 
-    def __init__(self):
-        self._node_count = 0
-        self._edge_count = 0
-        super().__init__()
-
     def visit(self, cfg):
         """
         Visit a CFG structure and return its cyclomatic complexity.
+
+        The CFG is converted into compact form (unless it already is one), in which the numbers of edges and basic
+        blocks are the lengths of its edge and block arrays.
+
         :param cfg: The CFG to visit.
-        :type cfg: CFG
+        :type cfg: CFG or CompactCFG
         :return: The cyclomatic complexity of the CFG.
         :rtype: int
         """
-        self._node_count = 0
-        self._edge_count = 0
-        self._visited = []
-
-        cfg.accept(self)
-
-        if self._node_count:
-            return self._edge_count - self._node_count + 2
-
-    def visit_children(self, block):
-        """
-        Visit each of a block's children.
-        :param block: The parent block whose children to visit.
-        :type block: CFGBlock
-        """
-        for child in block.children.values():
-            if child is not None:
-                child.accept(self)
-
-    def visit_block(self, block):
-        """
-        Visit a CFG basic block, adding to _node_count and _edge_count accordingly and visiting its children if
-        the block has not been visited before.
-        :param block: The CFG basic block to visit.
-        :type block: CFGBlock
-        """
-        if block not in self._visited:
-            self._visited.append(block)
-
-            self._node_count += 1
-            self._edge_count += len([child for child in block.children.values() if child is not None])
+        compact = CompactCFG.from_cfg(cfg)
 
-            self.visit_children(block)
+        if len(compact):
+            return compact.edge_count - len(compact) + 2
@@ -14,44 +14,25 @@ class ECCalculationVisitor(DependencyGraphVisitor):
 
     def __init__(self):
         super().__init__()
-        self._visited = []
         self.efferent_couplings = {}
 
     def visit(self, graph) -> Dict[Class, int]:
-        self._visited = []
+        self.reset_visited()
         self.efferent_couplings = {}
         for cls in graph.classes:
             for node in cls:
                 self.efferent_couplings[node] = 0
 
-        copy = {}
-        while copy != self.efferent_couplings:
-            copy = self.efferent_couplings.copy()
-            for cls in copy:
-                cls.accept(self)
+        for cls in self.iter_preorder(*self.efferent_couplings):
+            cls.accept(self)
 
         return self.efferent_couplings
 
-    def visit_children(self, cls) -> None:
-        """
-        Visit each of a class' dependencies.
-
-        :param cls: The parent class whose dependencies to visit.
-        """
-        if cls.dependencies:
-            for dependency in cls.dependencies:
-                dependency.accept(self)
-
     def visit_class(self, cls) -> None:
         """
         Visit dependency graph generic class and update efferent couplings.
 
         :param cls: The generic class.
         """
-        if cls not in self._visited:
-            self._visited.append(cls)
-
-            if cls.dependencies:
-                self.efferent_couplings[cls] = len(cls.dependencies)
-
-            self.visit_children(cls)
+        if cls.dependencies:
+            self.efferent_couplings[cls] = len(cls.dependencies)
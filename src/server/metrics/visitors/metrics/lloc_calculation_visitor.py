@@ -1,4 +1,8 @@
-from metrics.visitors.base.ast_visitor import ASTVisitor
+from typing import Optional
+
+from metrics.structures.ast import ASTDefinitionNode, ASTStatementNode
+from metrics.visitors.base.ast_visitor import ASTVisitor, fold
+from metrics.visitors.base.memo_table import MemoTable
 
 
 class LLOCCalculationVisitor(ASTVisitor):
@@ -7,16 +11,33 @@ class LLOCCalculationVisitor(ASTVisitor):
 
     Provides functionality for visiting an abstract syntax tree and returning the number of
     logical lines of code (i.e. the number of statements) present.
+
+    Results for definitions can be memoized by structural hash, so repeated definitions are not re-walked, and
+    subtrees without statements, e.g. most expressions, are skipped.
     """
 
-    def visit_children(self, node) -> int:
+    memoized_types = (ASTDefinitionNode,)
+    interesting_kinds = (ASTStatementNode,)
+
+    def __init__(self, memo_table: Optional[MemoTable] = None):
+        """
+        Logical lines of code calculation visitor.
+
+        :param memo_table: Table to reuse the results for definitions of earlier visits from, keyed by structural hash.
+        None visits every definition afresh.
+        """
+        self.memo_table = memo_table
+
+    @fold
+    def visit_children(self, node, results) -> int:
         """
         Visit each of an AST node's children and return the number of statements in the node's subtree.
 
         :param node: The parent AST node whose children to visit.
+        :param results: The number of statements in each child's subtree.
         :return: The number of statements in the node's subtree.
         """
-        return sum([child.accept(self) for child in node.children.values() if child is not None])
+        return sum(results)
 
     @staticmethod
     def visit_identifier(node) -> int:
@@ -37,10 +58,12 @@ class LLOCCalculationVisitor(ASTVisitor):
         """
         return 0
 
-    def visit_statement(self, node) -> int:
+    @fold
+    def visit_statement(self, node, results) -> int:
         """
         Visit AST statement node.
         :param node: The AST statement node to visit.
+        :param results: The number of statements in each child's subtree.
         :return: 1 + the number of statements in the statement's subtree.
         """
-        return 1 + self.visit_children(node)
+        return 1 + self.visit_children(node, results)
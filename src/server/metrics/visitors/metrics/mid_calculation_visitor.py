@@ -1,3 +1,5 @@
+from typing import Dict, Optional
+
 from metrics.visitors.base.inheritance_tree_visitor import InheritanceTreeVisitor
 
 
@@ -7,23 +9,32 @@ class MIDCalculationVisitor(InheritanceTreeVisitor):
 
     Provides functionality for visiting an inheritance tree and returning its maximum inheritance depth, i.e. the
     maximum path length from any class to the base.
+
+    Classes are visited in post-order, so each class' subclasses have their depths calculated before it.
     """
 
     def __init__(self):
-        self._visited = {}
         super().__init__()
+        self._depths: Dict[int, int] = {}
+
+    def visit(self, tree) -> Optional[int]:
+        self.reset_visited()
+        self._depths = {}
+
+        if tree.base is None:
+            return None
+
+        for cls in self.iter_postorder(tree.base):
+            cls.accept(self)
 
-    def visit(self, tree) -> int:
-        self._visited = {}
-        return tree.accept(self)
+        return self._depths[id(tree.base)]
 
     def visit_children(self, cls) -> int:
         if cls.subclasses:
-            return max([subclass.accept(self) for subclass in cls.subclasses])
+            return max([self._depths.get(id(subclass), 0) for subclass in cls.subclasses])
 
         return 0
 
     def visit_class(self, cls) -> int:
-        if cls not in self._visited:
-            self._visited[cls] = 1 + self.visit_children(cls)
-        return self._visited[cls]
+        self._depths[id(cls)] = 1 + self.visit_children(cls)
+        return self._depths[id(cls)]
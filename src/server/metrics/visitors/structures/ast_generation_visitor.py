@@ -80,8 +80,13 @@ class ASTGenerationVisitor(ParseTreeVisitor):
         if len(sequence) == 1:
             return sequence[0]
 
-        # noinspection PyArgumentList
-        return parent_node(sequence[0], self.build_right_associated(sequence[1:], parent_node))
+        # Built from the innermost node outwards, as deep chains would overflow the recursion limit.
+        node = sequence[-1]
+        for left in reversed(sequence[:-1]):
+            # noinspection PyArgumentList
+            node = parent_node(left, node)
+
+        return node
 
     def build_left_associated(self, sequence: Optional[Sequence[ASTNode]], parent_node: Type[ASTNode]):
         """
@@ -98,8 +103,13 @@ class ASTGenerationVisitor(ParseTreeVisitor):
         if len(sequence) == 1:
             return sequence[0]
 
-        # noinspection PyArgumentList
-        return parent_node(self.build_right_associated(sequence[:-1], parent_node), sequence[-1])
+        # Built from the innermost node outwards, as deep chains would overflow the recursion limit.
+        node = sequence[0]
+        for right in sequence[1:]:
+            # noinspection PyArgumentList
+            node = parent_node(node, right)
+
+        return node
 
     def build_bin_op(self, operation: ASTOperation, expressions: Optional[Sequence[ASTNode]]):
         """
@@ -116,7 +126,11 @@ class ASTGenerationVisitor(ParseTreeVisitor):
         if len(expressions) == 1:
             return expressions[0]
 
-        return ASTBinaryOperationNode(operation, self.build_bin_op(operation, expressions[:-1]), expressions[-1])
+        node = expressions[0]
+        for right in expressions[1:]:
+            node = ASTBinaryOperationNode(operation, node, right)
+
+        return node
 
     def build_bin_op_choice(self, children: Optional[Sequence]) -> Optional[ASTNode]:
         """
@@ -132,14 +146,16 @@ class ASTGenerationVisitor(ParseTreeVisitor):
         if len(children) == 1:
             return children[0]
 
-        operator = children[-2]
-        if isinstance(operator, list):
-            return ASTUnaryOperationNode(operator[0],
-                                         ASTBinaryOperationNode(operator[1],
-                                                                self.build_bin_op_choice(children[:-2]),
-                                                                children[-1]))
+        # Operators and operands alternate, so an even length means the leftmost operand is missing.
+        node = self.defaultResult() if len(children) % 2 == 0 else children[0]
+        for i in range(len(children) % 2, len(children), 2):
+            operator, right = children[i], children[i + 1]
+            if isinstance(operator, list):
+                node = ASTUnaryOperationNode(operator[0], ASTBinaryOperationNode(operator[1], node, right))
+            else:
+                node = ASTBinaryOperationNode(operator, node, right)
 
-        return ASTBinaryOperationNode(operator, self.build_bin_op_choice(children[:-2]), children[-1])
+        return node
 
     def build_bin_op_rassoc(self, operation: [ASTOperation],
                             expressions: Optional[Union[Sequence[ASTNode], ASTNode]]) -> Optional[ASTNode]:
@@ -157,8 +173,11 @@ class ASTGenerationVisitor(ParseTreeVisitor):
         if len(expressions) == 1:
             return expressions[0]
 
-        return ASTBinaryOperationNode(operation, expressions[0],
-                                      self.build_bin_op_rassoc(operation, expressions[1:]))
+        node = expressions[-1]
+        for left in reversed(expressions[:-1]):
+            node = ASTBinaryOperationNode(operation, left, node)
+
+        return node
 
     @staticmethod
     def filter_child(child, *contexts):
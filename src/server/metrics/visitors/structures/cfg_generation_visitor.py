@@ -1,8 +1,10 @@
-from typing import Optional, Sequence, Union
+from typing import List, Optional, Sequence, Union
 
+from metrics.structures.ast import ASTIfStatementNode, ASTLoopStatementNode, ASTBreakStatementNode, \
+    ASTContinueStatementNode
 from metrics.structures.cfg import CFG, CFGBlock, CFGIfBlock, CFGIfElseBlock, CFGLoopBlock, CFGLoopElseBlock, \
     CFGBreakBlock, CFGContinueBlock
-from metrics.visitors.base.ast_visitor import ASTVisitor
+from metrics.visitors.base.ast_visitor import ASTVisitor, fold
 
 
 class CFGGenerationVisitor(ASTVisitor):
@@ -10,8 +12,12 @@ class CFGGenerationVisitor(ASTVisitor):
     Control-flow graph generation visitor.
 
     Provides functionality for visiting an abstract syntax tree and generating the corresponding control-flow graph.
+
+    Only control-flow statements produce blocks, so subtrees without any are skipped.
     """
 
+    interesting_kinds = (ASTIfStatementNode, ASTLoopStatementNode, ASTBreakStatementNode, ASTContinueStatementNode)
+
     def __init__(self):
         """
         Control-flow graph generation visitor.
@@ -24,6 +30,9 @@ class CFGGenerationVisitor(ASTVisitor):
         """
         Build sequence of blocks.
 
+        Blocks are linked from last to first, so each block is appended to its predecessor once the rest of the sequence
+        has been built.
+
         :param sequence: The list of blocks to build into a sequence.
         :return: The first node of the sequence with built sequence as its exit block.
         None if no/empty sequence supplied.
@@ -31,8 +40,8 @@ class CFGGenerationVisitor(ASTVisitor):
         if not sequence:
             return None
 
-        if len(sequence) > 1:
-            sequence[0].append(self.build_sequence(sequence[1:]))
+        for i in range(len(sequence) - 1, 0, -1):
+            sequence[i - 1].append(sequence[i])
 
         return sequence[0]
 
@@ -49,20 +58,16 @@ class CFGGenerationVisitor(ASTVisitor):
         """
         return CFG(CFGBlock({"exit_block": super().visit(ast)}))
 
-    def visit_children(self, node) -> Optional[CFGBlock]:
+    @fold
+    def visit_children(self, node, results: List) -> Optional[CFGBlock]:
         """
         Visit each of an AST node's children.
 
         :param node: The parent AST node whose children to visit.
+        :param results: The children's visit results, in order.
         :return: A built sequence of CFGNodes returned by visiting each child. None if no CFGNodes returned.
         """
-        sequence = []
-        for child in node.children.values():
-            child_result = child.accept(self) if child is not None else None
-            if isinstance(child_result, CFGBlock):
-                sequence.append(child_result)
-
-        return self.build_sequence(sequence)
+        return self.build_sequence([result for result in results if isinstance(result, CFGBlock)])
 
     def visit_break_statement(self, node) -> CFGBreakBlock:
         """
@@ -96,9 +101,9 @@ class CFGGenerationVisitor(ASTVisitor):
         :return: The corresponding CFG block.
         """
         if node["else_body"] is not None:
-            return CFGIfElseBlock(node["body"].accept(self), node["else_body"].accept(self))
+            return CFGIfElseBlock((yield node["body"]), (yield node["else_body"]))
 
-        return CFGIfBlock(node["body"].accept(self))
+        return CFGIfBlock((yield node["body"]))
 
     def visit_loop_statement(self, node) -> CFGLoopBlock:
         """
@@ -109,11 +114,11 @@ class CFGGenerationVisitor(ASTVisitor):
         outer_loop_scope = self.loop_scope
 
         if node["else_body"] is not None:
-            self.loop_scope = loop = CFGLoopElseBlock(fail_block=node["else_body"].accept(self))
+            self.loop_scope = loop = CFGLoopElseBlock(fail_block=(yield node["else_body"]))
         else:
             self.loop_scope = loop = CFGLoopBlock()
 
-        loop["success_block"] = node["body"].accept(self)
+        loop["success_block"] = yield node["body"]
         loop["success_block"].append(loop)
 
         self.loop_scope = outer_loop_scope
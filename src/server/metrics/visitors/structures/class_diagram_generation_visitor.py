@@ -1,8 +1,10 @@
-from typing import Dict
+from collections import deque
+from typing import Deque, Dict, Set, Tuple
 
-from metrics.structures.ast import ASTVisibilityModifier, ASTMiscModifier, ASTIdentifierNode
+from metrics.structures.ast import ASTVisibilityModifier, ASTMiscModifier, ASTIdentifierNode, ASTClassDefinitionNode, \
+    ASTInterfaceDefinitionNode, ASTFunctionDefinitionNode, ASTVariableDeclarationNode
 from metrics.structures.class_diagram import *
-from metrics.visitors.base.ast_visitor import ASTVisitor
+from metrics.visitors.base.ast_visitor import ASTVisitor, fold
 
 
 class ClassDiagramGenerationVisitor(ASTVisitor):
@@ -10,12 +12,29 @@ class ClassDiagramGenerationVisitor(ASTVisitor):
     Class diagram generation visitor.
 
     Provides functionality for visiting an abstract syntax tree and generating the corresponding class diagram.
+
+    Only definitions and declarations contribute to the diagram, so the outermost class and interface definitions are
+    visited straight from the AST's index, and subtrees without any definitions or declarations are skipped.
     """
 
+    interesting_kinds = (ASTClassDefinitionNode, ASTInterfaceDefinitionNode, ASTFunctionDefinitionNode,
+                         ASTVariableDeclarationNode)
+
     def __init__(self):
         self.classes: Dict[str, Class] = {}
         self.interfaces: Dict[str, Class] = {}
 
+        # Indices of the relationships created so far, so that each check for an existing relationship is a single
+        # lookup rather than a scan over the relationships of both classes. Classes are keyed by identity.
+        # (class, type, relation) -> the first such relationship of the class.
+        self.__relationships: Dict[Tuple[Class, RelationshipType, Class], Relationship] = {}
+        # (class, relation, relation role) of each association.
+        self.__associations: Set[Tuple[Class, Class, Optional[str]]] = set()
+        # (class, relation, role) of each bidirectional association.
+        self.__bidirectional: Set[Tuple[Class, Class, Optional[str]]] = set()
+        # (class, relation) -> the associations between the two that are not yet bidirectional, in order.
+        self.__unidirectional: Dict[Tuple[Class, Class], Deque[Relationship]] = {}
+
     def __create_relationships(self) -> None:
         """
         Iterate over the classes and store corresponding relationships based on attributes, method parameters and
@@ -28,8 +47,9 @@ class ClassDiagramGenerationVisitor(ASTVisitor):
                     self.__add_relationship(cls, self.interfaces[interface], RelationshipType.IMPLEMENTATION)
 
             # Inheritance
+            is_interface = self.interfaces.get(cls.name) is cls
             for superclass in cls.superclasses:
-                if superclass in self.classes or cls in self.interfaces.values():
+                if superclass in self.classes or is_interface:
                     self.__add_relationship(cls, self.classes[superclass], RelationshipType.INHERITANCE)
                 elif superclass in self.interfaces:
                     self.__add_relationship(cls, self.interfaces[superclass], RelationshipType.IMPLEMENTATION)
@@ -42,36 +62,29 @@ class ClassDiagramGenerationVisitor(ASTVisitor):
             # Association
             for attribute in cls.attributes:
                 if attribute.type in self.classes:
-                    relationship_type = RelationshipType.ASSOCIATION
                     relation = self.classes[attribute.type]
                     relation_role = attribute.name
 
-                    # Check if relationship already exists
-                    for relationship in cls.relationships:
-                        if relationship.type == relationship_type and relationship.relation == relation \
-                                and relationship.relation_role == relation_role:
-                            break
+                    # Check if relationship already exists, either way round
+                    if (cls, relation, relation_role) in self.__associations \
+                            or (relation, cls, relation_role) in self.__bidirectional:
+                        continue
+
+                    # Check if a relationship between the two classes already exists and update if one does.
+                    pending = self.__unidirectional.get((relation, cls))
+                    if pending:
+                        relationship = pending.popleft()
+                        relationship.bidirectional = True
+                        relationship.role = relation_role
+                        self.__bidirectional.add((relation, cls, relation_role))
                     else:
-                        for relationship in relation.relationships:
-                            # Check if relationship already exists as a bidirectional relationship.
-                            if relationship.type == relationship_type and relationship.relation == cls \
-                                    and relationship.role == relation_role and relationship.bidirectional:
-                                break
-                        else:
-                            for relationship in relation.relationships:
-                                # Check if a relationship between the two classes already exists and update if one does.
-                                if relationship.type == relationship_type and relationship.relation == cls \
-                                        and not relationship.bidirectional:
-                                    relationship.bidirectional = True
-                                    relationship.role = relation_role
-                                    break
-                            else:
-                                cls.relationships.append(Relationship(relationship_type, relation,
-                                                                      relation_role=relation_role))
+                        relationship = Relationship(RelationshipType.ASSOCIATION, relation, relation_role=relation_role)
+                        cls.relationships.append(relationship)
+                        self.__associations.add((cls, relation, relation_role))
+                        self.__unidirectional.setdefault((cls, relation), deque()).append(relationship)
 
             # Dependency
             for method in cls.methods:
-                relationship_type = RelationshipType.DEPENDENCY
                 relation = None
 
                 if method.return_type in self.classes:
@@ -83,17 +96,25 @@ class ClassDiagramGenerationVisitor(ASTVisitor):
                             break
 
                 if relation:
-                    cls.relationships.append(Relationship, relationship_type, relation)
+                    self.__add_relationship(cls, relation, RelationshipType.DEPENDENCY)
 
-    @staticmethod
-    def __add_relationship(cls: Class, relation: Class, relationship_type: RelationshipType) -> Relationship:
-        for relationship in cls.relationships:
-            if relationship.type == relationship_type and relationship.relation == relation:
-                return relationship
+    def __add_relationship(self, cls: Class, relation: Class, relationship_type: RelationshipType) -> Relationship:
+        """
+        Add a relationship between two classes, unless the class already has one of the same type to the relation.
+
+        :param cls: The class to add the relationship to.
+        :param relation: The class that the relationship is to.
+        :param relationship_type: The type of relationship.
+        :return: The class' relationship of the type to the relation.
+        """
+        key = (cls, relationship_type, relation)
+        relationship = self.__relationships.get(key)
+        if relationship is None:
+            relationship = Relationship(relationship_type, relation)
+            cls.relationships.append(relationship)
+            self.__relationships[key] = relationship
 
-        new_relationship = Relationship(relationship_type, relation)
-        cls.relationships.append(new_relationship)
-        return new_relationship
+        return relationship
 
     def visit(self, ast) -> ClassDiagram:
         """
@@ -104,22 +125,31 @@ class ClassDiagramGenerationVisitor(ASTVisitor):
         """
         self.classes = {}
         self.interfaces = {}
+        self.__relationships = {}
+        self.__associations = set()
+        self.__bidirectional = set()
+        self.__unidirectional = {}
 
-        super().visit(ast)
+        # Nested classes are visited as part of their outer class' body, and classes inside functions are not visited.
+        for node in ast.find_outermost(ASTClassDefinitionNode, ASTInterfaceDefinitionNode, ASTFunctionDefinitionNode):
+            if not isinstance(node, ASTFunctionDefinitionNode):
+                self.dispatch(node)
 
         self.__create_relationships()
 
         return ClassDiagram(list(self.classes.values()) + list(self.interfaces.values()))
 
-    def visit_children(self, node) -> List:
+    @fold
+    def visit_children(self, node, results) -> List:
         """
         Visit each of an AST node's children.
 
         :param node: The parent AST node whose children to visit.
+        :param results: The children's visit results, in order.
+        :return: The children's visit results, flattened, without empty results.
         """
         child_results = []
-        for child in node.children.values():
-            child_result = child.accept(self) if child is not None else None
+        for child_result in results:
             if child_result:
                 if isinstance(child_result, list):
                     child_results += child_result
@@ -129,18 +159,18 @@ class ClassDiagramGenerationVisitor(ASTVisitor):
         return child_results
 
     def visit_class_definition(self, node):
-        name = node['name'].accept(self)
+        name = yield node['name']
 
-        superclasses = node['bases'].accept(self) if 'bases' in node and node['bases'] else []
+        superclasses = (yield node['bases']) if 'bases' in node and node['bases'] else []
         if not isinstance(superclasses, list):
             superclasses = [superclasses]
 
-        interfaces = node['interfaces'].accept(self) if 'interfaces' in node and node['interfaces'] else []
+        interfaces = (yield node['interfaces']) if 'interfaces' in node and node['interfaces'] else []
         if not isinstance(interfaces, list):
             interfaces = [interfaces]
 
         if 'body' in node and node['body']:
-            body = node['body'].accept(self)
+            body = yield node['body']
             if not isinstance(body, list):
                 body = [body]
 
@@ -157,14 +187,14 @@ class ClassDiagramGenerationVisitor(ASTVisitor):
         return class_
 
     def visit_interface_definition(self, node):
-        name = node["name"].accept(self)
+        name = yield node["name"]
 
-        bases = node["bases"].accept(self) if "bases" in node and node["bases"] else []
+        bases = (yield node["bases"]) if "bases" in node and node["bases"] else []
         if not isinstance(bases, list):
             bases = [bases]
 
         if "body" in node and node["body"]:
-            body = node["body"].accept(self)
+            body = yield node["body"]
             if not isinstance(body, list):
                 body = [body]
 
@@ -181,7 +211,7 @@ class ClassDiagramGenerationVisitor(ASTVisitor):
         return interface
 
     def visit_function_definition(self, node):
-        return_type = node['return_type'].accept(self) if isinstance(node['return_type'], ASTIdentifierNode) else None
+        return_type = (yield node['return_type']) if isinstance(node['return_type'], ASTIdentifierNode) else None
 
         visibility = None
         static = False
@@ -192,12 +222,12 @@ class ClassDiagramGenerationVisitor(ASTVisitor):
             elif modifier is ASTMiscModifier.STATIC:
                 static = True
 
-        parameters = node['parameters'].accept(self) if node['parameters'] else None
+        parameters = (yield node['parameters']) if node['parameters'] else None
 
-        return Method(node['name'].accept(self), visibility, parameters, return_type, static)
+        return Method((yield node['name']), visibility, parameters, return_type, static)
 
     def visit_variable_declaration(self, node):
-        type_ = node['type'].accept(self) if isinstance(node['type'], ASTIdentifierNode) else None
+        type_ = (yield node['type']) if isinstance(node['type'], ASTIdentifierNode) else None
 
         visibility = None
         static = False
@@ -209,33 +239,33 @@ class ClassDiagramGenerationVisitor(ASTVisitor):
                 static = True
 
         attributes = []
-        for variable in node['name'].accept(self):
+        for variable in (yield node['name']):
             attributes.append(Attribute(variable, visibility, type_, static=static))
 
         return attributes if attributes else None
 
     def visit_argument(self, node):
-        return node['value'].accept(self) if isinstance(node['value'], ASTIdentifierNode) else None
+        return (yield node['value']) if isinstance(node['value'], ASTIdentifierNode) else None
 
     def visit_keyword_argument(self, node):
         return None
 
     def visit_parameter(self, node):
-        name = node['name'].accept(self)
-        type_ = node['type'].accept(self) if isinstance(node['type'], ASTIdentifierNode) else None
-        default = node['default'].accept(self) if isinstance(node['default'], ASTIdentifierNode) else None
+        name = yield node['name']
+        type_ = (yield node['type']) if isinstance(node['type'], ASTIdentifierNode) else None
+        default = (yield node['default']) if isinstance(node['default'], ASTIdentifierNode) else None
 
         return Parameter(name, type_, default)
 
     def visit_positional_arguments_parameter(self, node):
-        name = "*" + node['name'].accept(self)
-        type_ = node['type'].accept(self) if isinstance(node['type'], ASTIdentifierNode) else None
+        name = "*" + (yield node['name'])
+        type_ = (yield node['type']) if isinstance(node['type'], ASTIdentifierNode) else None
 
         return Parameter(name, type_)
 
     def visit_keyword_arguments_parameter(self, node):
-        name = "**" + node['name'].accept(self)
-        type_ = node['type'].accept(self) if isinstance(node['type'], ASTIdentifierNode) else None
+        name = "**" + (yield node['name'])
+        type_ = (yield node['type']) if isinstance(node['type'], ASTIdentifierNode) else None
 
         return Parameter(name, type_)
 
@@ -1,10 +1,11 @@
 from metrics.structures.ast import *
 from metrics.structures.dependency_graph import *
-from metrics.visitors.base.ast_visitor import ASTVisitor
+from metrics.structures.symbol_table import SymbolTable
+from metrics.visitors.base.ast_visitor import ASTVisitor, fold
 
 
 class DependencyGraphGenerationVisitor(ASTVisitor):
-    def __init__(self, base=None, classes=None):
+    def __init__(self, base=None, classes=None, symbol_table=None):
         """
         Dependency graph generation visitor.
 
@@ -12,6 +13,8 @@ class DependencyGraphGenerationVisitor(ASTVisitor):
         :type base: Class or None
         :param classes: List of exterior classes.
         :type classes: list[Class] or None
+        :param symbol_table: The symbol table of the AST to be visited. Built from the AST if not supplied.
+        :type symbol_table: SymbolTable or None
         """
         if base is None:
             base = Class("object")
@@ -27,6 +30,7 @@ class DependencyGraphGenerationVisitor(ASTVisitor):
         for class_ in classes:
             self.add_class(class_)
 
+        self.symbol_table = symbol_table
         self.scope = None
 
     def add_class(self, class_):
@@ -44,33 +48,40 @@ class DependencyGraphGenerationVisitor(ASTVisitor):
 
     def get_class(self, name):
         """
-        Get the most recent class binding to the specified name.
+        Get the most recent class binding to the specified name, defined at the current scope or globally.
 
         :param name: The name of the class to get.
         :type name: str
         :return: The most recent class binding to the specified name. None if no such class exists/
         :rtype: Class or None
         """
-        if name in self.classes:
-            return self.classes[name][-1]
+        for qualified_name in self.scope.candidates(name):
+            if qualified_name in self.classes:
+                return self.classes[qualified_name][-1]
         return None
 
     def visit(self, ast):
-        ast.accept(self)
+        if self.symbol_table is None:
+            self.symbol_table = SymbolTable.build(ast)
+        self.scope = self.symbol_table.global_scope
+
+        super().visit(ast)
         return DependencyGraph(self.base, list(self.classes.values()))
 
-    def visit_children(self, node):
+    @fold
+    def visit_children(self, node, results):
         """
         Visit all of a node's children.
 
         :param node: The node whose children to visit.
         :type node: ASTNode
+        :param results: The children's visit results, in order.
+        :type results: list[Any]
         :return: A built sequence of CFGNodes returned by visiting each child. None if no CFGNodes returned.
         :rtype: list[Any]
         """
         child_results = []
-        for child in node.children.values():
-            child_result = child.accept(self) if child is not None else None
+        for child_result in results:
             if child_result:
                 if isinstance(child_result, list):
                     child_results += child_result
@@ -87,33 +98,32 @@ class DependencyGraphGenerationVisitor(ASTVisitor):
         :type node: ASTClassDefinitionNode
         """
         # Class name
-        name = node['name'].accept(self)
-        if self.scope:
-            name = f"{self.scope}.{name}"
+        scope = self.symbol_table.scope_of(node)
+        name = scope.qualified_name
 
         # Class bases
         superclasses = [self.base]
         if node['bases']:
-            superclasses = node['bases'].accept(self)
+            superclasses = yield node['bases']
             if not isinstance(superclasses, list):
                 superclasses = [superclasses]
 
         # Dependencies inside the class
         scope_tmp = self.scope
-        self.scope = name
+        self.scope = scope
 
-        inner_dependencies = [class_ for class_ in node['body'].accept(self) if isinstance(class_, Class)]
+        inner_dependencies = [class_ for class_ in (yield node['body']) if isinstance(class_, Class)]
 
         self.scope = scope_tmp
 
-        # Create class
+        # Create class (repeated dependencies are only kept once, in the order they are first met)
         if name in self.classes:
-            self.classes[name].append(Class(name, list(set(superclasses + inner_dependencies))))
+            self.classes[name].append(Class(name, superclasses + inner_dependencies))
         else:
-            self.classes[name] = [Class(name, list(set(superclasses + inner_dependencies)))]
+            self.classes[name] = [Class(name, superclasses + inner_dependencies)]
 
     def visit_argument(self, node):
-        return self.get_dependency(node['value'])
+        return (yield from self.get_dependency(node['value']))
 
     def visit_function_definition(self, node):
         """
@@ -124,26 +134,22 @@ class DependencyGraphGenerationVisitor(ASTVisitor):
         :return: The corresponding method object.
         :rtype: Method
         """
-        name = node['name'].accept(self)
-        if self.scope:
-            name = f"{self.scope}.{name}"
-
         dependencies = []
         if node['parameters']:
-            parameters = node["parameters"].accept(self)
+            parameters = yield node["parameters"]
             if not isinstance(parameters, list):
                 parameters = [parameters]
             dependencies = [class_ for class_ in parameters if isinstance(class_, Class)]
 
-        return_dependency = self.get_dependency(node['return_type'])
+        return_dependency = yield from self.get_dependency(node['return_type'])
         if return_dependency:
             dependencies.append(return_dependency)
 
         scope_tmp = self.scope
-        self.scope = f"{self.scope}.{name}.<locals>" if self.scope else f"{name}.<locals>"
+        self.scope = self.symbol_table.scope_of(node)
 
         if node["body"]:
-            node['body'].accept(self)
+            yield node['body']
 
         self.scope = scope_tmp
 
@@ -158,7 +164,7 @@ class DependencyGraphGenerationVisitor(ASTVisitor):
         :return: The parameter's dependency. None if the parameter has no type.
         :rtype: Class or None
         """
-        return self.get_dependency(node['type'])
+        return (yield from self.get_dependency(node['type']))
 
     def visit_positional_arguments_parameter(self, node):
         """
@@ -169,7 +175,7 @@ class DependencyGraphGenerationVisitor(ASTVisitor):
         :return: The positional arguments parameter's dependency. None if the parameter has no type.
         :rtype: Class or None
         """
-        return self.get_dependency(node['type'])
+        return (yield from self.get_dependency(node['type']))
 
     def visit_member(self, node):
         """
@@ -182,11 +188,11 @@ class DependencyGraphGenerationVisitor(ASTVisitor):
         """
         if isinstance(node['parent'], (ASTIdentifierNode, ASTMemberNode)):
             if isinstance(node['member'], (ASTIdentifierNode, ASTMemberNode)):
-                parent = node['parent'].accept(self)
+                parent = yield node['parent']
                 if isinstance(parent, UnknownClass):
                     return parent
 
-                member = node['member'].accept(self)
+                member = yield node['member']
                 if isinstance(member, UnknownClass):
                     return member
 
@@ -210,21 +216,16 @@ class DependencyGraphGenerationVisitor(ASTVisitor):
         """
         if type_:
             if isinstance(type_, (ASTIdentifierNode, ASTMemberNode)):
-                type_name = type_.accept(self)
+                type_name = yield type_
                 if isinstance(type_name, Class):
                     return type_name
 
-                if self.scope:
-                    class_ = self.get_class(f"{self.scope}.{type_name}")
-                    if class_:
-                        return class_
-
                 class_ = self.get_class(type_name)
                 if class_:
                     return class_
 
                 class_ = UnknownClass(name=type_name, dependencies=[self.base],
-                                    reason=Reason.not_found(type_name, self.scope))
+                                      reason=Reason.not_found(type_name, self.scope.prefix))
                 self.add_class(class_)
                 return class_
             return UnknownClass(dependencies=[self.base], reason=Reason.unsupported(type_))
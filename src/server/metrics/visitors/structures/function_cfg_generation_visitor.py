@@ -0,0 +1,159 @@
+from typing import Dict, Optional
+
+from metrics.structures.ast import ASTNode, ASTDefinitionNode, ASTNamespaceDeclarationNode, ASTFunctionDefinitionNode, \
+    ASTConstructorDefinitionNode, ASTDestructorDefinitionNode, ASTAccessorDefinitionNode, \
+    ASTOperatorOverloadDefinitionNode, ASTConversionOperatorDefinitionNode, ASTIdentifierNode, ASTMemberNode, \
+    ASTTypeNode
+from metrics.structures.cfg import CFG, CFGBlock
+from metrics.structures.compact_cfg import CompactCFG
+from metrics.structures.function_cfgs import FunctionCFGs
+from metrics.visitors.base.memo_table import MemoTable
+from metrics.visitors.structures.cfg_generation_visitor import CFGGenerationVisitor
+
+# Definitions whose bodies are given control-flow graphs of their own.
+FUNCTION_TYPES = (ASTFunctionDefinitionNode, ASTConstructorDefinitionNode, ASTDestructorDefinitionNode,
+                  ASTAccessorDefinitionNode, ASTOperatorOverloadDefinitionNode, ASTConversionOperatorDefinitionNode)
+
+
+def generate_function_cfg(node: ASTNode) -> CompactCFG:
+    """
+    Generate the control-flow graph of a function.
+
+    Defined at module level so that it can be sent to worker processes.
+
+    :param node: The function's definition node.
+    :return: The function's CFG, in compact form.
+    """
+    return CompactCFG.from_cfg(FunctionCFGGenerationVisitor().generate(node))
+
+
+def generate_simplified_function_cfg(node: ASTNode) -> CompactCFG:
+    """
+    Generate the control-flow graph of a function, without its pass-through blocks.
+
+    :param node: The function's definition node.
+    :return: The function's simplified CFG, in compact form.
+    """
+    return generate_function_cfg(node).simplified()
+
+
+class FunctionCFGGenerationVisitor(CFGGenerationVisitor):
+    """
+    Function control-flow graph generation visitor.
+
+    Provides functionality for visiting an abstract syntax tree and collecting its functions, methods, constructors,
+    accessors, etc. by qualified name, so that a control-flow graph can be generated for each of them when needed.
+
+    A function's CFG covers its own body only. The bodies of functions defined within it are skipped, as they have
+    CFGs of their own.
+    """
+
+    def __init__(self, simplify: bool = False, cfg_table: Optional[MemoTable] = None):
+        """
+        Function control-flow graph generation visitor.
+
+        :param simplify: Whether to remove the pass-through blocks of the generated CFGs.
+        :param cfg_table: Table to keep the generated CFGs in, keyed by the structural hash of their function, so that
+        those of structurally identical functions are reused. None generates every function's CFG afresh.
+        """
+        super().__init__()
+        self.simplify = simplify
+        self.cfg_table = cfg_table
+
+    def visit(self, ast) -> FunctionCFGs:
+        """
+        Visit the AST and collect its functions.
+
+        :param ast: The AST to visit.
+        :return: The functions' CFGs, each generated when it is first looked up.
+        """
+        functions: Dict[str, ASTNode] = {}
+        for node in ast.find_all(*FUNCTION_TYPES):
+            if not isinstance(node["body"], ASTNode):
+                continue
+
+            name = self.get_qualified_name(node)
+            if name in functions:
+                overload = 2
+                while f"{name}#{overload}" in functions:
+                    overload += 1
+                name = f"{name}#{overload}"
+
+            functions[name] = node
+
+        if self.simplify:
+            return FunctionCFGs(functions, generate_simplified_function_cfg, self.cfg_table)
+
+        return FunctionCFGs(functions, generate_function_cfg, self.cfg_table)
+
+    def generate(self, node: ASTNode) -> CFG:
+        """
+        Generate the CFG of a function.
+
+        :param node: The function's definition node.
+        :return: The function's CFG.
+        """
+        self.loop_scope = None
+
+        body = self.dispatch(node["body"]) if isinstance(node["body"], ASTNode) else None
+
+        return CFG(CFGBlock({"exit_block": body}))
+
+    def get_qualified_name(self, node: ASTDefinitionNode) -> str:
+        """
+        Get the qualified name of a definition, from the names of the namespaces and definitions enclosing it. Names
+        defined within functions are qualified with <locals>, as in inheritance trees.
+
+        :param node: The definition node.
+        :return: The definition's qualified name.
+        """
+        names = []
+        for ancestor in reversed(list(node.iter_ancestors())):
+            if isinstance(ancestor, (ASTDefinitionNode, ASTNamespaceDeclarationNode)):
+                names.append(self.get_name(ancestor["name"]))
+                if isinstance(ancestor, FUNCTION_TYPES):
+                    names.append("<locals>")
+
+        names.append(self.get_name(node["name"]))
+
+        return ".".join(names)
+
+    def get_name(self, node: Optional[ASTNode]) -> str:
+        """
+        Get the dot-separated name held by an identifier, member or (generic) type node.
+
+        :param node: The name node.
+        :return: The name. <anonymous> if the node holds no name.
+        """
+        if isinstance(node, ASTIdentifierNode):
+            return node.name
+
+        if isinstance(node, ASTMemberNode):
+            return f"{self.get_name(node['parent'])}.{self.get_name(node['member'])}"
+
+        if isinstance(node, ASTTypeNode):
+            return self.get_name(node["name"])
+
+        return "<anonymous>"
+
+    # region Visits
+
+    def visit_function_definition(self, node) -> None:
+        return None
+
+    def visit_constructor_definition(self, node) -> None:
+        return None
+
+    def visit_destructor_definition(self, node) -> None:
+        return None
+
+    def visit_accessor_definition(self, node) -> None:
+        return None
+
+    def visit_operator_overload_definition(self, node) -> None:
+        return None
+
+    def visit_conversion_operator_definition(self, node) -> None:
+        return None
+
+    # endregion
@@ -1,10 +1,14 @@
 from metrics.structures.ast import *
 from metrics.structures.inheritance_tree import *
-from metrics.visitors.base.ast_visitor import ASTVisitor
+from metrics.structures.symbol_table import SymbolTable
+from metrics.visitors.base.ast_visitor import ASTVisitor, fold
 
 
 class InheritanceTreeGenerationVisitor(ASTVisitor):
-    def __init__(self, base=None, classes=None):
+    # Only class definitions and their methods contribute to the tree, so subtrees without any are skipped.
+    interesting_kinds = (ASTClassDefinitionNode, ASTFunctionDefinitionNode)
+
+    def __init__(self, base=None, classes=None, symbol_table=None):
         """
         Inheritance tree generation visitor.
 
@@ -12,6 +16,8 @@ class InheritanceTreeGenerationVisitor(ASTVisitor):
         :type base: Class or None
         :param classes: List of exterior classes.
         :type classes: list[Class] or None
+        :param symbol_table: The symbol table of the AST to be visited. Built from the AST if not supplied.
+        :type symbol_table: SymbolTable or None
         """
         if base is None:
             base = KnownClass("object")
@@ -27,6 +33,7 @@ class InheritanceTreeGenerationVisitor(ASTVisitor):
         for class_ in classes:
             self.add_class(class_)
 
+        self.symbol_table = symbol_table
         self.scope = None
 
         super().__init__()
@@ -46,40 +53,54 @@ class InheritanceTreeGenerationVisitor(ASTVisitor):
 
     def get_class(self, name):
         """
-        Get the most recent class binding to the specified name.
+        Get the most recent class binding to the specified name, defined at the current scope or globally.
 
         :param name: The name of the class to get.
         :type name: str
         :return: The most recent class binding to the specified name. None if no such class exists/
         :rtype: Class or None
         """
-        if name in self.classes:
-            return self.classes[name][-1]
+        for qualified_name in self.scope.candidates(name):
+            if qualified_name in self.classes:
+                return self.classes[qualified_name][-1]
 
     def visit(self, ast):
         """
         Visit the AST and produce an inheritance tree.
 
+        Only the outermost class definitions are visited, straight from the AST's index, at the scope they are defined
+        at. Nested class definitions are visited as part of their outer class' body.
+
         :param ast: The AST to visit.
         :type ast: AST
         :return: The generated inheritance tree.
         :rtype: InheritanceTree
         """
-        ast.accept(self)
+        if self.symbol_table is None:
+            self.symbol_table = SymbolTable.build(ast)
+
+        for node in ast.find_outermost(ASTClassDefinitionNode):
+            self.scope = self.symbol_table.enclosing_scope(node)
+            self.dispatch(node)
+
+        self.scope = None
+
         return InheritanceTree(self.base)
 
-    def visit_children(self, node):
+    @fold
+    def visit_children(self, node, results):
         """
         Visit all of a node's children.
 
         :param node: The node whose children to visit.
         :type node: ASTNode
+        :param results: The children's visit results, in order.
+        :type results: list[Any]
         :return: A built sequence of CFGNodes returned by visiting each child. None if no CFGNodes returned.
         :rtype: list[Class or Method or Parameter]
         """
         child_results = []
-        for child in node.children.values():
-            child_result = child.accept(self) if child is not None else None
+        for child_result in results:
             if child_result:
                 if isinstance(child_result, list):
                     child_results += child_result
@@ -96,13 +117,12 @@ class InheritanceTreeGenerationVisitor(ASTVisitor):
         :type node: ASTClassDefinitionNode
         """
         # Class name
-        name = node['name'].accept(self)
-        if self.scope:
-            name = self.scope + "." + name
+        scope = self.symbol_table.scope_of(node)
+        name = scope.qualified_name
 
         # Class bases
         if node['bases']:
-            superclasses = node['bases'].accept(self)
+            superclasses = yield node['bases']
             if not isinstance(superclasses, list):
                 superclasses = [superclasses]
         else:
@@ -115,9 +135,9 @@ class InheritanceTreeGenerationVisitor(ASTVisitor):
 
         # Class methods
         tmp = self.scope
-        self.scope = name
+        self.scope = scope
 
-        methods = [method for method in (node['body'].accept(self)) if isinstance(method, Method)]
+        methods = [method for method in (yield node['body']) if isinstance(method, Method)]
 
         self.scope = tmp
 
@@ -140,27 +160,28 @@ class InheritanceTreeGenerationVisitor(ASTVisitor):
         :rtype: Method
         """
         # Method name
-        name = node['name'].accept(self)
+        name = yield node['name']
 
         # Method parameters
         parameters = None
         if node['parameters']:
             if isinstance(node['parameters'], ASTMultiplesNode):
-                parameters = self.visit_children(node['parameters'])
+                parameters = yield from self.visit_children(node['parameters'])
             else:
-                parameters = [node["parameters"].accept(self)]
+                parameters = [(yield node["parameters"])]
 
         # Method return type
         return_type = None
         if node['return_type']:
-            return_type = node['return_type'].accept(self)
+            return_type = yield node['return_type']
 
         # Visit method body
         tmp = self.scope
-        self.scope = f"{self.scope}.{name}.<locals>" if self.scope else f"{name}.<locals>"
+        self.scope = self.symbol_table.scope_of(node)
 
-        if node["body"]:
-            node['body'].accept(self)
+        # The body only contributes the classes defined in it.
+        if node["body"] and node["body"].has_kinds(self.interesting_mask()):
+            yield node['body']
 
         self.scope = tmp
 
@@ -178,26 +199,20 @@ class InheritanceTreeGenerationVisitor(ASTVisitor):
         """
         if isinstance(node['value'], (ASTIdentifierNode, ASTMemberNode)):
             # Superclass name
-            name = node['value'].accept(self)
+            name = yield node['value']
             if isinstance(name, UnknownClass):
                 return name
 
-            # Check for class at same scope
-            if self.scope:
-                cls = self.get_class(f"{self.scope}.{name}")
-                if cls:
-                    return cls
-
-            # Check for class at global scope
+            # Check for class at same scope, then at global scope
             cls = self.get_class(name)
             if cls:
                 return cls
 
-            if not self.scope:
+            if not self.scope.prefix:
                 cls = UnknownClass(name, reason=f"Class with name \"{name}\" cannot be found globally.")
             else:
                 cls = UnknownClass(name,
-                                   reason=f"Class with name \"{name}\" cannot be found at scope {self.scope} "
+                                   reason=f"Class with name \"{name}\" cannot be found at scope {self.scope.prefix} "
                                           f"or globally.")
 
         elif isinstance(node['value'], ASTPositionalUnpackExpressionNode):
@@ -223,11 +238,11 @@ class InheritanceTreeGenerationVisitor(ASTVisitor):
         """
         if isinstance(node['parent'], ASTIdentifierNode) or isinstance(node['parent'], ASTMemberNode):
             if isinstance(node['member'], ASTIdentifierNode or isinstance(node['member'], ASTMemberNode)):
-                parent = node['parent'].accept(self)
+                parent = yield node['parent']
                 if isinstance(parent, UnknownClass):
                     return parent
 
-                member = node['member'].accept(self)
+                member = yield node['member']
                 if isinstance(member, UnknownClass):
                     return member
 
@@ -250,7 +265,7 @@ class InheritanceTreeGenerationVisitor(ASTVisitor):
         :return: The corresponding parameter node.
         :rtype: Parameter
         """
-        return Parameter(node['name'].accept(self))
+        return Parameter((yield node['name']))
 
     def visit_positional_arguments_parameter(self, node):
         """
@@ -261,7 +276,7 @@ class InheritanceTreeGenerationVisitor(ASTVisitor):
         :return: The corresponding positional arguments parameter node.
         :rtype: PositionalArgumentsParameter
         """
-        return PositionalArgumentsParameter(node['name'].accept(self))
+        return PositionalArgumentsParameter((yield node['name']))
 
     def visit_keyword_arguments_parameter(self, node):
         """
@@ -272,7 +287,7 @@ class InheritanceTreeGenerationVisitor(ASTVisitor):
         :return: The corresponding keyword arguments parameter node.
         :rtype: KeywordArgumentsParameter
         """
-        return KeywordArgumentsParameter(node['name'].accept(self))
+        return KeywordArgumentsParameter((yield node['name']))
 
     def visit_identifier(self, node):
         """
@@ -96,3 +96,34 @@ STATIC_URL = '/static/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'uploads/')
 
 STATIC_ROOT = os.path.join(BASE_DIR, 'static/')
+
+# The depth down to which uploads' ASTs are included in the upload response, and AST subtrees in node responses. None
+# includes whole ASTs, which is the default as the front-end cannot request the subtrees of truncated nodes yet.
+# Clients that can may opt in per request with the ast_depth (or, for nodes, depth) query parameter, where "all"
+# includes the whole AST.
+AST_DEPTH = None
+
+# Uploads analysed as jobs are queued until an analysis worker runs them. Analysis is CPU-bound, so workers run in
+# their own processes rather than in the server's, each started with "python manage.py analysis_workers" (start several
+# to run jobs in parallel), and jobs stay queued while none are running. To run workers in each server process instead
+# (e.g. in development), set the number of worker threads it starts with its first job here. 0 starts none.
+ANALYSIS_WORKERS = 0
+
+# How often idle analysis workers, and progress subscriptions, check the job queue for changes, in seconds.
+ANALYSIS_POLL_INTERVAL = 0.5
+
+# How long a subscription to an analysis job's events stays open, in seconds. Each one holds a server worker while it
+# is open, so subscriptions are closed after this long even if their job has not finished, and clients reconnect after
+# the retry time sent at the start of the stream, in milliseconds, to follow the job further.
+ANALYSIS_EVENTS_WINDOW = 30
+ANALYSIS_EVENTS_RETRY = 1000
+
+# How long a running analysis job can go without progress or a heartbeat before it is assumed to have been abandoned
+# (e.g. by a worker that crashed) and is queued again, in seconds, and how many times a job is attempted before it
+# fails.
+ANALYSIS_JOB_TIMEOUT = 600
+ANALYSIS_JOB_ATTEMPTS = 3
+
+# How often a worker marks its running job as alive while it is busy with one of the job's stages, in seconds. Must be
+# well under ANALYSIS_JOB_TIMEOUT, so that long stages are not mistaken for abandoned jobs.
+ANALYSIS_JOB_HEARTBEAT = 60
@@ -0,0 +1,98 @@
+from array import array
+from unittest import TestCase
+
+from metrics.analysis.cfg_analysis import CFGAnalysis
+from metrics.structures.ast import AST, ASTStatementsNode, ASTIdentifierNode, ASTIfStatementNode, \
+    ASTLoopStatementNode, ASTPassStatementNode, ASTBreakStatementNode
+from metrics.structures.compact_cfg import CompactCFG
+from metrics.visitors.structures.cfg_generation_visitor import CFGGenerationVisitor
+
+
+def build_compact_cfg(successors) -> CompactCFG:
+    """
+    Build a compact CFG with the supplied successors for each block.
+    """
+    cfg = CompactCFG(array("B", [0] * len(successors)))
+    for block_successors in successors:
+        cfg.targets.extend(block_successors)
+        cfg.edge_kinds.extend([0] * len(block_successors))
+        cfg.offsets.append(len(cfg.targets))
+
+    return cfg
+
+
+class TestCFGAnalysis(TestCase):
+    """
+    CFG analysis test case.
+    """
+
+    def setUp(self) -> None:
+        # 0 -> 1 (loop header) -> 2 -> 3 -> 1, 2 -> 4 -> 1, 1 -> 5 (exit), plus 6 unreachable and 7 <-> 8 looping forever.
+        self.analysis = CFGAnalysis(build_compact_cfg([[1], [2, 5], [3, 4], [1], [1], [], [5], [8], [7]]))
+
+    def test_dominators(self) -> None:
+        """
+        Test idom and ipdom properties.
+        """
+        self.assertEqual(self.analysis.idom, [0, 0, 1, 2, 2, 1, -1, -1, -1])
+        self.assertEqual(self.analysis.ipdom, [1, 5, 1, 1, 1, 9, 5, -1, -1])
+        self.assertTrue(self.analysis.dominates(1, 4))
+        self.assertFalse(self.analysis.dominates(3, 4))
+        self.assertTrue(self.analysis.post_dominates(1, 3))
+        self.assertFalse(self.analysis.post_dominates(2, 0))
+
+    def test_loops(self) -> None:
+        """
+        Test loops property builds the loop-nesting forest.
+        """
+        loops = self.analysis.loops
+
+        self.assertEqual(loops.headers, [1])
+        self.assertEqual([loops.loop_depth(block) for block in range(6)], [0, 1, 1, 1, 1, 0])
+
+    def test_unreachable_blocks(self) -> None:
+        """
+        Test unreachable_blocks and non_terminating_blocks methods.
+        """
+        self.assertEqual(self.analysis.unreachable_blocks(), [6, 7, 8])
+        self.assertEqual(CFGAnalysis(build_compact_cfg([[1], [2], [1]])).non_terminating_blocks(), [0, 1, 2])
+
+    def test_nesting_depths(self) -> None:
+        """
+        Test nesting depths follow the nesting of the code's statements, and statements after a branch are not nested.
+        """
+        def if_statement(*body):
+            return ASTIfStatementNode(ASTIdentifierNode("c"), ASTStatementsNode(list(body)))
+
+        ast = AST(ASTStatementsNode([
+            ASTIfStatementNode(ASTIdentifierNode("c"), ASTStatementsNode([if_statement(ASTPassStatementNode())]),
+                               ASTStatementsNode([ASTPassStatementNode()])),
+            ASTLoopStatementNode(ASTIdentifierNode("c"), ASTStatementsNode([if_statement(if_statement())])),
+            if_statement(ASTPassStatementNode()),
+        ]))
+        analysis = CFGAnalysis(CFGGenerationVisitor().visit(ast))
+
+        self.assertEqual(analysis.maximum_nesting_depth(), 4)
+        self.assertEqual(analysis.loops.maximum_depth(), 1)
+        self.assertIsNone(CFGAnalysis(CompactCFG()).maximum_nesting_depth())
+
+    def test_nesting_depths_breaks(self) -> None:
+        """
+        Test nesting depths of loops with breaks, whose CFGs have no exit, do not nest the blocks the breaks lead to.
+        """
+        def if_statement(*body):
+            return ASTIfStatementNode(ASTIdentifierNode("c"), ASTStatementsNode(list(body)))
+
+        def loop_statement(*body):
+            return ASTLoopStatementNode(ASTIdentifierNode("c"), ASTStatementsNode(list(body)))
+
+        def maximum_nesting_depth(*statements):
+            return CFGAnalysis(CFGGenerationVisitor().visit(AST(ASTStatementsNode(list(statements))))) \
+                .maximum_nesting_depth()
+
+        self.assertEqual(maximum_nesting_depth(if_statement(ASTPassStatementNode()),
+                                               loop_statement(if_statement(ASTBreakStatementNode()))), 3)
+        self.assertEqual(maximum_nesting_depth(if_statement(ASTPassStatementNode()),
+                                               loop_statement(if_statement(if_statement(ASTBreakStatementNode())))), 4)
+        self.assertEqual(maximum_nesting_depth(loop_statement(if_statement(ASTPassStatementNode())),
+                                               loop_statement(if_statement(ASTBreakStatementNode()))), 3)
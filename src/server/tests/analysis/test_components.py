@@ -0,0 +1,84 @@
+from array import array
+from random import Random
+from unittest import TestCase
+
+from metrics.analysis.components import strongly_connected_components, Condensation
+
+
+def build_csr(successors):
+    """
+    Build the compressed sparse row arrays of a graph from the successors of each node.
+    """
+    offsets, targets = array("l", [0]), array("l")
+    for node_successors in successors:
+        targets.extend(node_successors)
+        offsets.append(len(targets))
+
+    return offsets, targets
+
+
+class TestComponents(TestCase):
+    """
+    Strongly connected components test case.
+    """
+
+    def setUp(self) -> None:
+        # 0 -> 1 <-> 2 -> 3, 3 -> 3, 4 -> 0, 5
+        self.offsets, self.targets = build_csr([[1], [2], [1, 3], [3], [0], []])
+
+    def test_strongly_connected_components(self) -> None:
+        """
+        Test strongly_connected_components function finds the components in reverse topological order.
+        """
+        components, component = strongly_connected_components(self.offsets, self.targets)
+
+        self.assertEqual(components, [[3], [1, 2], [0], [4], [5]])
+        self.assertEqual(component, [2, 1, 1, 0, 3, 4])
+
+    def test_matches_reachability(self) -> None:
+        """
+        Test strongly_connected_components function puts two nodes in the same component exactly when each reaches the
+        other, on random graphs.
+        """
+        for seed in range(50):
+            random = Random(seed)
+            node_count = random.randint(1, 15)
+            successors = [random.sample(range(node_count), random.randint(0, 2)) for _ in range(node_count)]
+            _, component = strongly_connected_components(*build_csr(successors))
+
+            reachable = []
+            for node in range(node_count):
+                seen, worklist = {node}, [node]
+                while worklist:
+                    for successor in successors[worklist.pop()]:
+                        if successor not in seen:
+                            seen.add(successor)
+                            worklist.append(successor)
+                reachable.append(seen)
+
+            for first in range(node_count):
+                for second in range(node_count):
+                    self.assertEqual(component[first] == component[second],
+                                     second in reachable[first] and first in reachable[second], f"Seed {seed}")
+
+    def test_condensation(self) -> None:
+        """
+        Test Condensation build method condenses components, and test its cycles and layers methods.
+        """
+        condensation = Condensation.build(self.offsets, self.targets)
+
+        self.assertEqual(len(condensation), 5)
+        self.assertEqual(list(condensation.successors(1)), [0])
+        self.assertEqual(list(condensation.successors(3)), [2])
+        self.assertEqual(condensation.cycles(), [[3], [1, 2]])
+        self.assertEqual(condensation.layers(), [0, 1, 2, 3, 0])
+
+    def test_deep_cycle(self) -> None:
+        """
+        Test Condensation build method handles cycles longer than the recursion limit.
+        """
+        node_count = 20000
+        condensation = Condensation.build(*build_csr([[(node + 1) % node_count] for node in range(node_count)]))
+
+        self.assertEqual(len(condensation), 1)
+        self.assertEqual(len(condensation.cycles()[0]), node_count)
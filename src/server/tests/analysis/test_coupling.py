@@ -0,0 +1,48 @@
+from random import Random
+from unittest import TestCase
+
+from metrics.analysis.coupling import couplings
+from metrics.structures.dependency_graph import DependencyGraph, KnownClass
+from metrics.structures.indexed_dependency_graph import IndexedDependencyGraph
+from metrics.visitors.metrics.ac_calculation_visitor import ACCalculationVisitor
+from metrics.visitors.metrics.ec_calculation_visitor import ECCalculationVisitor
+
+
+class TestCoupling(TestCase):
+    """
+    Coupling calculation test case.
+    """
+
+    def test_couplings(self) -> None:
+        """
+        Test couplings function agrees with the coupling visitors, in value and order, on random cyclic graphs.
+        """
+        for seed in range(100):
+            random = Random(seed)
+            classes = [KnownClass(str(number)) for number in range(random.randint(1, 30))]
+            for cls in classes:
+                for dependency in random.sample(classes, random.randint(0, min(4, len(classes)))):
+                    cls.add_dependency(dependency)
+
+            listed = random.sample(classes, random.randint(1, len(classes)))
+            graph = DependencyGraph(classes[0], [listed[:len(listed) // 2], listed[len(listed) // 2:]])
+            afferent, efferent = couplings(IndexedDependencyGraph.from_graph(graph))
+
+            self.assertEqual(list(afferent.items()), list(ACCalculationVisitor().visit(graph).items()), f"Seed {seed}")
+            self.assertEqual(list(efferent.items()), list(ECCalculationVisitor().visit(graph).items()), f"Seed {seed}")
+
+    def test_deep_chain(self) -> None:
+        """
+        Test couplings function handles dependency chains deeper than the recursion limit.
+        """
+        chain = [KnownClass(str(number)) for number in range(5000)]
+        for cls, dependency in zip(chain, chain[1:]):
+            cls.add_dependency(dependency)
+
+        afferent, efferent = couplings(IndexedDependencyGraph.from_graph(DependencyGraph(chain[0], [chain[:1]])))
+
+        self.assertEqual(afferent[chain[0]], 0)
+        self.assertEqual(afferent[chain[-1]], 1)
+        self.assertEqual(efferent[chain[0]], 1)
+        self.assertNotIn(chain[-1], efferent)
+        self.assertEqual(len(afferent), 5000)
@@ -0,0 +1,58 @@
+from random import Random
+from unittest import TestCase
+
+from metrics.analysis.inheritance import InheritanceMetrics
+from metrics.structures.inheritance_tree import InheritanceTree, KnownClass
+from metrics.visitors.metrics.mid_calculation_visitor import MIDCalculationVisitor
+
+
+class TestInheritanceMetrics(TestCase):
+    """
+    Inheritance metrics test case.
+    """
+
+    def test_build(self) -> None:
+        """
+        Test build method on a diamond, counting the class inheriting from both sides once.
+        """
+        base, left, right, bottom = KnownClass("object"), KnownClass("Left"), KnownClass("Right"), KnownClass("Bottom")
+        top = KnownClass("Top")
+        base.add_subclass(top)
+        top.add_subclass(left)
+        top.add_subclass(right)
+        base.add_subclass(right)
+        left.add_subclass(bottom)
+        right.add_subclass(bottom)
+
+        metrics = InheritanceMetrics.build(InheritanceTree(base))
+
+        self.assertEqual(metrics.classes[0], base)
+        self.assertEqual(metrics.depth_of_inheritance(),
+                         {base: 0, top: 1, left: 2, right: 2, bottom: 3})
+        self.assertEqual(metrics.number_of_children(),
+                         {base: 2, top: 2, left: 1, right: 1, bottom: 0})
+        self.assertEqual(metrics.number_of_descendants(),
+                         {base: 4, top: 3, left: 1, right: 1, bottom: 0})
+        self.assertEqual(metrics.maximum_depth, 4)
+
+    def test_maximum_depth(self) -> None:
+        """
+        Test maximum_depth property agrees with the maximum inheritance depth visitor on random inheritance graphs.
+        """
+        for seed in range(100):
+            random = Random(seed)
+            classes = [KnownClass(str(number)) for number in range(random.randint(1, 40))]
+            for number, cls in enumerate(classes[1:], 1):
+                for superclass in random.sample(classes[:number], random.randint(1, min(3, number))):
+                    superclass.add_subclass(cls)
+
+            tree = InheritanceTree(classes[0])
+            metrics = InheritanceMetrics.build(tree)
+
+            self.assertEqual(len(metrics), len(classes), f"Seed {seed}")
+            self.assertEqual(metrics.maximum_depth, MIDCalculationVisitor().visit(tree), f"Seed {seed}")
+
+        tree = InheritanceTree()
+        tree.base = None
+
+        self.assertIsNone(InheritanceMetrics.build(tree).maximum_depth)
@@ -0,0 +1,52 @@
+from random import Random
+from unittest import TestCase
+
+from metrics.analysis.coupling import couplings
+from metrics.analysis.package_metrics import main_sequence_metrics
+from metrics.structures.dependency_graph import DependencyGraph, KnownClass
+from metrics.structures.dependency_matrix import DependencyMatrix
+from metrics.structures.indexed_dependency_graph import IndexedDependencyGraph
+
+
+class TestPackageMetrics(TestCase):
+    """
+    Package metrics calculation test case.
+    """
+
+    def test_main_sequence_metrics(self) -> None:
+        """
+        Test main_sequence_metrics function agrees with the coupling kernel for classes, and counts distinct outside
+        classes for packages.
+        """
+        random = Random(0)
+        classes = [KnownClass(str(number)) for number in range(50)]
+        for cls in classes:
+            for dependency in random.sample(classes, 3):
+                cls.add_dependency(dependency)
+
+        indexed = IndexedDependencyGraph.from_graph(DependencyGraph(classes[0], [classes]))
+        matrix = DependencyMatrix.from_graph(indexed)
+        metrics = main_sequence_metrics(matrix, [cls.name in ("1", "2") for cls in matrix.classes])
+        afferent, efferent = couplings(indexed)
+
+        self.assertEqual(metrics["afferent"].tolist(), [afferent[cls] for cls in matrix.classes])
+        self.assertEqual(metrics["efferent"].tolist(), [efferent[cls] for cls in matrix.classes])
+        self.assertEqual(metrics["instability"].tolist(), [efferent[cls] / (afferent[cls] + efferent[cls])
+                                                           for cls in matrix.classes])
+        self.assertEqual(metrics["abstractness"].sum(), 2)
+
+        a, b, c, d = (KnownClass(name) for name in "ABCD")
+        a.add_dependency(c)
+        a.add_dependency(d)
+        b.add_dependency(c)
+        c.add_dependency(d)
+        matrix = DependencyGraph(a, [[a, b, c, d]]).adjacency_matrix()
+        packages = [0 if cls in (a, b) else 1 for cls in matrix.classes]
+        metrics = main_sequence_metrics(matrix, [cls is b for cls in matrix.classes], packages)
+
+        self.assertEqual(metrics["afferent"].tolist(), [0, 2])
+        self.assertEqual(metrics["efferent"].tolist(), [2, 0])
+        self.assertEqual(metrics["instability"].tolist(), [1, 0])
+        self.assertEqual(metrics["abstractness"].tolist(), [0.5, 0])
+        self.assertEqual(metrics["distance"].tolist(), [0.5, 1])
+        self.assertEqual(main_sequence_metrics(DependencyMatrix())["distance"].tolist(), [])
@@ -0,0 +1,49 @@
+from random import Random
+from unittest import TestCase
+
+from metrics.analysis.reachability import ReachabilityIndex
+from tests.analysis.test_components import build_csr
+
+
+class TestReachabilityIndex(TestCase):
+    """
+    Reachability index test case.
+    """
+
+    def test_reachable_from(self) -> None:
+        """
+        Test reachable_from and reaching methods, and reaches method, on a graph with cycles.
+        """
+        # 0 -> 1 <-> 2 -> 3, 3 -> 3, 4 -> 0, 5
+        index = ReachabilityIndex.build(*build_csr([[1], [2], [1, 3], [3], [0], []]))
+
+        self.assertEqual(index.reachable_from(0), [1, 2, 3])
+        self.assertEqual(index.reachable_from(1), [1, 2, 3])
+        self.assertEqual(index.reachable_from(3), [3])
+        self.assertEqual(index.reachable_from(5), [])
+        self.assertEqual(index.reaching(3), [0, 1, 2, 3, 4])
+        self.assertEqual(index.reaching(0), [4])
+        self.assertTrue(index.reaches(4, 3))
+        self.assertFalse(index.reaches(3, 2))
+
+    def test_matches_search(self) -> None:
+        """
+        Test reachable_from and reaching methods agree with a depth-first search, on random graphs.
+        """
+        for seed in range(50):
+            random = Random(seed)
+            node_count = random.randint(1, 20)
+            successors = [random.sample(range(node_count), random.randint(0, 2)) for _ in range(node_count)]
+            index = ReachabilityIndex.build(*build_csr(successors))
+
+            for node in range(node_count):
+                seen, worklist = set(), [node]
+                while worklist:
+                    for successor in successors[worklist.pop()]:
+                        if successor not in seen:
+                            seen.add(successor)
+                            worklist.append(successor)
+
+                self.assertEqual(index.reachable_from(node), sorted(seen), f"Seed {seed}")
+                for other in range(node_count):
+                    self.assertEqual(node in index.reaching(other), other in seen, f"Seed {seed}")
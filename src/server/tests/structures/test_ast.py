@@ -18,6 +18,117 @@ class TestAST(TestCase):
         AST().accept(mock_visitor)
         mock_accept.assert_called_with(mock_visitor)
 
+    def test_compute_structural_hashes(self) -> None:
+        """
+        Test compute_structural_hashes method.
+        """
+        self.assertIsNone(AST().compute_structural_hashes())
+
+        def helper(name: str) -> ASTFunctionDefinitionNode:
+            return ASTFunctionDefinitionNode(ASTIdentifierNode(name), body=ASTReturnStatementNode(
+                ASTBinaryOperationNode(ASTArithmeticOperation.ADD, ASTIdentifierNode("x"),
+                                       ASTLiteralNode(ASTLiteralType.NUMBER, "1"))))
+
+        first, second, renamed = helper("f"), helper("f"), helper("g")
+        ast = AST(ASTStatementsNode([first, second, renamed]))
+
+        root_hash = ast.compute_structural_hashes()
+
+        self.assertEqual(root_hash, ast.root.structural_hash)
+        self.assertEqual(first.structural_hash, second.structural_hash)
+        self.assertNotEqual(first.structural_hash, renamed.structural_hash)
+        self.assertEqual(first["body"].structural_hash, renamed["body"].structural_hash)
+
+        operation = ASTBinaryOperationNode(ASTArithmeticOperation.SUBTRACT, ASTIdentifierNode("x"),
+                                           ASTLiteralNode(ASTLiteralType.NUMBER, "1"))
+        AST(operation).compute_structural_hashes()
+        self.assertNotEqual(operation.structural_hash, first["body"]["values"].structural_hash)
+
+    def test_structural_hash(self) -> None:
+        """
+        Test structural_hash property is only computed for the subtrees looked up, and is recomputed after a child is
+        replaced.
+        """
+        body = ASTReturnStatementNode(ASTIdentifierNode("x"))
+        function = ASTFunctionDefinitionNode(ASTIdentifierNode("f"), body=body)
+        ast = AST(ASTStatementsNode([function, ASTPassStatementNode()]))
+
+        self.assertIsNone(function._structural_hash)
+
+        original = function.structural_hash
+
+        self.assertIsNotNone(body._structural_hash)
+        self.assertIsNone(ast.root._structural_hash)
+
+        ast.root.structural_hash
+        body["values"] = ASTIdentifierNode("y")
+
+        self.assertIsNone(ast.root._structural_hash)
+        self.assertNotEqual(function.structural_hash, original)
+
+    def test_find_all(self) -> None:
+        """
+        Test find_all method.
+        """
+        inner = ASTClassDefinitionNode(ASTIdentifierNode("B"), body=ASTPassStatementNode())
+        function = ASTFunctionDefinitionNode(ASTIdentifierNode("f"), body=inner)
+        outer = ASTClassDefinitionNode(ASTIdentifierNode("A"), body=function)
+        ast = AST(ASTStatementsNode([outer, ASTPassStatementNode()]))
+
+        self.assertEqual(ast.find_all(ASTClassDefinitionNode), [outer, inner])
+        self.assertEqual(ast.find_all(ASTDefinitionNode), [outer, function, inner])
+        self.assertEqual(ast.find_all(ASTLoopStatementNode), [])
+
+    def test_index(self) -> None:
+        """
+        Test the index is built on first use, so it covers changes to the tree made before then.
+        """
+        if_statement = ASTIfStatementNode(ASTIdentifierNode("x"), ASTPassStatementNode())
+        ast = AST(if_statement)
+        loop = ASTLoopStatementNode(ASTIdentifierNode("y"), ASTPassStatementNode())
+        if_statement["body"] = loop
+
+        self.assertEqual(ast.find_all(ASTLoopStatementNode), [loop])
+
+        replacement = ASTLoopStatementNode(ASTIdentifierNode("z"), ASTPassStatementNode())
+        if_statement["body"] = replacement
+        self.assertEqual(ast.find_all(ASTLoopStatementNode), [loop])
+
+        ast.build_index()
+        self.assertEqual(ast.find_all(ASTLoopStatementNode), [replacement])
+
+    def test_find_outermost(self) -> None:
+        """
+        Test find_outermost method.
+        """
+        inner = ASTClassDefinitionNode(ASTIdentifierNode("B"), body=ASTPassStatementNode())
+        function = ASTFunctionDefinitionNode(ASTIdentifierNode("f"), body=inner)
+        outer = ASTClassDefinitionNode(ASTIdentifierNode("A"), body=ASTPassStatementNode())
+        ast = AST(ASTStatementsNode([function, outer]))
+
+        self.assertEqual(ast.find_outermost(ASTClassDefinitionNode), [inner, outer])
+        self.assertEqual(ast.find_outermost(ASTClassDefinitionNode, ASTFunctionDefinitionNode), [function, outer])
+
+    def test_node_id(self) -> None:
+        """
+        Test node_id and node methods.
+        """
+        function = ASTFunctionDefinitionNode(ASTIdentifierNode("f"), body=ASTPassStatementNode())
+        ast = AST(ASTStatementsNode([function, ASTPassStatementNode()]))
+
+        for node_id, node in enumerate(ast.root.iter_preorder()):
+            self.assertEqual(ast.node_id(node), node_id)
+            self.assertIs(ast.node(node_id), node)
+
+        self.assertEqual(ast.node_id(function), 1)
+
+        for node_id in (-1, 5):
+            with self.assertRaises(KeyError):
+                ast.node(node_id)
+
+        with self.assertRaises(KeyError):
+            ast.node_id(ASTPassStatementNode())
+
 
 class TestASTNode(TestCase):
     def test_values(self) -> None:
@@ -28,6 +139,63 @@ class TestASTNode(TestCase):
 
         self.assertEqual(node.values(), list(node.children.values()))
 
+    def test_iter_preorder(self) -> None:
+        """
+        Test iter_preorder method.
+        """
+        left, right = ASTIdentifierNode("x"), ASTLiteralNode(ASTLiteralType.NUMBER, "1")
+        operation = ASTBinaryOperationNode(ASTArithmeticOperation.ADD, left, right)
+        node = ASTReturnStatementNode(operation)
+
+        self.assertEqual(list(node.iter_preorder()), [node, operation, left, right])
+
+    def test_iter_postorder(self) -> None:
+        """
+        Test iter_postorder method.
+        """
+        left, right = ASTIdentifierNode("x"), ASTLiteralNode(ASTLiteralType.NUMBER, "1")
+        operation = ASTBinaryOperationNode(ASTArithmeticOperation.ADD, left, right)
+        node = ASTReturnStatementNode(operation)
+
+        self.assertEqual(list(node.iter_postorder()), [left, right, operation, node])
+
+    def test_subtree_kinds(self) -> None:
+        """
+        Test subtree_kinds attribute holds the kinds of every node in the subtree.
+        """
+        node = ASTReturnStatementNode(ASTIdentifierNode("x"))
+
+        self.assertTrue(node.has_kinds(ASTIdentifierNode.kind_mask))
+        self.assertTrue(node.has_kinds(kinds_mask(ASTStatementNode)))
+        self.assertFalse(node.has_kinds(kinds_mask(ASTLiteralNode, ASTLoopStatementNode)))
+
+        node["values"] = ASTLiteralNode(ASTLiteralType.NUMBER, "1")
+        statements = ASTStatementsNode([])
+        statements.add_child(node)
+
+        self.assertTrue(node.has_kinds(ASTLiteralNode.kind_mask))
+        self.assertTrue(statements.has_kinds(ASTLiteralNode.kind_mask))
+
+        node["values"] = ASTLoopStatementNode(ASTIdentifierNode("z"))
+
+        self.assertTrue(statements.has_kinds(ASTLoopStatementNode.kind_mask))
+
+    def test_iter_ancestors(self) -> None:
+        """
+        Test iter_ancestors method.
+        """
+        identifier = ASTIdentifierNode("x")
+        node = ASTReturnStatementNode(identifier)
+        statements = ASTStatementsNode([node])
+
+        self.assertEqual(list(identifier.iter_ancestors()), [node, statements])
+        self.assertEqual(list(statements.iter_ancestors()), [])
+
+        node["values"] = replacement = ASTIdentifierNode("y")
+
+        self.assertIsNone(identifier.parent)
+        self.assertIs(replacement.parent, node)
+
     @patch("metrics.visitors.base.ast_visitor.ASTVisitor")
     @patch.object(Node, "accept")
     def test_accept(self, mock_accept: MagicMock, mock_visitor: MagicMock) -> None:
@@ -1,3 +1,4 @@
+from sys import getrecursionlimit
 from unittest import TestCase
 from unittest.mock import patch, MagicMock
 
@@ -87,6 +88,35 @@ class TestCFGBlock(TestCase):
         block.append(new_appended_block)
         self.assertIs(block["exit_block"]["exit_block"], new_appended_block)
 
+    def test_append_long_chain(self) -> None:
+        """
+        Test append method appends to the end of chains longer than the recursion limit.
+        """
+        block = tail = CFGBlock()
+        for _ in range(getrecursionlimit() * 2):
+            appended_block = CFGBlock()
+            block.append(appended_block)
+            tail = appended_block
+
+        if_else = CFGIfElseBlock(block)
+        last_block = CFGBlock()
+        if_else.append(last_block)
+
+        self.assertIs(tail["exit_block"]["exit_block"], last_block)
+
+    def test_append_cycle(self) -> None:
+        """
+        Test append method appends nothing to an exit chain that loops back on itself.
+        """
+        block = CFGBlock()
+        loop = CFGLoopBlock(exit_block=CFGContinueBlock())
+        loop["exit_block"]["exit_block"] = loop
+        block.append(loop)
+
+        block.append(CFGBlock())
+
+        self.assertIs(loop["exit_block"]["exit_block"], loop)
+
     @patch("metrics.visitors.base.cfg_visitor.CFGVisitor")
     def test_accept(self, mock_visitor: MagicMock) -> None:
         """
@@ -0,0 +1,76 @@
+from unittest import TestCase
+
+from metrics.structures.cfg import CFG, CFGBlock, CFGIfElseBlock, CFGLoopBlock, CFGContinueBlock
+from metrics.structures.compact_cfg import CompactCFG, BLOCK, IF_ELSE_BLOCK, LOOP_BLOCK, CONTINUE_BLOCK, EXIT_EDGE, \
+    SUCCESS_EDGE, FAIL_EDGE
+
+
+class TestCompactCFG(TestCase):
+    """
+    Compact CFG test case.
+    """
+
+    def setUp(self) -> None:
+        self.loop = CFGLoopBlock()
+        self.loop["success_block"].append(CFGContinueBlock(self.loop))
+        self.cfg = CFG(CFGIfElseBlock(self.loop))
+
+    def test_from_cfg(self) -> None:
+        """
+        Test from_cfg method numbers blocks in visiting order and keeps their edges in order.
+        """
+        compact = CompactCFG.from_cfg(self.cfg)
+
+        self.assertEqual(list(compact.kinds), [IF_ELSE_BLOCK, LOOP_BLOCK, BLOCK, BLOCK, CONTINUE_BLOCK, BLOCK, BLOCK])
+        self.assertEqual(compact.edges(0), [(1, SUCCESS_EDGE), (5, FAIL_EDGE)])
+        self.assertEqual(compact.edges(1), [(2, SUCCESS_EDGE), (3, EXIT_EDGE)])
+        self.assertEqual(compact.edges(4), [(1, EXIT_EDGE)])
+        self.assertEqual(list(compact.successors(3)), [4])
+        self.assertEqual(compact.edge_count, 8)
+        self.assertIs(CompactCFG.from_cfg(compact), compact)
+        self.assertEqual(len(CompactCFG.from_cfg(CFG())), 0)
+
+    def test_iter_depth_first(self) -> None:
+        """
+        Test iter_depth_first method enters blocks in number order and leaves each once.
+        """
+        compact = CompactCFG.from_cfg(self.cfg)
+        order = list(compact.iter_depth_first())
+
+        self.assertEqual([block for block, entering in order if entering], list(range(len(compact))))
+        self.assertEqual(sorted(block for block, entering in order if not entering), list(range(len(compact))))
+
+    def test_simplified(self) -> None:
+        """
+        Test simplified method removes pass-through blocks, including a wrapping entry block, and preserves E - N.
+        """
+        compact = CompactCFG.from_cfg(self.cfg)
+        simplified = CompactCFG.from_cfg(CFG(CFGBlock({"exit_block": self.cfg.entry_block}))).simplified()
+
+        self.assertEqual(list(simplified.kinds), [IF_ELSE_BLOCK, LOOP_BLOCK, CONTINUE_BLOCK, BLOCK])
+        self.assertEqual(simplified.edges(0), [(1, SUCCESS_EDGE), (3, FAIL_EDGE)])
+        self.assertEqual(simplified.edges(1), [(1, SUCCESS_EDGE), (2, EXIT_EDGE)])
+        self.assertEqual(simplified.edges(2), [(1, EXIT_EDGE)])
+        self.assertEqual(simplified.edge_count - len(simplified), compact.edge_count - len(compact))
+        self.assertEqual(list(compact.simplified().kinds), list(simplified.kinds))
+        self.assertEqual(list(simplified.simplified().targets), list(simplified.targets))
+        self.assertEqual(len(CompactCFG().simplified()), 0)
+
+    def test_to_cfg(self) -> None:
+        """
+        Test to_cfg method rebuilds an equivalent CFG.
+        """
+        compact = CompactCFG.from_cfg(self.cfg)
+        cfg = compact.to_cfg()
+
+        self.assertIsInstance(cfg.entry_block, CFGIfElseBlock)
+        self.assertIs(cfg.entry_block["success_block"]["success_block"]["exit_block"],
+                      cfg.entry_block["success_block"])
+
+        rebuilt = CompactCFG.from_cfg(cfg)
+
+        self.assertEqual(rebuilt.kinds, compact.kinds)
+        self.assertEqual(rebuilt.offsets, compact.offsets)
+        self.assertEqual(rebuilt.targets, compact.targets)
+        self.assertEqual(rebuilt.edge_kinds, compact.edge_kinds)
+        self.assertIsNone(CompactCFG().to_cfg().entry_block)
@@ -2,6 +2,7 @@ from unittest import TestCase
 from unittest.mock import patch, MagicMock
 
 from metrics.structures.base.graph import Node
+from metrics.structures.base.ordered_set import OrderedSet
 from metrics.structures.dependency_graph import DependencyGraph, Class, KnownClass, UnknownClass
 
 
@@ -74,10 +75,16 @@ class TestClass(TestCase):
         """
         class_ = Class()
 
-        class_.dependencies = dependencies = [Class()]
+        class_.dependencies = dependencies = OrderedSet([Class()])
 
         self.assertIs(class_.children, dependencies)
 
+        first, second = Class(), Class()
+        class_.dependencies = [first, second, first]
+
+        self.assertIsInstance(class_.children, OrderedSet)
+        self.assertEqual(list(class_.children), [first, second])
+
     def test_dependencies_deleter(self) -> None:
         """
         Test deleter for dependencies property.
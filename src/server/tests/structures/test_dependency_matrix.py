@@ -0,0 +1,27 @@
+from unittest import TestCase
+
+from metrics.structures.dependency_graph import DependencyGraph, KnownClass
+from metrics.structures.dependency_matrix import DependencyMatrix
+
+
+class TestDependencyMatrix(TestCase):
+    """
+    Sparse dependency matrix test case.
+    """
+
+    def test_from_graph(self) -> None:
+        """
+        Test from_graph method maps each class to the index of its row and column.
+        """
+        base = KnownClass("object")
+        a = KnownClass("A", [base])
+        b = KnownClass("B", [a, base])
+        matrix = DependencyGraph(base, [[b], [a]]).adjacency_matrix()
+
+        self.assertEqual(matrix.classes, [b, a, base])
+        self.assertEqual(matrix.index, {b: 0, a: 1, base: 2})
+        self.assertEqual(matrix.shape, (3, 3))
+        self.assertEqual(matrix.nnz, 3)
+        self.assertEqual(matrix.to_dense().tolist(), [[0, 1, 1], [0, 0, 1], [0, 0, 0]])
+        self.assertEqual(matrix.rows().tolist(), [0, 0, 1])
+        self.assertEqual(len(DependencyMatrix.from_graph(DependencyGraph())), 0)
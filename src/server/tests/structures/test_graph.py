@@ -2,6 +2,7 @@ from unittest import TestCase
 from unittest.mock import patch, MagicMock
 
 from metrics.structures.base.graph import Graph, Node
+from metrics.structures.base.ordered_set import OrderedSet
 
 
 class TestGraph(TestCase):
@@ -94,3 +95,19 @@ class TestNode(TestCase):
         with self.assertRaises(TypeError):
             # noinspection PyTypeChecker
             node.remove_child(invalid_child)
+
+    def test_children(self) -> None:
+        """
+        Test children property.
+        """
+        first, second, third = Node(), Node(), Node()
+
+        node = Node(second, None, first, second)
+
+        self.assertIsInstance(node.children, OrderedSet)
+        self.assertEqual(list(node.children), [second, first])
+
+        node.add_child(third)
+        node.remove_child(second)
+
+        self.assertEqual(list(node.children), [first, third])
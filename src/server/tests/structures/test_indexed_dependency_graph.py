@@ -0,0 +1,46 @@
+from unittest import TestCase
+
+from metrics.structures.dependency_graph import DependencyGraph, KnownClass, UnknownClass
+from metrics.structures.indexed_dependency_graph import IndexedDependencyGraph
+
+
+class TestIndexedDependencyGraph(TestCase):
+    """
+    Indexed dependency graph test case.
+    """
+
+    def test_from_graph(self) -> None:
+        """
+        Test from_graph method numbers classes in visiting order and keeps their dependencies in order.
+        """
+        base = KnownClass("object")
+        unknown = UnknownClass("f()")
+        a = KnownClass("A", [base])
+        b = KnownClass("B", [unknown, a])
+        a.add_dependency(b)
+        indexed = IndexedDependencyGraph.from_graph(DependencyGraph(base, [[b], [a, b]]))
+
+        self.assertEqual(indexed.classes, [b, unknown, a, base])
+        self.assertEqual(list(indexed.roots), [0, 2])
+        self.assertEqual(list(indexed.dependencies(0)), [1, 2])
+        self.assertEqual(list(indexed.dependencies(2)), [3, 0])
+        self.assertEqual(list(indexed.dependencies(3)), [])
+        self.assertEqual(indexed.dependency_count, 4)
+        self.assertIs(IndexedDependencyGraph.from_graph(indexed), indexed)
+        self.assertEqual(len(IndexedDependencyGraph.from_graph(DependencyGraph())), 0)
+
+    def test_merge(self) -> None:
+        """
+        Test merge method merges classes with the same name across graphs, and keeps unknown classes apart.
+        """
+        first_a, second_a = KnownClass("A"), KnownClass("A")
+        b = KnownClass("B", [first_a, UnknownClass("f()")])
+        second_a.add_dependency(b)
+        second_a.add_dependency(UnknownClass("f()"))
+        merged = IndexedDependencyGraph.merge([DependencyGraph(first_a, [[b]]), DependencyGraph(second_a, [[second_a]])])
+
+        self.assertEqual([cls.name for cls in merged.classes], ["B", "A", "f()", "f()"])
+        self.assertIs(merged.classes[1], first_a)
+        self.assertEqual(list(merged.roots), [0, 1])
+        self.assertEqual(list(merged.dependencies(0)), [1, 2])
+        self.assertEqual(list(merged.dependencies(1)), [0, 3])
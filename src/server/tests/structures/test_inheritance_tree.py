@@ -2,6 +2,7 @@ from unittest import TestCase
 from unittest.mock import patch, MagicMock
 
 from metrics.structures.base.graph import Node
+from metrics.structures.base.ordered_set import OrderedSet
 from metrics.structures.inheritance_tree import InheritanceTree, Class, KnownClass, UnknownClass
 
 
@@ -72,7 +73,7 @@ class TestClass(TestCase):
         """
         class_ = Class(subclasses=[])
 
-        class_.subclasses = new_subclasses = [Class()]
+        class_.subclasses = new_subclasses = OrderedSet([Class()])
 
         self.assertIs(class_.children, new_subclasses)
 
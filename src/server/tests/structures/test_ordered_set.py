@@ -0,0 +1,91 @@
+from unittest import TestCase
+
+from metrics.structures.base.ordered_set import OrderedSet
+
+
+class TestOrderedSet(TestCase):
+    """
+    Ordered set test case.
+    """
+
+    def test_init(self) -> None:
+        """
+        Test __init__ method.
+        """
+        ordered_set = OrderedSet([3, 1, 3, 2, 1])
+
+        self.assertEqual(list(ordered_set), [3, 1, 2])
+        self.assertEqual(len(ordered_set), 3)
+        self.assertEqual(list(reversed(ordered_set)), [2, 1, 3])
+        self.assertEqual(ordered_set[1], 1)
+        self.assertEqual(ordered_set[-1], 2)
+        self.assertEqual(ordered_set[:2], [3, 1])
+
+    def test_contains(self) -> None:
+        """
+        Test __contains__ method.
+        """
+        ordered_set = OrderedSet([1, 2])
+
+        self.assertIn(1, ordered_set)
+        self.assertNotIn(3, ordered_set)
+        self.assertNotIn([1], ordered_set)
+
+    def test_eq(self) -> None:
+        """
+        Test __eq__ method.
+        """
+        ordered_set = OrderedSet([1, 2])
+
+        self.assertEqual(ordered_set, OrderedSet([1, 2]))
+        self.assertEqual(ordered_set, OrderedSet([2, 1]))
+        self.assertEqual(ordered_set, {2, 1})
+        self.assertEqual(ordered_set, frozenset({1, 2}))
+        self.assertEqual({1: None, 2: None}.keys(), ordered_set)
+        self.assertNotEqual(ordered_set, OrderedSet([1, 2, 3]))
+        self.assertNotEqual(ordered_set, {1})
+        self.assertNotEqual(ordered_set, [1, 2])
+        self.assertNotEqual(ordered_set, (1, 2))
+        self.assertNotEqual(ordered_set, "12")
+
+    def test_add(self) -> None:
+        """
+        Test add method.
+        """
+        ordered_set = OrderedSet([1, 2])
+
+        ordered_set.add(3)
+        ordered_set.add(1)
+
+        self.assertEqual(list(ordered_set), [1, 2, 3])
+
+    def test_remove(self) -> None:
+        """
+        Test remove and discard methods.
+        """
+        ordered_set = OrderedSet([1, 2, 3])
+
+        ordered_set.remove(2)
+        ordered_set.discard(3)
+        ordered_set.discard(4)
+
+        self.assertEqual(list(ordered_set), [1])
+
+        with self.assertRaises(KeyError):
+            ordered_set.remove(2)
+
+        ordered_set.add(2)
+
+        self.assertEqual(list(ordered_set), [1, 2])
+
+    def test_copy(self) -> None:
+        """
+        Test copy method.
+        """
+        ordered_set = OrderedSet([1, 2])
+
+        copy = ordered_set.copy()
+        copy.add(3)
+
+        self.assertEqual(list(ordered_set), [1, 2])
+        self.assertEqual(list(copy), [1, 2, 3])
@@ -0,0 +1,74 @@
+from unittest import TestCase
+
+from metrics.structures.ast import AST, ASTStatementsNode, ASTClassDefinitionNode, ASTFunctionDefinitionNode, \
+    ASTIdentifierNode, ASTPassStatementNode, ASTArgumentNode
+from metrics.structures.symbol_table import SymbolTable
+from metrics.visitors.structures.dependency_graph_generation_visitor import DependencyGraphGenerationVisitor
+from metrics.visitors.structures.inheritance_tree_generation_visitor import InheritanceTreeGenerationVisitor
+
+
+class TestSymbolTable(TestCase):
+    """
+    Symbol table test case.
+    """
+
+    def setUp(self) -> None:
+        self.pass_statement = ASTPassStatementNode()
+        self.local = ASTClassDefinitionNode(ASTIdentifierNode("C"), ASTStatementsNode([self.pass_statement]),
+                                            ASTArgumentNode(ASTIdentifierNode("B")))
+        self.method = ASTFunctionDefinitionNode(ASTIdentifierNode("f"), body=ASTStatementsNode([self.local]))
+        self.inner = ASTClassDefinitionNode(ASTIdentifierNode("B"), ASTStatementsNode([ASTPassStatementNode()]))
+        self.outer = ASTClassDefinitionNode(ASTIdentifierNode("A"), ASTStatementsNode([self.inner, self.method]))
+        self.ast = AST(ASTStatementsNode([self.outer]))
+
+    def test_build(self) -> None:
+        """
+        Test build method nests the scopes of class and function definitions and qualifies their names.
+        """
+        table = SymbolTable.build(self.ast)
+
+        self.assertEqual(table.scope_of(self.inner).qualified_name, "A.B")
+        self.assertEqual(table.scope_of(self.method).qualified_name, "A.f")
+        self.assertEqual(table.scope_of(self.method).prefix, "A.f.<locals>")
+        self.assertEqual(table.scope_of(self.local).qualified_name, "A.f.<locals>.C")
+        self.assertIs(table.scope_of(self.local).parent, table.scope_of(self.method))
+        self.assertEqual([scope.name for scope in table.scope_of(self.outer).children], ["B", "f"])
+        self.assertEqual(table.classes, {"A.B": [self.inner], "A.f.<locals>.C": [self.local], "A": [self.outer]})
+        self.assertEqual(SymbolTable.build(AST()).classes, {})
+
+    def test_enclosing_scope(self) -> None:
+        """
+        Test enclosing_scope method finds the closest enclosing definition's scope.
+        """
+        table = SymbolTable.build(self.ast)
+
+        self.assertIs(table.enclosing_scope(self.pass_statement), table.scope_of(self.local))
+        self.assertIs(table.enclosing_scope(self.local), table.scope_of(self.method))
+        self.assertIs(table.enclosing_scope(self.outer), table.global_scope)
+
+    def test_candidates(self) -> None:
+        """
+        Test candidates method gives the same-scope name before the global one, and interns them.
+        """
+        table = SymbolTable.build(self.ast)
+        candidates = table.scope_of(self.method).candidates("B")
+
+        self.assertEqual(candidates, ("A.f.<locals>.B", "B"))
+        self.assertIs(table.scope_of(self.method).candidates("B"), candidates)
+        self.assertEqual(table.global_scope.candidates("B"), ("B",))
+
+    def test_shared_by_generators(self) -> None:
+        """
+        Test the structure generators qualify class names from a shared symbol table.
+        """
+        table = SymbolTable.build(self.ast)
+        dependency_graph = DependencyGraphGenerationVisitor(symbol_table=table).visit(self.ast)
+        inheritance_tree = InheritanceTreeGenerationVisitor(symbol_table=table).visit(self.ast)
+
+        self.assertEqual([cls.name for classes in dependency_graph.classes for cls in classes],
+                         ["object", "A.B", "B", "A.f.<locals>.C", "A"])
+        # B is not defined at C's scope or globally, so C's base is an unknown class.
+        subclasses = {cls.name: cls for cls in inheritance_tree.base.subclasses}
+
+        self.assertEqual(sorted(subclasses), ["A", "A.B", "B"])
+        self.assertEqual([cls.name for cls in subclasses["B"].subclasses], ["A.f.<locals>.C"])
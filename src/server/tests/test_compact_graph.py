@@ -0,0 +1,36 @@
+from unittest import TestCase
+
+from metrics.compact_graph import compact_graph
+
+
+class TestCompactGraph(TestCase):
+    """
+    Graph compaction test case.
+    """
+
+    def test_compact_graph(self) -> None:
+        """
+        Test compact_graph function stores each node id once and links as positions in the names table.
+        """
+        nodes = [{"id": "Base", "classArgs": {"x": ""}}, {"id": "Derived", "classArgs": {}}, {"id": "Base"}]
+        links = [{"source": "Base", "target": "Derived", "label": "inheritance"},
+                 {"source": "Derived", "target": "Base"}]
+
+        self.assertEqual(compact_graph(nodes, links), {
+            "names": ["Base", "Derived"],
+            "nodeCount": 2,
+            "nodes": {"classArgs": [{"x": ""}, {}]},
+            "links": {"source": [0, 1], "target": [1, 0], "label": ["inheritance", None]}
+        })
+
+    def test_compact_graph_link_names(self) -> None:
+        """
+        Test compact_graph function adds the ids that only links refer to after the nodes' ids.
+        """
+        compact = compact_graph([{"id": 1}], [{"source": 1, "target": 2}, {"source": 2, "target": 1}])
+
+        self.assertEqual(compact["names"], [1, 2])
+        self.assertEqual(compact["nodeCount"], 1)
+        self.assertEqual(compact["nodes"], {})
+        self.assertEqual(compact["links"], {"source": [0, 1], "target": [1, 0]})
+        self.assertEqual(compact_graph([], [])["links"], {"source": [], "target": []})
@@ -0,0 +1,93 @@
+import json
+from random import Random
+from unittest import TestCase
+
+from metrics.json_stream import JSONArray, JSONObject, iterencode, iterencode_chunks
+
+
+class TestJSONStream(TestCase):
+    """
+    Incremental JSON encoding test case.
+    """
+
+    @classmethod
+    def random_value(cls, random: Random, depth: int = 0):
+        """
+        Generate a random JSON-serialisable value.
+
+        :param random: The random number generator.
+        :param depth: The depth of the value in the enclosing value.
+        :return: The value.
+        """
+        kind = random.random()
+        if depth > 4 or kind < 0.4:
+            return random.choice([0, -2.5, 10 ** 20, "text \"é\"\n", "", None, True, False])
+
+        if kind < 0.7:
+            return {random.choice(["key", "é", 1, 2.5, None, True]): cls.random_value(random, depth + 1)
+                    for _ in range(random.randint(0, 4))}
+
+        return [cls.random_value(random, depth + 1) for _ in range(random.randint(0, 4))]
+
+    def test_iterencode(self) -> None:
+        """
+        Test iterencode function agrees with json.dumps on random values.
+        """
+        for seed in range(200):
+            value = self.random_value(Random(seed))
+
+            self.assertEqual("".join(iterencode(value)), json.dumps(value), f"Seed {seed}")
+
+    def test_iterencode_lazy(self) -> None:
+        """
+        Test iterencode function only produces the members of lazy objects and arrays as it reaches them.
+        """
+        produced = []
+
+        def members():
+            for key in ("a", "b"):
+                produced.append(key)
+                yield key, JSONArray(range(2))
+
+        pieces = iterencode(JSONObject(members()))
+
+        self.assertEqual(next(pieces), "{")
+        self.assertEqual(produced, [])
+        self.assertEqual(next(pieces), "\"a\": ")
+        self.assertEqual(produced, ["a"])
+        self.assertEqual("{\"a\": " + "".join(pieces), "{\"a\": [0, 1], \"b\": [0, 1]}")
+
+    def test_iterencode_deep(self) -> None:
+        """
+        Test iterencode function handles values nested deeper than the recursion limit.
+        """
+        value = []
+        for _ in range(5000):
+            value = [value]
+
+        self.assertEqual("".join(iterencode(value)), "[" * 5001 + "]" * 5001)
+
+    def test_iterencode_chunks(self) -> None:
+        """
+        Test iterencode_chunks function gathers the encoding into chunks of at least the chunk size, but the last.
+        """
+        value = {"numbers": list(range(100))}
+
+        chunks = list(iterencode_chunks(value, chunk_size=16))
+
+        self.assertEqual(b"".join(chunks), json.dumps(value).encode("utf-8"))
+        self.assertTrue(all(len(chunk) >= 16 for chunk in chunks[:-1]))
+
+    def test_iterencode_dumps(self) -> None:
+        """
+        Test iterencode function encodes plain values whole with dumps, and walks the values dumps fails on.
+        """
+        def dumps(value):
+            if "lazy" in value:
+                raise TypeError("Cannot encode lazy values.")
+            return json.dumps(value, separators=(",", ":"))
+
+        value = {"lazy": JSONArray(iter([{"a": [1, 2]}])), "plain": [1]}
+
+        self.assertEqual("".join(iterencode(value, dumps=dumps, separators=(",", ":"))),
+                         "{\"lazy\":[{\"a\":[1,2]}],\"plain\":[1]}")
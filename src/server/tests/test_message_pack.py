@@ -0,0 +1,71 @@
+from unittest import TestCase
+
+from metrics.json_stream import JSONArray, JSONObject
+from metrics.message_pack import MessagePackError, iterpack, packb, unpackb
+
+
+class TestMessagePack(TestCase):
+    """
+    MessagePack encoding test case.
+    """
+
+    def test_packb(self) -> None:
+        """
+        Test packb function uses the most compact form of each value, as in the MessagePack specification.
+        """
+        self.assertEqual(packb(None), b"\xc0")
+        self.assertEqual(packb([True, False]), b"\x92\xc3\xc2")
+        self.assertEqual(packb([0, 127, 128, 256, 65536, -1, -32, -33, -129]),
+                         b"\x99\x00\x7f\xcc\x80\xcd\x01\x00\xce\x00\x01\x00\x00\xff\xe0\xd0\xdf\xd1\xff\x7f")
+        self.assertEqual(packb(1.5), b"\xcb\x3f\xf8\x00\x00\x00\x00\x00\x00")
+        self.assertEqual(packb({"a": "é"}), b"\x81\xa1a\xa2\xc3\xa9")
+        self.assertEqual(packb("x" * 32)[:2], b"\xd9\x20")
+        self.assertEqual(packb(list(range(16)))[:3], b"\xdc\x00\x10")
+        self.assertEqual(packb(b"\x00"), b"\xc4\x01\x00")
+
+        with self.assertRaises(TypeError):
+            packb(object())
+
+        with self.assertRaises(OverflowError):
+            packb(2 ** 64)
+
+    def test_unpackb(self) -> None:
+        """
+        Test unpackb function decodes what packb encodes, and rejects invalid data.
+        """
+        value = {"name": "Statements", "children": [{"name": "x", "id": 1}, None, -2.5, 2 ** 40, [b"\x01", {}]],
+                 "sizes": list(range(300)), "text": "é" * 100}
+
+        self.assertEqual(unpackb(packb(value)), value)
+
+        for data in (b"", b"\x92\x01", b"\xc1", b"\xd9\x05ab", b"\x01\x02"):
+            with self.assertRaises(MessagePackError):
+                unpackb(data)
+
+    def test_string_table(self) -> None:
+        """
+        Test packb function encodes repeated strings as references when using the string table, and unpackb resolves
+        them.
+        """
+        value = [{"name": "Statements", "children": [{"name": "Statements"}]} for _ in range(10)]
+
+        packed = packb(value, string_table=True)
+
+        self.assertEqual(unpackb(packed), value)
+        self.assertLess(len(packed), len(packb(value)) / 2)
+        self.assertEqual(packb(["name", "name", "ab", "ab"], string_table=True), b"\x94\xa4name\xd4\x01\x00\xa2ab\xa2ab")
+
+    def test_iterpack(self) -> None:
+        """
+        Test iterpack function encodes lazily produced objects and arrays, and values nested deeper than the recursion
+        limit.
+        """
+        value = JSONArray((JSONObject(iter([("id", number)])) for number in range(3)), 3)
+
+        self.assertEqual(unpackb(b"".join(iterpack(value))), [{"id": 0}, {"id": 1}, {"id": 2}])
+
+        deep = []
+        for _ in range(5000):
+            deep = [deep]
+
+        self.assertEqual(b"".join(iterpack(deep, chunk_size=16)), b"\x91" * 5000 + b"\x90")
@@ -0,0 +1,112 @@
+from random import Random
+from unittest import TestCase
+
+from metrics.structures.ast import AST, ASTNode, ASTStatementsNode, ASTIdentifierNode, ASTIfStatementNode, \
+    ASTLoopStatementNode, ASTPassStatementNode, ASTBinaryOperationNode, ASTLogicalOperation, ASTArithmeticOperation, \
+    ASTConditionalExpressionNode, ASTReturnStatementNode, ASTCaseLabelNode, ASTJumpStatementNode, \
+    ASTFunctionDefinitionNode, ASTTryStatementNode, ASTCatchNode, ASTCatchesNode
+from metrics.visitors.metrics.ast_cc_calculation_visitor import ASTCCCalculationVisitor
+from metrics.visitors.metrics.cc_calculation_visitor import CCCalculationVisitor
+from metrics.visitors.structures.cfg_generation_visitor import CFGGenerationVisitor
+from metrics.visitors.structures.function_cfg_generation_visitor import FunctionCFGGenerationVisitor
+
+
+def build_condition(random: Random, depth: int = 2) -> ASTNode:
+    """
+    Build a random condition, of identifiers joined by short-circuit logical operations and conditional expressions.
+    """
+    kind = random.random() if depth > 0 else 0
+    if kind < 0.6:
+        return ASTIdentifierNode("c")
+    if kind < 0.8:
+        return ASTBinaryOperationNode(random.choice([ASTLogicalOperation.AND, ASTLogicalOperation.OR]),
+                                      build_condition(random, depth - 1), build_condition(random, depth - 1))
+
+    return ASTConditionalExpressionNode(build_condition(random, depth - 1), build_condition(random, depth - 1),
+                                        build_condition(random, depth - 1))
+
+
+def build_statements(random: Random, depth: int) -> ASTStatementsNode:
+    """
+    Build a random sequence of structured statements (if, if-else, loop, loop-else and try statements, without breaks or
+    continues), each of whose bodies holds at least one control-flow statement.
+    """
+    statements = []
+    for _ in range(random.randint(1, 3)):
+        kind = random.random() if depth > 0 else 1
+        if kind < 0.25:
+            statements.append(ASTIfStatementNode(build_condition(random), build_statements(random, depth - 1)))
+        elif kind < 0.4:
+            statements.append(ASTIfStatementNode(build_condition(random), build_statements(random, depth - 1),
+                                                 build_statements(random, depth - 1)))
+        elif kind < 0.55:
+            statements.append(ASTLoopStatementNode(build_condition(random), build_statements(random, depth - 1)))
+        elif kind < 0.65:
+            statements.append(ASTLoopStatementNode(build_condition(random), build_statements(random, depth - 1),
+                                                   build_statements(random, depth - 1)))
+        elif kind < 0.8:
+            catches = [ASTCatchNode(body=build_statements(random, depth - 1)) for _ in range(random.randint(1, 2))]
+            statements.append(ASTTryStatementNode(build_statements(random, depth - 1), ASTCatchesNode(catches)))
+        else:
+            statements.append(ASTReturnStatementNode(build_condition(random)))
+
+    if not any(isinstance(statement, (ASTIfStatementNode, ASTLoopStatementNode)) for statement in statements):
+        statements.append(ASTIfStatementNode(ASTIdentifierNode("c"), ASTStatementsNode([ASTPassStatementNode()])))
+
+    return ASTStatementsNode(statements)
+
+
+class TestASTCCCalculationVisitor(TestCase):
+    """
+    AST cyclomatic complexity calculation visitor test case.
+    """
+
+    def test_visit(self) -> None:
+        """
+        Test visit method counts each kind of decision point.
+        """
+        condition = ASTBinaryOperationNode(ASTLogicalOperation.AND, ASTIdentifierNode("a"), ASTBinaryOperationNode(
+            ASTArithmeticOperation.ADD, ASTIdentifierNode("b"), ASTIdentifierNode("c")))
+        ast = AST(ASTStatementsNode([
+            ASTIfStatementNode(condition, ASTStatementsNode([ASTPassStatementNode()])),
+            ASTReturnStatementNode(ASTConditionalExpressionNode(ASTIdentifierNode("a"), ASTIdentifierNode("b"),
+                                                                ASTIdentifierNode("c"))),
+            ASTTryStatementNode(ASTPassStatementNode(), ASTCatchesNode([ASTCatchNode(body=ASTPassStatementNode()),
+                                                                        ASTCatchNode(body=ASTPassStatementNode())])),
+            ASTCaseLabelNode(ASTIdentifierNode("a")),
+            ASTJumpStatementNode(ASTCaseLabelNode(ASTIdentifierNode("a"))),
+        ]))
+
+        self.assertEqual(ASTCCCalculationVisitor().visit(ast), 7)
+        self.assertEqual(ASTCCCalculationVisitor().visit(AST()), 1)
+
+    def test_visit_functions(self) -> None:
+        """
+        Test visit_functions method counts each decision point towards its closest enclosing function only.
+        """
+        inner = ASTFunctionDefinitionNode(ASTIdentifierNode("g"), body=ASTStatementsNode([
+            ASTLoopStatementNode(ASTIdentifierNode("c"), ASTStatementsNode([ASTPassStatementNode()]))]))
+        ast = AST(ASTStatementsNode([ASTFunctionDefinitionNode(ASTIdentifierNode("f"), body=ASTStatementsNode([
+            ASTIfStatementNode(ASTIdentifierNode("c"), ASTStatementsNode([inner]))]))]))
+        functions = FunctionCFGGenerationVisitor().visit(ast).functions
+
+        self.assertEqual(ASTCCCalculationVisitor().visit_functions(ast, functions), {"f": 2, "f.<locals>.g": 2})
+
+    def test_extends_cfg_engine(self) -> None:
+        """
+        Test visit method counts one more than the control-flow graph engine for each short-circuit logical operation,
+        conditional expression and catch clause in structured code, and agrees with it otherwise.
+        """
+        ast = AST(ASTStatementsNode([ASTIfStatementNode(
+            ASTBinaryOperationNode(ASTLogicalOperation.AND, ASTIdentifierNode("a"), ASTIdentifierNode("b")),
+            ASTStatementsNode([ASTPassStatementNode()]))]))
+
+        self.assertEqual(CCCalculationVisitor().visit(CFGGenerationVisitor().visit(ast)), 2)
+        self.assertEqual(ASTCCCalculationVisitor().visit(ast), 3)
+
+        for seed in range(200):
+            ast = AST(build_statements(Random(seed), 4))
+            extended = len(ast.find_all(ASTBinaryOperationNode, ASTConditionalExpressionNode, ASTCatchNode))
+
+            self.assertEqual(ASTCCCalculationVisitor().visit(ast),
+                             CCCalculationVisitor().visit(CFGGenerationVisitor().visit(ast)) + extended, f"Seed {seed}")
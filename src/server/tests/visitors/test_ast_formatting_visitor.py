@@ -0,0 +1,51 @@
+from unittest import TestCase
+
+from metrics.structures.ast import AST, ASTStatementsNode, ASTIfStatementNode, ASTIdentifierNode, \
+    ASTPassStatementNode, ASTFunctionDefinitionNode
+from metrics.visitors.formatting.ast_formatting_visitor import ASTFormattingVisitor
+
+
+class TestASTFormattingVisitor(TestCase):
+    """
+    AST formatting visitor test case.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up an AST for each test.
+        """
+        self.ast = AST(ASTStatementsNode([
+            ASTFunctionDefinitionNode(ASTIdentifierNode("f"), body=ASTIfStatementNode(ASTIdentifierNode("x"),
+                                                                                      ASTPassStatementNode())),
+            ASTPassStatementNode()
+        ]))
+
+    def test_visit_to_depth(self) -> None:
+        """
+        Test visit_to_depth method truncates nodes with children at the maximum depth, and marks them with their ids.
+        """
+        visitor = ASTFormattingVisitor()
+        function = self.ast.root[0]
+
+        self.assertEqual(visitor.visit_to_depth(self.ast, 0), {"name": "Statements", "id": 0, "truncated": True})
+
+        outline = visitor.visit_to_depth(self.ast, 1)
+
+        self.assertEqual(outline["name"], "Statements")
+        self.assertEqual(outline["children"][0], {"name": visitor.dispatch(function)["name"],
+                                                  "id": self.ast.node_id(function), "truncated": True})
+        self.assertEqual(outline["children"][1], visitor.dispatch(self.ast.root[1]))
+
+    def test_visit_to_depth_whole(self) -> None:
+        """
+        Test visit_to_depth method agrees with visit when the maximum depth is below the deepest node, and expands
+        truncated nodes by id.
+        """
+        visitor = ASTFormattingVisitor()
+
+        self.assertEqual(visitor.visit_to_depth(self.ast, 10), visitor.visit(self.ast))
+
+        truncated = visitor.visit_to_depth(self.ast, 1)["children"][0]
+        node = self.ast.node(truncated["id"])
+
+        self.assertEqual(visitor.visit_to_depth(self.ast, 10, node), visitor.dispatch(node))
@@ -1,3 +1,4 @@
+from sys import getrecursionlimit
 from unittest import TestCase
 from unittest.mock import patch, MagicMock
 
@@ -154,3 +155,18 @@ class TestASTGenerationVisitor(TestCase):
         self.assertIs(member["parent"]["member"], nodes[1])
 
         # endregion
+
+        # region sequence longer than the recursion limit
+
+        nodes = [ASTNode() for _ in range(getrecursionlimit() * 2)]
+
+        member = visitor.build_left_associated(nodes, ASTMemberNode)
+
+        for node in reversed(nodes[1:]):
+            self.assertIsInstance(member, ASTMemberNode)
+            self.assertIs(member["member"], node)
+            member = member["parent"]
+
+        self.assertIs(member, nodes[0])
+
+        # endregion
@@ -0,0 +1,132 @@
+from sys import getrecursionlimit
+from unittest import TestCase
+
+from metrics.structures.ast import AST, ASTStatementsNode, ASTIfStatementNode, ASTIdentifierNode, \
+    ASTPassStatementNode, ASTBreakStatementNode
+from metrics.structures.cfg import CFGIfBlock
+from metrics.structures.compact_cfg import CompactCFG
+from metrics.visitors.base.ast_visitor import ASTVisitor
+from metrics.visitors.metrics.lloc_calculation_visitor import LLOCCalculationVisitor
+from metrics.visitors.structures.cfg_generation_visitor import CFGGenerationVisitor
+
+
+class RecordingASTVisitor(ASTVisitor):
+    """
+    Recording AST visitor.
+
+    Records the overridden visit methods called.
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def visit_statement(self, node):
+        self.calls.append("visit_statement")
+        return super().visit_statement(node)
+
+    def visit_if_statement(self, node):
+        self.calls.append("visit_if_statement")
+        return super().visit_if_statement(node)
+
+
+class PruningASTVisitor(RecordingASTVisitor):
+    """
+    Pruning AST visitor.
+
+    Records the overridden visit methods called, skipping subtrees without if statements.
+    """
+
+    interesting_kinds = (ASTIfStatementNode,)
+
+
+class TestASTVisitor(TestCase):
+    """
+    AST visitor test case.
+    """
+
+    def test_dispatch(self) -> None:
+        """
+        Test dispatch method calls overridden visit methods, in order.
+        """
+        visitor = RecordingASTVisitor()
+        visitor.dispatch(ASTIfStatementNode(ASTIdentifierNode("x"), ASTPassStatementNode()))
+
+        self.assertEqual(visitor.calls, ["visit_if_statement", "visit_statement", "visit_statement"])
+
+    def test_dispatch_pruning(self) -> None:
+        """
+        Test dispatch method skips children without interesting kinds, unless their parent has none either.
+        """
+        visitor = PruningASTVisitor()
+        result = visitor.dispatch(ASTStatementsNode([ASTPassStatementNode(),
+                                                     ASTIfStatementNode(ASTIdentifierNode("x"), ASTPassStatementNode())]))
+
+        self.assertEqual(result, [[]])
+        self.assertEqual(visitor.calls, ["visit_if_statement", "visit_statement"])
+
+        visitor = PruningASTVisitor()
+        visitor.dispatch(ASTStatementsNode([ASTPassStatementNode(), ASTPassStatementNode()]))
+
+        self.assertEqual(visitor.calls, ["visit_statement", "visit_statement"])
+
+    def test_dispatch_depth(self) -> None:
+        """
+        Test dispatch method visits ASTs deeper than the recursion limit.
+        """
+        node = ASTPassStatementNode()
+        for _ in range(getrecursionlimit() * 2):
+            node = ASTIfStatementNode(ASTIdentifierNode("x"), node)
+
+        self.assertEqual(LLOCCalculationVisitor().visit(AST(node)), getrecursionlimit() * 2 + 1)
+        self.assertIsInstance(CFGGenerationVisitor().visit(AST(node)).root["exit_block"], CFGIfBlock)
+
+    def test_dispatch_budget(self) -> None:
+        """
+        Test dispatch method gives the same results when it switches to the explicit stack at any depth.
+        """
+        node = ASTPassStatementNode()
+        for i in range(6):
+            node = ASTStatementsNode([ASTIfStatementNode(ASTIdentifierNode(f"x{i}"), node), ASTPassStatementNode()])
+        ast = AST(node)
+
+        def successors(visitor):
+            cfg = CompactCFG.from_cfg(visitor.visit(ast))
+            return [list(cfg.successors(block)) for block in range(len(cfg))]
+
+        expected = ASTVisitor().dispatch_iteratively(ast.root)
+        lloc = LLOCCalculationVisitor()
+        expected_lloc = lloc.visit(ast)
+        expected_successors = successors(CFGGenerationVisitor())
+
+        for budget in range(8):
+            visitor = ASTVisitor()
+            visitor.RECURSION_BUDGET = budget
+            lloc.RECURSION_BUDGET = budget
+            cfg_visitor = CFGGenerationVisitor()
+            cfg_visitor.RECURSION_BUDGET = budget
+
+            self.assertEqual(visitor.visit(ast), expected)
+            self.assertEqual(lloc.visit(ast), expected_lloc)
+            self.assertEqual(successors(cfg_visitor), expected_successors)
+
+    def test_visit_long_sequence(self) -> None:
+        """
+        Test CFG generation links sequences longer than the recursion limit.
+        """
+        length = getrecursionlimit() * 2
+        ast = AST(ASTStatementsNode([ASTIfStatementNode(ASTIdentifierNode("x"), ASTPassStatementNode())
+                                     for _ in range(length)]))
+
+        block, count = CFGGenerationVisitor().visit(ast).entry_block["exit_block"], 0
+        while isinstance(block, CFGIfBlock):
+            block, count = block["exit_block"].children.get("exit_block"), count + 1
+
+        self.assertEqual(count, length)
+
+    def test_visit_children(self) -> None:
+        """
+        Test visit_children method.
+        """
+        ast = AST(ASTStatementsNode([ASTBreakStatementNode(), ASTIfStatementNode(ASTIdentifierNode("x"))]))
+
+        self.assertEqual(ASTVisitor().visit(ast), [[], ["x"]])
@@ -0,0 +1,60 @@
+from unittest import TestCase
+
+from metrics.structures.ast import AST, ASTStatementsNode, ASTClassDefinitionNode, ASTFunctionDefinitionNode, \
+    ASTIdentifierNode, ASTPassStatementNode, ASTArgumentNode, ASTVariableDeclarationNode, ASTVariablesNode
+from metrics.structures.class_diagram import RelationshipType
+from metrics.visitors.structures.class_diagram_generation_visitor import ClassDiagramGenerationVisitor
+
+
+class TestClassDiagramGenerationVisitor(TestCase):
+    """
+    Class diagram generation visitor test case.
+    """
+
+    @staticmethod
+    def declaration(name: str, type_: str) -> ASTVariableDeclarationNode:
+        """
+        Create a typed variable declaration.
+
+        :param name: The name of the variable.
+        :param type_: The name of the variable's type.
+        :return: The variable declaration node.
+        """
+        return ASTVariableDeclarationNode(ASTVariablesNode([ASTIdentifierNode(name)]), ASTIdentifierNode(type_))
+
+    @staticmethod
+    def method(name: str, return_type: str) -> ASTFunctionDefinitionNode:
+        """
+        Create a function definition with a return type.
+
+        :param name: The name of the function.
+        :param return_type: The name of the function's return type.
+        :return: The function definition node.
+        """
+        return ASTFunctionDefinitionNode(ASTIdentifierNode(name), ASTIdentifierNode(return_type),
+                                         body=ASTStatementsNode([ASTPassStatementNode()]))
+
+    def test_visit(self) -> None:
+        """
+        Test visit method merges associations either way round into one bidirectional relationship, and adds each
+        other relationship once.
+        """
+        a = ASTClassDefinitionNode(ASTIdentifierNode("A"), ASTStatementsNode([
+            self.declaration("b", "B"), self.declaration("other", "B"), self.declaration("b", "B"),
+            self.method("f", "B"), self.method("g", "B")
+        ]))
+        b = ASTClassDefinitionNode(ASTIdentifierNode("B"), ASTStatementsNode([
+            self.declaration("a", "A"), self.declaration("a", "A")
+        ]), ASTArgumentNode(ASTIdentifierNode("A")))
+
+        diagram = ClassDiagramGenerationVisitor().visit(AST(ASTStatementsNode([a, b])))
+        relationships = {cls.name: [(relationship.type, relationship.relation.name, relationship.role,
+                                     relationship.relation_role, relationship.bidirectional)
+                                    for relationship in cls.relationships] for cls in diagram.classes}
+
+        self.assertEqual(relationships, {
+            "A": [(RelationshipType.ASSOCIATION, "B", "a", "b", True),
+                  (RelationshipType.ASSOCIATION, "B", None, "other", False),
+                  (RelationshipType.DEPENDENCY, "B", None, None, False)],
+            "B": [(RelationshipType.INHERITANCE, "A", None, None, False)]
+        })
@@ -0,0 +1,101 @@
+from concurrent.futures import ThreadPoolExecutor
+from pickle import PicklingError, dumps, loads
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from metrics.structures.ast import AST, ASTStatementsNode, ASTClassDefinitionNode, ASTFunctionDefinitionNode, \
+    ASTIdentifierNode, ASTIfStatementNode, ASTPassStatementNode
+from metrics.structures.function_cfgs import FunctionCFGs
+from metrics.visitors.base.memo_table import MemoTable
+from metrics.visitors.metrics.cc_calculation_visitor import CCCalculationVisitor
+from metrics.visitors.metrics.mnd_calculation_visitor import MNDCalculationVisitor
+from metrics.visitors.structures.function_cfg_generation_visitor import FunctionCFGGenerationVisitor, \
+    generate_function_cfg
+
+
+def if_statement(*body) -> ASTIfStatementNode:
+    """
+    Build an if statement with the supplied body.
+    """
+    return ASTIfStatementNode(ASTIdentifierNode("condition"), ASTStatementsNode(list(body)))
+
+
+class TestFunctionCFGGenerationVisitor(TestCase):
+    """
+    Function CFG generation visitor test case.
+    """
+
+    def setUp(self) -> None:
+        self.inner = ASTFunctionDefinitionNode(ASTIdentifierNode("inner"),
+                                               body=ASTStatementsNode([if_statement(if_statement())]))
+        self.ast = AST(ASTStatementsNode([ASTClassDefinitionNode(ASTIdentifierNode("A"), ASTStatementsNode([
+            ASTFunctionDefinitionNode(ASTIdentifierNode("f"), body=ASTStatementsNode([if_statement(), self.inner])),
+            ASTFunctionDefinitionNode(ASTIdentifierNode("f"), body=ASTStatementsNode([ASTPassStatementNode()])),
+            ASTFunctionDefinitionNode(ASTIdentifierNode("abstract")),
+        ]))]))
+        self.ast.compute_structural_hashes()
+
+    def test_visit(self) -> None:
+        """
+        Test visit method collects functions with bodies by qualified name, without generating their CFGs.
+        """
+        cfgs = FunctionCFGGenerationVisitor().visit(self.ast)
+
+        self.assertEqual(list(cfgs), ["A.f", "A.f.<locals>.inner", "A.f#2"])
+        self.assertFalse(any(cfgs.is_generated(name) for name in cfgs))
+
+    def test_generate(self) -> None:
+        """
+        Test each function's CFG covers its own body only, and is generated once when looked up.
+        """
+        cfgs = FunctionCFGGenerationVisitor().visit(self.ast)
+        cfg = cfgs["A.f"]
+
+        self.assertTrue(cfgs.is_generated("A.f"))
+        self.assertFalse(cfgs.is_generated("A.f.<locals>.inner"))
+        self.assertIs(cfgs["A.f"], cfg)
+
+        all_cfgs = cfgs.generate_all()
+
+        self.assertEqual({name: CCCalculationVisitor().visit(cfg) for name, cfg in all_cfgs.items()},
+                         {"A.f": 2, "A.f.<locals>.inner": 3, "A.f#2": 1})
+        self.assertEqual({name: MNDCalculationVisitor().visit(cfg) for name, cfg in all_cfgs.items()},
+                         {"A.f": 2, "A.f.<locals>.inner": 3, "A.f#2": 1})
+
+    def test_generate_all_executor(self) -> None:
+        """
+        Test generate_all method generates CFGs across a supplied executor once enough are left to generate, and
+        generates them itself if they cannot be sent to the executor's workers.
+        """
+        def function_cfgs() -> FunctionCFGs:
+            cfgs = FunctionCFGGenerationVisitor().visit(self.ast)
+            cfgs.parallel_threshold = 1
+            return cfgs
+
+        expected = {name: cfg.targets for name, cfg in function_cfgs().generate_all().items()}
+
+        with ThreadPoolExecutor(2) as executor:
+            self.assertEqual({name: cfg.targets for name, cfg in function_cfgs().generate_all(executor).items()},
+                             expected)
+
+            cfgs = function_cfgs()
+            cfgs.generate = MagicMock(side_effect=ValueError)
+            with self.assertRaises(ValueError):
+                cfgs.generate_all(executor)
+
+        executor = MagicMock()
+        executor.map.side_effect = PicklingError
+        self.assertEqual({name: cfg.targets for name, cfg in function_cfgs().generate_all(executor).items()}, expected)
+
+    def test_memo_table(self) -> None:
+        """
+        Test CFGs of structurally identical functions are reused from the memo table.
+        """
+        table = MemoTable()
+        cfg = FunctionCFGGenerationVisitor(cfg_table=table).visit(self.ast)["A.f.<locals>.inner"]
+
+        other = FunctionCFGGenerationVisitor(cfg_table=table).visit(AST(ASTStatementsNode([loads(dumps(self.inner))])))
+
+        self.assertIsNone(other.functions["inner"].parent.parent)
+        self.assertIs(other["inner"], cfg)
+        self.assertEqual(generate_function_cfg(self.inner).targets, cfg.targets)
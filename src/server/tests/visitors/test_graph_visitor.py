@@ -0,0 +1,76 @@
+from sys import getrecursionlimit
+from unittest import TestCase
+
+from metrics.structures.base.graph import Node
+from metrics.structures.cfg import CFG, CFGIfBlock
+from metrics.structures.inheritance_tree import InheritanceTree, Class
+from metrics.visitors.base.graph_visitor import GraphVisitor
+from metrics.visitors.metrics.cc_calculation_visitor import CCCalculationVisitor
+from metrics.visitors.metrics.mid_calculation_visitor import MIDCalculationVisitor
+from metrics.visitors.metrics.mnd_calculation_visitor import MNDCalculationVisitor
+
+
+class TestGraphVisitor(TestCase):
+    """
+    Graph visitor test case.
+    """
+
+    def test_iter_depth_first(self) -> None:
+        """
+        Test iter_depth_first method enters and leaves nodes in recursive depth-first order.
+        """
+        leaf = Node()
+        left = Node(leaf)
+        right = Node(leaf)
+        root = Node(left, right)
+
+        self.assertEqual(list(GraphVisitor().iter_depth_first(root)),
+                         [(root, True), (left, True), (leaf, True), (leaf, False), (left, False), (right, True),
+                          (right, False), (root, False)])
+
+    def test_iter_depth_first_cycle(self) -> None:
+        """
+        Test iter_depth_first method visits each node of a cycle once.
+        """
+        first = Node()
+        second = Node(first)
+        first.add_child(second)
+
+        self.assertEqual(list(GraphVisitor().iter_preorder(first, second)), [first, second])
+
+    def test_mark_visited(self) -> None:
+        """
+        Test mark_visited method is keyed by identity.
+        """
+        visitor = GraphVisitor()
+        node = Node()
+
+        self.assertTrue(visitor.mark_visited(node))
+        self.assertFalse(visitor.mark_visited(node))
+        self.assertTrue(visitor.is_visited(node))
+        self.assertFalse(visitor.is_visited(Node()))
+
+        visitor.reset_visited()
+
+        self.assertFalse(visitor.is_visited(node))
+
+    def test_visit_deep(self) -> None:
+        """
+        Test visitors traverse graphs deeper than the recursion limit.
+        """
+        depth = getrecursionlimit() * 2
+
+        entry = None
+        for _ in range(depth):
+            entry = CFGIfBlock(exit_block=entry)
+
+        self.assertEqual(MNDCalculationVisitor().visit(CFG(entry)), 2)
+        self.assertEqual(CCCalculationVisitor().visit(CFG(entry)), depth + 1)
+
+        base = cls = Class("0")
+        for i in range(depth):
+            subclass = Class(str(i + 1))
+            cls.add_subclass(subclass)
+            cls = subclass
+
+        self.assertEqual(MIDCalculationVisitor().visit(InheritanceTree(base)), depth + 1)
@@ -0,0 +1,97 @@
+from unittest import TestCase
+
+from metrics.calculator import Calculator
+from metrics.formatter import Formatter
+from metrics.structures.ast import AST, ASTStatementsNode, ASTFunctionDefinitionNode, ASTIdentifierNode, \
+    ASTPassStatementNode
+from metrics.structures.function_cfgs import FunctionCFGs
+from metrics.visitors.base.memo_table import MemoTable
+from metrics.visitors.formatting.ast_formatting_visitor import ASTFormattingVisitor
+from metrics.visitors.metrics.lloc_calculation_visitor import LLOCCalculationVisitor
+
+
+def build_ast() -> AST:
+    """
+    Build an AST of two structurally identical functions, with its structural hashes computed.
+    """
+    ast = AST(ASTStatementsNode([ASTFunctionDefinitionNode(ASTIdentifierNode("f"), body=ASTPassStatementNode()),
+                                 ASTFunctionDefinitionNode(ASTIdentifierNode("f"), body=ASTPassStatementNode())]))
+    ast.compute_structural_hashes()
+
+    return ast
+
+
+class TestMemoTable(TestCase):
+    """
+    Memo table test case.
+    """
+
+    def test_get(self) -> None:
+        """
+        Test get method.
+        """
+        table = MemoTable()
+        table.put("key", 0)
+
+        self.assertEqual(table.get("key"), 0)
+        self.assertIsNone(table.get("missing"))
+        self.assertEqual(table.get("missing", 1), 1)
+
+    def test_put(self) -> None:
+        """
+        Test put method evicts the least recently used entry once full.
+        """
+        table = MemoTable(2)
+        table.put("a", 1)
+        table.put("b", 2)
+        table.get("a")
+        table.put("c", 3)
+
+        self.assertIn("a", table)
+        self.assertNotIn("b", table)
+        self.assertIn("c", table)
+        self.assertEqual(len(table), 2)
+
+
+class TestMemoizedVisit(TestCase):
+    """
+    Memoized AST visit test case.
+    """
+
+    def test_visit_subtree(self) -> None:
+        """
+        Test that memoized results are reused for structurally identical subtrees.
+        """
+        visitor = LLOCCalculationVisitor(MemoTable())
+        ast = build_ast()
+
+        self.assertEqual(visitor.visit(ast), 4)
+        self.assertEqual(len(visitor.memo_table), 1)
+        self.assertEqual(visitor.visit(ast), 4)
+
+    def test_calculators(self) -> None:
+        """
+        Test memoized results are reused across the visits of a calculator, and nothing carries over between two
+        calculators.
+        """
+        def visit() -> Calculator:
+            calculator = Calculator.__new__(Calculator)
+            calculator.simplify_cfg = False
+            calculator.ast = build_ast()
+
+            self.assertEqual(calculator.memo_tables, {})
+
+            calculator.logical_lines_of_code()
+            Formatter(calculator, "a.py").format_ast()
+            cfgs = calculator.function_control_flow_graphs()
+
+            self.assertIs(cfgs["f"], cfgs["f#2"])
+            return calculator
+
+        first, second = visit(), visit()
+
+        for key in (LLOCCalculationVisitor, ASTFormattingVisitor, (FunctionCFGs, False)):
+            self.assertEqual(len(first.memo_table(key)), 1)
+            self.assertIsNot(first.memo_table(key), second.memo_table(key))
+
+        self.assertIsNot(first.function_control_flow_graphs()["f"], second.function_control_flow_graphs()["f"])